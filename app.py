@@ -0,0 +1,649 @@
+# app.py
+"""
+Приложение бота: команды, задачи планировщика, публикатор, сбор лент.
+
+Запускается через main.py. Все объекты создаются при импорте этого
+модуля, поэтому импортирует его только процесс бота.
+"""
+import asyncio
+import html
+import logging
+import sys
+from collections import OrderedDict
+from datetime import datetime
+from hashlib import blake2b
+from pathlib import Path
+from typing import Optional
+from aiogram import Bot, Dispatcher, Router, F
+from aiogram.filters import Command, CommandObject
+from aiogram.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.interval import IntervalTrigger
+
+# Импорт нового конфига
+from config import config
+from database import db
+from models import NewsItem
+from parser.feed_registry import FeedRegistry
+from parser.rss_parser import RSSParser
+from services.message_builder import (
+    AdvancedMessageFormatter,
+    RichMediaMessage,
+    FearGreedIndexTracker,
+    get_multiple_crypto_prices,
+    ImageExtractor
+)
+from services.ai_summary import NewsAnalyzer
+from services.rate_limiter import RateLimiter
+from services.publisher import NewsPublisher
+from services.feed_scheduler import FeedScheduler
+from services.ingest import ingest_cycle
+from services.ingest_workers import IngestCoordinator
+from services.http_client import http_client
+from services.image_preflight import IMAGE_BAD, image_preflight
+from services.source_health import BREAKER_CLOSED, BREAKER_OPEN, SourceHealth
+from services.telegram_listener import listener
+
+# === НОВОЕ: Система обработки ошибок ===
+from utils.error_handling import safe_task, alert_manager, critical_error_handler
+from utils.loop_monitor import loop_monitor
+
+logger = logging.getLogger(__name__)
+
+
+def setup_logging():
+    """Логирование процесса бота (logs/bot.log и консоль), вызывает main.py"""
+    # Создаем папку для логов
+    Path("logs").mkdir(exist_ok=True)
+
+    logging.basicConfig(
+        level=getattr(logging, config.log_level),
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler('logs/bot.log', encoding='utf-8'),
+            logging.StreamHandler()
+        ]
+    )
+
+# Инициализация
+bot = Bot(token=config.telegram_bot_token)
+dp = Dispatcher()
+router = Router()
+rss_parser = RSSParser(
+    use_russian=True,
+    state_store=db,
+    workers=config.parser_workers,
+    use_processes=config.parser_use_processes,
+    streaming=config.parser_streaming,
+    max_feed_bytes=config.feed_max_bytes,
+    registry=FeedRegistry.load(config.feeds_file),
+    health=SourceHealth(
+        failure_threshold=config.feed_failure_threshold,
+        open_delay=config.feed_open_delay
+    )
+)
+scheduler = AsyncIOScheduler()
+ai_analyzer = NewsAnalyzer()
+rate_limiter = RateLimiter(min_interval_seconds=300)
+
+# === НАСТРОЙКА ALERT MANAGER ===
+alert_manager.bot = bot
+alert_manager.admin_id = config.admin_id
+
+
+# === КОМАНДЫ БОТА ===
+STATS_HOURS = 6  # сколько последних часов показывать в /stats
+
+@router.message(Command("stats"))
+async def cmd_stats(message):
+    """Статистика бота"""
+    try:
+        counts = await db.get_counts()
+        hourly = await db.get_hourly_stats(hours=STATS_HOURS)
+
+        text = (
+            f"📊 <b>Статистика:</b>\n"
+            f"Всего новостей: {counts['total']}\n"
+            f"Опубликовано: {counts['posted']}\n"
+            f"В очереди: {counts['queued']}\n"
+            f"За 24 часа: +{counts['last_24h']} / 📤 {counts['posted_24h']}"
+        )
+        if hourly:
+            text += f"\n\n⏱ <b>По часам</b> (добавлено / опубликовано):\n"
+            for hour, added, posted in hourly:
+                text += f"{datetime.fromtimestamp(hour).strftime('%H:00')} — +{added} / 📤 {posted}\n"
+
+        await message.answer(text, parse_mode="HTML")
+    except Exception as e:
+        logger.error(f"Ошибка stats: {e}")
+        await message.answer("⚠️ Ошибка получения статистики")
+
+
+@router.message(Command("sources"))
+async def cmd_sources(message):
+    """Список источников"""
+    try:
+        rows = await db.get_source_stats(limit=10)
+        text = "📡 <b>Топ источников:</b>\n\n"
+        for source, count in rows:
+            text += f"▪️ {source}: {count}\n"
+
+        await message.answer(text, parse_mode="HTML")
+    except Exception as e:
+        logger.error(f"Ошибка sources: {e}")
+        await message.answer("⚠️ Ошибка получения источников")
+
+
+@router.message(Command("health"))
+async def cmd_health(message):
+    """Проверка здоровья бота"""
+    try:
+        # Проверяем БД
+        total = (await db.get_counts())["total"]
+
+        # Проверяем Userbot
+        userbot_status = "✅ Активен" if listener.is_running else "❌ Неактивен"
+
+        # Проверяем публикатор
+        publisher_status = "✅ Ждет события" if publisher.is_running else "❌ Остановлен"
+
+        # Проверяем Rate Limiter
+        can_post = "✅ Готов" if rate_limiter.can_post() else f"⏳ Ждем {rate_limiter.get_wait_time()}с"
+
+        # Последний прогон retention
+        retention = db.last_retention
+        retention_status = (
+            f"{retention['archived']} в архив, "
+            f"{retention['bytes_reclaimed'] / 1024 / 1024:.1f} МБ освобождено"
+            if retention else "еще не запускался"
+        )
+
+        # Очередь записи: сколько операций уложилось в одну транзакцию
+        writes = db.writes
+        write_status = (
+            f"{writes.operations} операций в {writes.batches} транзакциях"
+            if writes.is_running else "❌ Остановлена"
+        )
+
+        # Залипания event loop (синхронный код в корутинах)
+        lag = loop_monitor.snapshot()
+        loop_status = (
+            f"макс. задержка {lag['max_lag_ms']:.0f} мс, "
+            f"залипаний {lag['stalls']} ({lag['stall_ms'] / 1000:.1f}с)"
+        )
+
+        # Расписание опроса лент (в процессе бота или у воркеров)
+        ingest = ingest_coordinator or feed_scheduler
+        feeds = ingest.snapshot()
+        feeds_status = (
+            f"~{feeds['polls_per_hour']:.0f} опросов/ч, следующий через {feeds['next_in']:.0f}с, "
+            f"с ошибками {feeds['failing']} из {feeds['feeds']}, "
+            f"отключено {rss_parser.health.open_count()} (/feeds)"
+            if ingest.is_running else "❌ Остановлены"
+        )
+        if ingest_coordinator:
+            feeds_status += (
+                f"\nВоркеры: {feeds['alive']} из {feeds['workers']}, "
+                f"перезапусков {feeds['restarts']}"
+            )
+
+        # Проверка картинок
+        images = image_preflight.stats
+        images_status = (
+            f"проверено {images['checked']}, из кэша {images['cached']}, "
+            f"убрано {images['bad']}, загружено файлом {images['rehosted']}"
+        )
+
+        await message.answer(
+            f"🏥 <b>Состояние бота:</b>\n\n"
+            f"БД: ✅ {total} записей\n"
+            f"Запись: {write_status}\n"
+            f"Retention: {retention_status}\n"
+            f"Userbot: {userbot_status}\n"
+            f"Publisher: {publisher_status}\n"
+            f"Rate Limiter: {can_post}\n"
+            f"RSS ленты: {feeds_status}\n"
+            f"Картинки: {images_status}\n"
+            f"Scheduler: ✅ Запущен ({len(scheduler.get_jobs())} задач)\n"
+            f"Event loop: {loop_status}",
+            parse_mode="HTML"
+        )
+    except Exception as e:
+        logger.error(f"Ошибка health: {e}")
+        await message.answer("⚠️ Ошибка проверки здоровья")
+
+
+FEEDS_PAGE_SIZE = 25  # строк в /feeds (лимит сообщения Telegram - 4096 символов)
+BREAKER_ICONS = {BREAKER_CLOSED: "🟢", BREAKER_OPEN: "🔴"}  # остальное - half-open
+
+
+def _format_source_health(stats) -> str:
+    """Подробности по одной ленте для /feeds <имя>"""
+    source = rss_parser.registry.get(stats.feed_url)
+    rate = f"{stats.success_rate:.0%}" if stats.success_rate is not None else "—"
+    text = (
+        f"{BREAKER_ICONS.get(stats.state, '🟡')} <b>{html.escape(source.name if source else stats.feed_url)}</b>\n"
+        f"{html.escape(stats.feed_url)}\n\n"
+        f"Состояние: {stats.state}\n"
+        f"Успешно: {stats.successes}, ошибок: {stats.failures} ({rate} успешных)\n"
+        f"Ошибок подряд: {stats.consecutive_failures}\n"
+        f"Задержка: ~{stats.latency_ms:.0f} мс\n"
+    )
+    if source:
+        text += (
+            f"Язык: {source.language}, tier {source.tier}, вес {source.weight:g}, "
+            f"до {source.max_entries} записей\n"
+        )
+    if stats.last_success:
+        text += f"Последний успех: {datetime.fromtimestamp(stats.last_success).strftime('%d.%m %H:%M')}\n"
+    if stats.last_error:
+        text += f"Последняя ошибка: {html.escape(stats.last_error)}\n"
+    if stats.state == BREAKER_OPEN:
+        text += f"Проба: {datetime.fromtimestamp(stats.retry_at).strftime('%d.%m %H:%M')}\n"
+    return text
+
+
+@router.message(Command("feeds"))
+async def cmd_feeds(message, command: CommandObject):
+    """Здоровье RSS источников (только админ): /feeds, /feeds <имя>, /feeds reset <имя>"""
+    if not config.admin_id or message.from_user.id != config.admin_id:
+        return
+
+    try:
+        args = (command.args or "").split(maxsplit=1)
+        if args and args[0] == "reset" and len(args) == 2:
+            query, reset = args[1], True
+        else:
+            query, reset = (command.args or "").strip(), False
+
+        if query:
+            matches = [
+                url for name, url in rss_parser.feeds.items()
+                if query.lower() in name.lower() or query in url
+            ]
+            if not matches:
+                await message.answer(f"Лента «{html.escape(query)}» не найдена")
+                return
+            stats = rss_parser.health.get(matches[0])
+            text = _format_source_health(stats)
+            if reset:
+                rss_parser.health.reset(stats.feed_url)
+                schedule = feed_scheduler.schedule.get(stats.feed_url)
+                if ingest_coordinator:
+                    ingest_coordinator.reset_source(stats.feed_url)
+                elif schedule:
+                    # Опросить при следующем пробуждении планировщика
+                    schedule["next_poll"] = 0
+                text = "✅ Лента включена\n\n" + _format_source_health(stats)
+            await message.answer(text, parse_mode="HTML", disable_web_page_preview=True)
+            return
+
+        health = rss_parser.health
+        names = {url: name for name, url in rss_parser.feeds.items()}
+        rows = [stats for stats in health.worst_first() if stats.feed_url in names]
+        text = (
+            f"📡 <b>Ленты:</b> {len(names)}, опрошено {len(rows)}, "
+            f"отключено {health.open_count()}\n\n"
+        )
+        for stats in rows[:FEEDS_PAGE_SIZE]:
+            rate = f"{stats.success_rate:.0%}" if stats.success_rate is not None else "—"
+            text += (
+                f"{BREAKER_ICONS.get(stats.state, '🟡')} {html.escape(names[stats.feed_url])}: "
+                f"{rate}, ~{stats.latency_ms:.0f} мс"
+            )
+            if stats.consecutive_failures:
+                text += f", ошибок подряд {stats.consecutive_failures}"
+            text += "\n"
+        if len(rows) > FEEDS_PAGE_SIZE:
+            text += f"…и еще {len(rows) - FEEDS_PAGE_SIZE}\n"
+        text += "\n/feeds &lt;имя&gt; - подробности, /feeds reset &lt;имя&gt; - включить ленту"
+
+        await message.answer(text, parse_mode="HTML")
+    except Exception as e:
+        logger.error(f"Ошибка feeds: {e}")
+        await message.answer("⚠️ Ошибка получения состояния лент")
+
+
+SEARCH_PAGE_SIZE = 5
+SEARCH_QUERIES_KEPT = 1000  # сколько последних запросов можно листать
+
+# callback_data ограничена 64 байтами (~25 символов кириллицы), поэтому
+# в кнопках - короткий id, а сам запрос хранится здесь
+_search_queries: "OrderedDict[str, str]" = OrderedDict()
+
+
+def _remember_search(query: str) -> str:
+    """id запроса для callback_data"""
+    query_id = blake2b(query.encode("utf-8"), digest_size=6).hexdigest()
+    _search_queries[query_id] = query
+    _search_queries.move_to_end(query_id)
+    while len(_search_queries) > SEARCH_QUERIES_KEPT:
+        _search_queries.popitem(last=False)
+    return query_id
+
+
+def _search_keyboard(query: str, page: int, has_next: bool) -> Optional[InlineKeyboardMarkup]:
+    """Кнопки листания"""
+    query_id = _remember_search(query)
+    buttons = []
+    if page > 0:
+        buttons.append(InlineKeyboardButton(text="◀️ Назад", callback_data=f"search:{page - 1}:{query_id}"))
+    if has_next:
+        buttons.append(InlineKeyboardButton(text="Вперед ▶️", callback_data=f"search:{page + 1}:{query_id}"))
+
+    if not buttons:
+        return None
+    return InlineKeyboardMarkup(inline_keyboard=[buttons])
+
+
+async def _render_search(query: str, page: int):
+    """Текст и клавиатура страницы результатов поиска"""
+    rows = await db.search_news(query, limit=SEARCH_PAGE_SIZE, offset=page * SEARCH_PAGE_SIZE)
+    has_next = len(rows) > SEARCH_PAGE_SIZE
+    rows = rows[:SEARCH_PAGE_SIZE]
+
+    if not rows:
+        return f"🔎 По запросу «{html.escape(query)}» ничего не найдено", None
+
+    text = f"🔎 <b>Поиск:</b> {html.escape(query)} (стр. {page + 1})\n\n"
+    for i, row in enumerate(rows, start=page * SEARCH_PAGE_SIZE + 1):
+        date = datetime.fromtimestamp(row['published_at']).strftime('%d.%m.%Y')
+        status = "✅" if row['posted_to_telegram'] else "⏳"
+        title = html.escape(row['title'][:100])
+        link = f"<a href='{html.escape(row['url'])}'>{title}</a>" if row['url'].startswith("http") else title
+        text += f"{i}. {status} {link}\n    <i>{html.escape(row['source'])}, {date}</i>\n"
+
+    return text, _search_keyboard(query, page, has_next)
+
+
+@router.message(Command("search"))
+async def cmd_search(message, command: CommandObject):
+    """Полнотекстовый поиск по новостям и архиву"""
+    query = (command.args or "").strip()
+    if not query:
+        await message.answer(
+            "Использование: /search <запрос>\nНапример: /search bitcoin etf\n\n"
+            "Ищет по новостям и архиву: сначала самые релевантные, при равной - свежие"
+        )
+        return
+
+    try:
+        text, keyboard = await _render_search(query, page=0)
+        await message.answer(text, parse_mode="HTML", reply_markup=keyboard,
+                             disable_web_page_preview=True)
+    except Exception as e:
+        logger.error(f"Ошибка search: {e}")
+        await message.answer("⚠️ Ошибка поиска")
+
+
+@router.callback_query(F.data.startswith("search:"))
+async def cb_search_page(callback: CallbackQuery):
+    """Листание результатов /search"""
+    try:
+        _, page, query_id = callback.data.split(":", 2)
+        query = _search_queries.get(query_id)
+        if query is None:
+            # Бот перезапускался или запрос вытеснен более новыми
+            await callback.answer("Поиск устарел, повторите /search", show_alert=True)
+            return
+        text, keyboard = await _render_search(query, page=int(page))
+        await callback.message.edit_text(text, parse_mode="HTML", reply_markup=keyboard,
+                                         disable_web_page_preview=True)
+        await callback.answer()
+    except Exception as e:
+        logger.error(f"Ошибка search (страница): {e}")
+        await callback.answer("⚠️ Ошибка поиска")
+
+
+dp.include_router(router)
+
+
+# === ЗАДАЧИ ПЛАНИРОВЩИКА (С ЗАЩИТОЙ) ===
+@safe_task("RSS Parsing")
+async def scheduled_parsing(feeds: Optional[dict] = None) -> Optional[dict]:
+    """
+    Сбор новостей из лент feeds ({source: url}, по умолчанию все) (защищено декоратором)
+
+    Returns:
+        Итог по лентам {feed_url: {"status", "fresh"}} для планировщика лент
+    """
+    await ingest_cycle(
+        rss_parser, db, feeds,
+        preflight=image_preflight if config.image_preflight else None
+    )
+    return rss_parser.last_feed_results
+
+
+@safe_task("Queue Poster")
+async def publish_news_item(news_item: NewsItem, is_hot: bool) -> bool:
+    """Публикация одной новости из очереди (защищено декоратором)"""
+    # Публикация
+    logger.info(f"🚀 Публикация: {news_item.title[:30]}")
+
+    # Подготовка данных (summary в БД уже нормализован)
+    ai_data = None
+    summary_normalized = True
+    if "Insider" in news_item.source:
+        ai_data = await ai_analyzer.analyze_text(
+            news_item.title + " " + news_item.summary
+        )
+    else:
+        ai_result = await ai_analyzer.translate_and_analyze(
+            news_item.title,
+            news_item.summary
+        )
+        if ai_result:
+            news_item.title = ai_result.get('clean_title', news_item.title)
+            news_item.summary = ai_result.get('clean_summary', news_item.summary)
+            summary_normalized = False
+            ai_data = ai_result
+
+    # Битую картинку заменит картинка монеты (вердикт обычно уже в кэше со сбора лент)
+    if config.image_preflight and news_item.image_url:
+        if await image_preflight.check(news_item.image_url, referer=news_item.url) == IMAGE_BAD:
+            news_item.image_url = None
+
+    prices = await get_multiple_crypto_prices()
+    fear_greed = await FearGreedIndexTracker.get_fear_greed_index()
+
+    msg_data = AdvancedMessageFormatter.format_professional_news(
+        title=news_item.title,
+        summary=news_item.summary,
+        source=news_item.source,
+        source_url=news_item.url,
+        prices=prices,
+        fear_greed=fear_greed,
+        image_url=news_item.image_url,
+        ai_data=ai_data,
+        summary_normalized=summary_normalized
+    )
+
+    rich_msg = RichMediaMessage(
+        msg_data['text'], msg_data['image_url'], referer=news_item.url,
+        preflight=image_preflight if config.image_preflight else None
+    )
+    if not await rich_msg.send(bot, config.telegram_channel_id):
+        return False
+
+    await db.mark_as_posted(news_item.url)
+    if not is_hot:
+        rate_limiter.mark_posted()
+    return True
+
+
+# Публикатор просыпается по событиям БД и таймеру Rate Limiter
+publisher = NewsPublisher(publish_news_item, rate_limiter)
+
+# Каждая лента опрашивается по своему расписанию (темп источника, ошибки)
+feed_scheduler = FeedScheduler(
+    scheduled_parsing,
+    rss_parser.feeds,
+    base_interval=config.parse_interval,
+    state_store=db,
+    weights={source.url: source.weight for source in rss_parser.registry.sources}
+)
+
+# Либо ленты делятся между процессами-воркерами (INGEST_WORKERS > 0)
+ingest_coordinator = IngestCoordinator(
+    rss_parser.feeds,
+    config.ingest_workers,
+    state_store=db,
+    health=rss_parser.health,
+    preflight=image_preflight if config.image_preflight else None,
+    options={
+        "feeds_file": config.feeds_file,
+        "parse_interval": config.parse_interval,
+        "parser_workers": config.parser_workers,
+        "parser_streaming": config.parser_streaming,
+        "feed_max_bytes": config.feed_max_bytes,
+        "feed_failure_threshold": config.feed_failure_threshold,
+        "feed_open_delay": config.feed_open_delay,
+        "log_level": config.log_level,
+    }
+) if config.ingest_workers else None
+
+
+@safe_task("DB Retention")
+async def run_retention():
+    """Архивация старых опубликованных новостей и incremental vacuum"""
+    await db.archive_old_news(retention_days=config.retention_days)
+
+
+# === МОНИТОРИНГ ЗДОРОВЬЯ ===
+@safe_task("Health Monitor")
+async def monitor_health():
+    """Проверка состояния бота каждые 10 минут"""
+    from datetime import datetime, timedelta
+
+    # Проверяем давность последнего поста
+    if rate_limiter.last_post_time:
+        delta = datetime.now() - rate_limiter.last_post_time
+        if delta > timedelta(hours=2):
+            await alert_manager.send_alert(
+                f"Бот не публиковал новости {delta.total_seconds() / 3600:.1f} часов!\n"
+                f"Последний пост: {rate_limiter.last_post_time}",
+                level="WARNING"
+            )
+
+    # Проверяем статус Userbot
+    if config.tg_api_id and not listener.is_running:
+        await alert_manager.send_alert(
+            "Userbot не запущен, хотя TG_API_ID настроен!",
+            level="ERROR"
+        )
+
+
+# === ГЛАВНАЯ ФУНКЦИЯ ===
+async def main():
+    """Главная функция с глобальной обработкой ошибок"""
+    try:
+        logger.info("=" * 60)
+        logger.info("🚀 CRYPTO NEWS BOT - ЗАПУСК")
+        logger.info("=" * 60)
+
+        if not config.admin_id:
+            logger.warning("⚠️ ADMIN_ID не установлен - алерты будут только в логах!")
+        else:
+            logger.info(f"✅ AlertManager настроен (Admin ID: {config.admin_id})")
+
+        # 0. Общий HTTP клиент (пул соединений для RSS и API) и монитор event loop
+        await http_client.start()
+        loop_monitor.start()
+
+        # 1. Инициализация БД
+        logger.info("📦 Инициализация базы данных...")
+        try:
+            db.dedup_window_hours = config.dedup_window_hours
+            await db.init()
+            logger.info("✅ БД подключена")
+        except Exception as e:
+            await critical_error_handler("Не удалось инициализировать БД", e)
+            raise
+
+        # 2. Запуск Userbot
+        if config.tg_api_id and config.tg_api_hash:
+            logger.info("🎧 Запуск Telegram Userbot...")
+            asyncio.create_task(listener.start())
+        else:
+            logger.warning("⚠️ Userbot отключен (нет TG_API_ID/TG_API_HASH)")
+
+        # 3. Настройка планировщика
+        logger.info("⏰ Настройка планировщика задач...")
+        scheduler.add_job(
+            monitor_health,
+            IntervalTrigger(minutes=10),
+            id="health_monitor",
+            name="Health Monitor"
+        )
+        scheduler.add_job(
+            run_retention,
+            IntervalTrigger(hours=24),
+            id="db_retention",
+            name="DB Retention"
+        )
+        scheduler.start()
+        logger.info("✅ Планировщик запущен")
+
+        # 4. Публикатор и первый прогон задач
+        logger.info("🔄 Запуск начальных задач...")
+        publisher.start()
+        if ingest_coordinator:
+            await ingest_coordinator.start()
+        else:
+            await feed_scheduler.start()
+
+        # 5. Отправляем уведомление админу о старте
+        if config.admin_id:
+            await alert_manager.send_alert(
+                f"Бот успешно запущен!\n"
+                f"Userbot: {'✅ Активен' if listener.is_running else '❌ Отключен'}\n"
+                f"Задач в планировщике: {len(scheduler.get_jobs())}",
+                level="INFO"
+            )
+
+        # 6. Запуск Polling (блокирует выполнение)
+        logger.info("🤖 Запуск Telegram Bot (Long Polling)...")
+        logger.info("=" * 60)
+        await dp.start_polling(bot)
+
+    except KeyboardInterrupt:
+        logger.info("\n🛑 Получен сигнал остановки (Ctrl+C)")
+
+    except Exception as e:
+        await critical_error_handler("Критическая ошибка в main()", e)
+        sys.exit(1)
+
+    finally:
+        logger.info("🧹 Очистка ресурсов...")
+
+        # Остановка планировщика
+        if scheduler.running:
+            scheduler.shutdown(wait=False)
+            logger.info("✅ Планировщик остановлен")
+
+        # Остановка публикатора и опроса лент
+        await publisher.stop()
+        if ingest_coordinator:
+            await ingest_coordinator.stop()
+        await feed_scheduler.stop()
+
+        # Остановка Userbot
+        if listener.is_running:
+            await listener.stop()
+
+        # Закрытие пула соединений БД
+        await db.close()
+
+        # Закрытие HTTP клиента и пула разбора лент
+        await http_client.close()
+        rss_parser.close()
+        await loop_monitor.stop()
+
+        # Закрытие бота
+        await bot.session.close()
+        logger.info("✅ Bot session закрыт")
+
+        logger.info("=" * 60)
+        logger.info("👋 БОТ ОСТАНОВЛЕН")
+        logger.info("=" * 60)
+
@@ -0,0 +1,153 @@
+# benchmarks/bench_feed_scheduler.py
+"""
+Бенчмарк расписания опроса RSS лент (моделирование, без сети).
+
+Ленты публикуют записи как пуассоновский поток со своим темпом,
+одна лента все время отвечает ошибкой. Сравниваются общий проход
+всех лент раз в 10 минут (как было) и FeedScheduler: сколько запросов
+сделано, через сколько после публикации запись найдена и сколько
+запросов приходится на самую загруженную минуту.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_feed_scheduler --days 3
+"""
+import argparse
+import asyncio
+import bisect
+import heapq
+import random
+import statistics
+import sys
+from collections import Counter
+
+from parser.rss_parser import FEED_ERROR, FEED_OK
+from services.feed_scheduler import FeedScheduler
+
+FIXED_INTERVAL = 600  # сек, старый IntervalTrigger(minutes=10)
+
+# Темп лент, записей в час (None - лента недоступна)
+FEED_RATES = {
+    "Cointelegraph": 6.0,
+    "Forklog": 4.0,
+    "CoinDesk": 2.5,
+    "Bits.media": 1.5,
+    "Decrypt": 1.0,
+    "The Block": 0.8,
+    "Bitcoin Magazine": 0.4,
+    "CryptoSlate": 0.2,
+    "Dead feed": None,
+}
+
+
+def build_arrivals(rate: float, duration: float, rng: random.Random) -> list:
+    arrivals, t = [], 0.0
+    while rate:
+        t += rng.expovariate(rate / 3600)
+        if t >= duration:
+            break
+        arrivals.append(t)
+    return arrivals
+
+
+class FeedModel:
+    """Лента в моделировании: отдает записи, опубликованные с прошлого опроса"""
+
+    def __init__(self, arrivals: list, alive: bool):
+        self.arrivals = arrivals
+        self.alive = alive
+        self.cursor = 0
+        self.latencies = []
+
+    def poll(self, now: float) -> tuple:
+        if not self.alive:
+            return FEED_ERROR, 0
+        end = bisect.bisect_right(self.arrivals, now)
+        fresh = self.arrivals[self.cursor:end]
+        self.latencies.extend(now - published for published in fresh)
+        self.cursor = end
+        return FEED_OK, len(fresh)
+
+
+def build_models(duration: float, seed: int) -> dict:
+    rng = random.Random(seed)
+    return {
+        source: FeedModel(build_arrivals(rate or 0.0, duration, rng), rate is not None)
+        for source, rate in FEED_RATES.items()
+    }
+
+
+def run_fixed(duration: float, seed: int) -> tuple:
+    models = build_models(duration, seed)
+    polls = []
+    t = 0.0
+    while t < duration:
+        for model in models.values():
+            model.poll(t)
+            polls.append(t)
+        t += FIXED_INTERVAL
+    return models, polls
+
+
+def run_adaptive(duration: float, seed: int, base_interval: int) -> tuple:
+    random.seed(seed)
+    models = build_models(duration, seed)
+    feeds = {source: f"https://example.com/{i}" for i, source in enumerate(models)}
+    urls = {url: source for source, url in feeds.items()}
+
+    scheduler = FeedScheduler(None, feeds, base_interval=base_interval)
+    asyncio.run(scheduler.load(now=0.0))
+
+    polls = []
+    queue = [(entry["next_poll"], url) for url, entry in scheduler.schedule.items()]
+    heapq.heapify(queue)
+    while queue:
+        now, url = heapq.heappop(queue)
+        if now >= duration:
+            break
+        status, fresh = models[urls[url]].poll(now)
+        scheduler.record_poll(url, status, fresh, now)
+        polls.append(now)
+        heapq.heappush(queue, (scheduler.schedule[url]["next_poll"], url))
+    return models, polls
+
+
+def summarize(name: str, models: dict, polls: list, days: float) -> dict:
+    latencies = [value for model in models.values() for value in model.latencies]
+    per_minute = Counter(int(t // 60) for t in polls)
+    return {
+        "name": name,
+        "requests_per_day": len(polls) / days,
+        "median_s": statistics.median(latencies),
+        "p90_s": statistics.quantiles(latencies, n=10)[-1],
+        "peak_per_minute": max(per_minute.values()),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--days", type=float, default=3)
+    parser.add_argument("--parse-interval", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    duration = args.days * 86400
+    rows = [
+        summarize("раз в 10 минут", *run_fixed(duration, args.seed), args.days),
+        summarize(
+            f"FeedScheduler ({args.parse_interval}с)",
+            *run_adaptive(duration, args.seed, args.parse_interval), args.days
+        ),
+    ]
+
+    print(f"🧪 {len(FEED_RATES)} лент, {args.days:g} сут.\n")
+    print(f"{'режим':<26} {'запросов/сут':>13} {'медиана':>9} {'p90':>8} {'пик/мин':>8}")
+    for row in rows:
+        print(
+            f"{row['name']:<26} {row['requests_per_day']:>13.0f} {row['median_s']:>8.0f}s "
+            f"{row['p90_s']:>7.0f}s {row['peak_per_minute']:>8}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
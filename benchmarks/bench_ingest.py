@@ -0,0 +1,298 @@
+# benchmarks/bench_ingest.py
+"""
+Сквозной бенчмарк сбора лент без выхода в сеть.
+
+Локальный aiohttp сервер раздает ленты из benchmarks/fixtures (Forklog,
+Cointelegraph, CoinDesk, Decrypt) и генерированные большие ленты, каждую
+под --copies адресами. Ленты в fixtures - синтетические, не записанные
+ответы сайтов: они собраны вручную по разметке каждого сайта (пространства
+имен, CDATA, media:content/enclosure, HTML и сущности в описаниях, у
+WordPress-лент - content:encoded) из 8-10 записей, заголовки и описания -
+из небольшого набора выдуманных фраз, pubDate - с шагом ~30 минут от
+17.10.2024, картинки - по выдуманным адресам CDN. Сервер ведет себя как настоящий сайт:
+отдает ETag и 304, задерживает ответ на --latency мс, а перед каждым
+циклом в начало каждой ленты добавляется --new свежих записей с картинкой.
+Адреса разнесены по хостам 127.0.0.X, чтобы лимит соединений на хост
+работал как с разными сайтами. Картинки (и из лент в fixtures) сервер
+тоже отдает сам, с поддержкой Range.
+
+Цикл - services.ingest.ingest_cycle, тот же, что вызывает scheduled_parsing
+в app.py: ленты, проверка картинок (--no-preflight - без нее), запись во
+временную БД с отсевом почти-дублей, commit_feed_states.
+
+Отчет: первый (холодный) цикл отдельно, по остальным - p50/p99 времени
+цикла, записей лент в секунду, новостей и транзакций БД за цикл, пик
+памяти за цикл (отдельный цикл под tracemalloc - он замедляет работу).
+С --max-p99-ms завершается с кодом 1, если p99 цикла хуже порога.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_ingest --copies 10 --large 4 --cycles 20
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import random
+import re
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from email.utils import formatdate
+from hashlib import blake2b
+from pathlib import Path
+
+from aiohttp import web
+
+from benchmarks.bench_loop_stall import build_feed
+from database import NewsDatabase
+from parser.feed_registry import FeedRegistry, FeedSource
+from parser.rss_parser import RSSParser
+from services.http_client import http_client
+from services.image_preflight import ImagePreflight
+from services.ingest import ingest_cycle
+
+FIXTURES = Path(__file__).parent / "fixtures"
+KEEP_CYCLES = 5  # сколько циклов свежие записи остаются в ленте
+IMAGE = b"\xff\xd8\xff\xe0" + bytes(40 * 1024)  # "JPEG" на 40 КБ
+_IMAGE_URL_RE = re.compile(rb"https?://[^\s\"'<>]+?\.(?:jpe?g|png|gif|webp)[^\s\"'<>]*")
+
+WORDS = (
+    "Bitcoin", "Ethereum", "SEC", "ETF", "Binance", "Coinbase", "рынок", "биткоин",
+    "майнинг", "Solana", "регуляция", "листинг", "BlackRock", "Tether", "курс", "биржа",
+    "стейкинг", "халвинг", "токен", "фонд", "инвесторы", "рост", "падение", "отток",
+)
+
+
+class FeedServer:
+    """Ленты по адресам /<name>, картинки - /img/<name>; cycle задает, сколько свежих записей уже вышло"""
+
+    def __init__(self, feeds: dict, new_per_cycle: int, latency: float):
+        self.feeds = feeds
+        self.new_per_cycle = new_per_cycle
+        self.latency = latency
+        self.cycle = 0
+        self.started = int(time.time()) - 3600
+        self.image_base = ""
+        self.requests = 0
+        self.not_modified = 0
+        self.image_requests = 0
+        self._cache = {}
+
+    def localize_images(self, image_base: str):
+        """Картинки лент из fixtures - с этого же сервера (бенчмарк не ходит в сеть)"""
+        self.image_base = image_base
+        for name, content in self.feeds.items():
+            self.feeds[name] = _IMAGE_URL_RE.sub(
+                lambda m: f"{image_base}/img/{blake2b(m.group(0), digest_size=6).hexdigest()}.jpg".encode(),
+                content
+            )
+
+    def _fresh_items(self, name: str) -> bytes:
+        items = []
+        for cycle in range(self.cycle, max(0, self.cycle - KEEP_CYCLES), -1):
+            for i in range(self.new_per_cycle):
+                rnd = random.Random(f"{name}-{cycle}-{i}")
+                title = " ".join(rnd.choice(WORDS) for _ in range(8))
+                items.append(
+                    f"<item><guid>{name}-{cycle}-{i}</guid><title>{title}</title>"
+                    f"<link>https://bench.local/{name}/{cycle}/{i}</link>"
+                    f"<pubDate>{formatdate(self.started + cycle * 60 - i, usegmt=True)}</pubDate>"
+                    f'<enclosure url="{self.image_base}/img/{name}-{cycle}-{i}.jpg" '
+                    f'type="image/jpeg" length="{len(IMAGE)}"/>'
+                    f"<description><![CDATA[<p>{title}.</p>]]></description></item>"
+                )
+        return "".join(items).encode("utf-8")
+
+    def body(self, name: str) -> tuple:
+        key = (name, self.cycle)
+        if key not in self._cache:
+            content = self.feeds[name]
+            position = content.find(b"<item")
+            body = content[:position] + self._fresh_items(name) + content[position:]
+            self._cache = {k: v for k, v in self._cache.items() if k[1] == self.cycle}
+            self._cache[key] = (body, f'"{blake2b(body, digest_size=8).hexdigest()}"')
+        return self._cache[key]
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        name = request.match_info["name"]
+        if name not in self.feeds:
+            return web.Response(status=404)
+
+        body, etag = self.body(name)
+        if request.headers.get("If-None-Match") == etag:
+            self.not_modified += 1
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(body=body, content_type="application/rss+xml", headers={"ETag": etag})
+
+    async def handle_image(self, request: web.Request) -> web.Response:
+        self.image_requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        match = re.fullmatch(r"bytes=(\d+)-(\d+)", request.headers.get("Range", ""))
+        if not match:
+            return web.Response(body=IMAGE, content_type="image/jpeg")
+        start, end = int(match.group(1)), min(int(match.group(2)), len(IMAGE) - 1)
+        return web.Response(
+            status=206, body=IMAGE[start:end + 1], content_type="image/jpeg",
+            headers={"Content-Range": f"bytes {start}-{end}/{len(IMAGE)}"}
+        )
+
+
+def build_corpus(copies: int, large: int, large_items: int) -> dict:
+    feeds = {}
+    for path in sorted(FIXTURES.glob("*.xml")):
+        content = path.read_bytes()
+        for copy in range(copies):
+            feeds[f"{path.stem}-{copy}"] = content
+    for seed in range(large):
+        feeds[f"large-{seed}"] = build_feed(large_items, seed)
+    return feeds
+
+
+async def run_cycle(parser: RSSParser, db: NewsDatabase, preflight) -> dict:
+    """Цикл бота (services.ingest.ingest_cycle) с замером"""
+    batches, operations = db.writes.batches, db.writes.operations
+    images = dict(preflight.stats) if preflight else {}
+    started = time.perf_counter()
+    # RSSParser печатает строку на каждую ленту
+    with contextlib.redirect_stdout(io.StringIO()):
+        new_urls = await ingest_cycle(parser, db, preflight=preflight)
+    elapsed = time.perf_counter() - started
+
+    stats = parser.last_cycle_stats
+    return {
+        "elapsed": elapsed,
+        "entries": stats["entries"],
+        "news": len(new_urls),
+        "images": {key: preflight.stats[key] - images[key] for key in images},
+        "not_modified": stats["not_modified"],
+        "errors": stats["errors"],
+        "parse_ms": stats["parse_ms"],
+        "transactions": db.writes.batches - batches,
+        "operations": db.writes.operations - operations,
+    }
+
+
+def percentile(values: list, pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+async def run(args) -> int:
+    corpus = build_corpus(args.copies, args.large, args.large_items)
+    server = FeedServer(corpus, args.new, args.latency / 1000)
+    app = web.Application()
+    app.router.add_get("/img/{name}", server.handle_image)
+    app.router.add_get("/{name}", server.handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    hosts = [f"127.0.0.{i + 1}" for i in range(args.hosts)]
+    port = None
+    for host in hosts:
+        site = web.TCPSite(runner, host, port or 0)
+        await site.start()
+        port = port or site._server.sockets[0].getsockname()[1]
+    server.localize_images(f"http://{hosts[-1]}:{port}")
+
+    registry = FeedRegistry(
+        FeedSource(name=name, url=f"http://{hosts[i % len(hosts)]}:{port}/{name}")
+        for i, name in enumerate(corpus)
+    )
+    workdir = tempfile.mkdtemp(prefix="bench_ingest_")
+    db = NewsDatabase(os.path.join(workdir, "news.db"), os.path.join(workdir, "archive.db"))
+    await db.init()
+    await http_client.start()
+    parser = RSSParser(
+        state_store=db, registry=registry, workers=args.workers,
+        use_processes=args.processes, streaming=not args.no_streaming
+    )
+    parser.feeds = registry.select()
+    preflight = None if args.no_preflight else ImagePreflight()
+
+    size_kb = sum(len(content) for content in corpus.values()) / 1024
+    print(
+        f"🧪 {len(corpus)} лент ({size_kb:.0f} КБ) на {len(hosts)} хостах, "
+        f"+{args.new} записей/ленту за цикл, задержка {args.latency:g} мс, "
+        f"{'процессы' if args.processes else 'потоки'} x{args.workers}\n"
+    )
+
+    rows = []
+    try:
+        for cycle in range(args.cycles + 1):
+            server.cycle = cycle
+            rows.append(await run_cycle(parser, db, preflight))
+
+        # Пик памяти - отдельным циклом
+        server.cycle += 1
+        tracemalloc.start()
+        traced = await run_cycle(parser, db, preflight)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        parser.close()
+        await http_client.close()
+        await db.close()
+        await runner.cleanup()
+
+    cold, warm = rows[0], rows[1:] or rows
+    times = [row["elapsed"] * 1000 for row in warm]
+    entries = sum(row["entries"] for row in warm)
+    elapsed = sum(row["elapsed"] for row in warm)
+
+    print(f"{'':<26} {'холодный':>10} {'дальше (' + str(len(warm)) + ')':>14}")
+    print(f"{'цикл, мс':<26} {cold['elapsed'] * 1000:>10.0f} "
+          f"{'p50 ' + format(statistics.median(times), '.0f'):>14}")
+    print(f"{'':<26} {'':>10} {'p99 ' + format(percentile(times, 99), '.0f'):>14}")
+    print(f"{'записей лент/с':<26} {cold['entries'] / cold['elapsed']:>10.0f} {entries / elapsed:>14.0f}")
+    print(f"{'разбор, мс (сумма)':<26} {cold['parse_ms']:>10.0f} "
+          f"{statistics.mean(row['parse_ms'] for row in warm):>14.0f}")
+    print(f"{'новостей в БД':<26} {cold['news']:>10} {statistics.mean(row['news'] for row in warm):>14.1f}")
+    for key, label in (("checked", "картинок проверено"), ("cached", "картинок из кэша")):
+        if key in cold["images"]:
+            print(f"{label:<26} {cold['images'][key]:>10} "
+                  f"{statistics.mean(row['images'][key] for row in warm):>14.1f}")
+    print(f"{'транзакций БД':<26} {cold['transactions']:>10} "
+          f"{statistics.mean(row['transactions'] for row in warm):>14.1f}")
+    print(f"{'ответов 304':<26} {cold['not_modified']:>10} "
+          f"{statistics.mean(row['not_modified'] for row in warm):>14.1f}")
+    print(f"\nПик памяти за цикл (tracemalloc): {peak / 1024 / 1024:.1f} МБ, "
+          f"цикл под трассировкой {traced['elapsed'] * 1000:.0f} мс")
+    print(f"Пиковый RSS процесса: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} МБ")
+
+    errors = sum(row["errors"] for row in rows)
+    if errors:
+        print(f"\n❌ Ошибок загрузки: {errors}")
+        return 1
+    if args.max_p99_ms and percentile(times, 99) > args.max_p99_ms:
+        print(f"\n❌ p99 цикла {percentile(times, 99):.0f} мс хуже порога {args.max_p99_ms:g} мс")
+        return 1
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--copies", type=int, default=10, help="адресов на каждую ленту из fixtures")
+    parser.add_argument("--large", type=int, default=4, help="синтетических больших лент")
+    parser.add_argument("--large-items", type=int, default=200)
+    parser.add_argument("--new", type=int, default=2, help="свежих записей на ленту за цикл")
+    parser.add_argument("--cycles", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=20, help="задержка ответа сервера, мс")
+    parser.add_argument("--hosts", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--processes", action="store_true", help="разбор в пуле процессов")
+    parser.add_argument("--no-streaming", action="store_true")
+    parser.add_argument("--no-preflight", action="store_true", help="без проверки картинок")
+    parser.add_argument("--max-p99-ms", type=float, default=0, help="порог p99 цикла (0 - не проверять)")
+    args = parser.parse_args()
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
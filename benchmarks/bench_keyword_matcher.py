@@ -0,0 +1,187 @@
+# benchmarks/bench_keyword_matcher.py
+"""
+Бенчмарк KeywordMatcher против перебора ключевых слов.
+
+Базовая линия - перебор с той же семантикой: для каждого слова списка
+своя регулярка с границами слова и основами ("sec" не совпадает
+с "second", "etf*" совпадает с "etfs"), text.lower() и поиск по очереди
+до первого совпадения. Новый способ - одна скомпилированная регулярка
+на весь список. Совпадения обоих способов сверяются.
+
+Для справки - старый `keyword in text` (как было в RSSParser._is_relevant
+и TelegramListener): он не эквивалентен - не знает границ слов, поэтому
+находит ложные совпадения и раньше останавливается на них.
+
+Тексты - синтетические заголовки с описаниями, большая часть без
+совпадений (худший случай для перебора: проверяются все слова).
+Отдельно - реальные списки RSSParser (со звездочками основ) в логике
+_is_relevant: сначала blacklist, потом whitelist.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_keyword_matcher --texts 2000 --sizes 50,500,5000
+"""
+import argparse
+import random
+import string
+import sys
+import time
+
+from parser.rss_parser import BLACKLIST_KEYWORDS, WHITELIST_KEYWORDS, RSSParser
+from utils.keyword_matcher import KeywordMatcher
+
+WORDS = (
+    "traders second quarter report analysts expect growth inflation canada "
+    "аналитики ожидают рост инфляции квартал отчет компании заявили "
+    "network upgrade developers release wallet security update protocol"
+).split()
+MATCH_SHARE = 0.1  # доля текстов с настоящим ключевым словом
+# Формы слов из реальных списков (в т.ч. по основам) для текстов с совпадением
+REAL_HITS = (
+    "bitcoins", "криптовалюта", "etfs", "markets", "регуляция", "binance",
+    "биржи", "airdrops", "казино", "sec",
+)
+
+# Подстрока, но не слово: перебор находит ложные совпадения, матчер - нет
+BOUNDARY_CASES = {
+    "sec": "second quarter results",
+    "eth": "ethical investing",
+    "ada": "canada adopts new rules",
+    "dot": "anecdote about markets",
+}
+
+
+def build_keywords(size: int, rng: random.Random) -> list:
+    """"bitcoin" + случайные слова до size (в текстах не встречаются даже подстрокой)"""
+    keywords = ["bitcoin"]
+    while len(keywords) < size:
+        length = rng.randint(4, 12)
+        keywords.append("".join(rng.choices(string.ascii_lowercase, k=length)))
+    return keywords[:size]
+
+
+def build_texts(count: int, rng: random.Random, hits=("bitcoin",)) -> list:
+    texts = []
+    for _ in range(count):
+        words = rng.choices(WORDS, k=rng.randint(20, 60))
+        if rng.random() < MATCH_SHARE:
+            words.insert(rng.randrange(len(words)), rng.choice(hits))
+        texts.append(" ".join(words))
+    return texts
+
+
+def per_keyword(keywords: list) -> list:
+    """По регулярке на слово - та же семантика границ и основ, что у матчера"""
+    return [KeywordMatcher([keyword]).pattern for keyword in keywords]
+
+
+def loop_any(patterns: list, texts: list) -> int:
+    hits = 0
+    for text in texts:
+        text = text.lower()
+        if any(pattern.search(text) for pattern in patterns):
+            hits += 1
+    return hits
+
+
+def substring_any(keywords: list, texts: list) -> int:
+    keywords = [keyword.rstrip("*") for keyword in keywords]
+    hits = 0
+    for text in texts:
+        text = text.lower()
+        if any(keyword in text for keyword in keywords):
+            hits += 1
+    return hits
+
+
+def matcher_any(matcher: KeywordMatcher, texts: list) -> int:
+    return sum(1 for text in texts if matcher.matches(text))
+
+
+def loop_relevant(blacklist: list, whitelist: list, texts: list) -> int:
+    """_is_relevant перебором: сначала blacklist, потом whitelist"""
+    relevant = 0
+    for text in texts:
+        text = text.lower()
+        if any(pattern.search(text) for pattern in blacklist):
+            continue
+        if any(pattern.search(text) for pattern in whitelist):
+            relevant += 1
+    return relevant
+
+
+def substring_relevant(texts: list) -> int:
+    blacklist = [keyword.rstrip("*") for keyword in BLACKLIST_KEYWORDS]
+    whitelist = [keyword.rstrip("*") for keyword in WHITELIST_KEYWORDS]
+    relevant = 0
+    for text in texts:
+        text = text.lower()
+        if any(keyword in text for keyword in blacklist):
+            continue
+        if any(keyword in text for keyword in whitelist):
+            relevant += 1
+    return relevant
+
+
+def matcher_relevant(texts: list) -> int:
+    return sum(1 for text in texts if RSSParser._is_relevant(text))
+
+
+def measure(func, *args) -> tuple:
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--texts", type=int, default=2000)
+    parser.add_argument("--sizes", default="50,500,5000")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    texts = build_texts(args.texts, rng)
+    size_kb = sum(len(text.encode("utf-8")) for text in texts) / 1024
+    print(f"🧪 {len(texts)} текстов ({size_kb:.0f} КБ)\n")
+
+    print(f"{'слов':>6} {'сборка':>9} {'перебор':>12} {'матчер':>12} {'ускорение':>10} "
+          f"{'совпало':>12} {'подстрока*':>12}")
+    for size in (int(value) for value in args.sizes.split(",")):
+        keywords = build_keywords(size, rng)
+        matcher, build_time = measure(KeywordMatcher, keywords)
+        loop_hits, loop_time = measure(loop_any, per_keyword(keywords), texts)
+        matcher_hits, matcher_time = measure(matcher_any, matcher, texts)
+        _, substring_time = measure(substring_any, keywords, texts)
+        print(
+            f"{size:>6} {build_time * 1000:7.1f}ms "
+            f"{len(texts) / loop_time:>8.0f} т/с {len(texts) / matcher_time:>8.0f} т/с "
+            f"{loop_time / matcher_time:>9.1f}x {loop_hits:>5} / {matcher_hits:<5} "
+            f"{len(texts) / substring_time:>8.0f} т/с"
+        )
+
+    real_texts = build_texts(args.texts, rng, REAL_HITS)
+    blacklist, whitelist = per_keyword(BLACKLIST_KEYWORDS), per_keyword(WHITELIST_KEYWORDS)
+    loop_hits, loop_time = measure(loop_relevant, blacklist, whitelist, real_texts)
+    matcher_hits, matcher_time = measure(matcher_relevant, real_texts)
+    substring_hits, substring_time = measure(substring_relevant, real_texts)
+    print(
+        f"\nРеальные списки, _is_relevant ({len(BLACKLIST_KEYWORDS)} + {len(WHITELIST_KEYWORDS)} слов, "
+        f"с основами): перебор {len(real_texts) / loop_time:.0f} т/с, "
+        f"матчер {len(real_texts) / matcher_time:.0f} т/с "
+        f"({loop_time / matcher_time:.1f}x); релевантных {loop_hits} / {matcher_hits}"
+    )
+    print(
+        f"* подстрока - старый `keyword in text`, не эквивалентен: без границ слов, "
+        f"на реальных списках {len(real_texts) / substring_time:.0f} т/с и {substring_hits} "
+        f"\"релевантных\" (лишнее - подстроки вроде 'eth' в 'network')"
+    )
+
+    print("\nГраницы слов (подстрока / матчер):")
+    for keyword, text in BOUNDARY_CASES.items():
+        matcher = KeywordMatcher([keyword])
+        print(f"  {keyword!r:6} в {text!r:28} {keyword in text!s:>5} / {matcher.matches(text)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+# benchmarks/bench_loop_stall.py
+"""
+Бенчмарк залипаний event loop при разборе RSS лент.
+
+Разбирает несколько больших синтетических лент четырьмя способами -
+прямо в корутине (как было раньше), в пуле потоков, в пуле процессов
+и потоково, как по умолчанию в RSSParser: StreamingFeedParser получает
+тело кусками по READ_CHUNK_SIZE прямо на event loop (между кусками
+loop свободен, как при чтении из сети) и останавливается на
+MAX_ENTRIES_PER_FEED записях, а отбор и очистка уходят в пул потоков.
+Сравниваются задержки event loop, которые намерил LoopLagMonitor.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_loop_stall --feeds 6 --items 200
+"""
+import argparse
+import asyncio
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from parser.rss_parser import MAX_ENTRIES_PER_FEED, READ_CHUNK_SIZE, parse_feed, process_feed
+from parser.stream_parser import MAX_FEED_BYTES, StreamingFeedParser
+from utils.loop_monitor import LoopLagMonitor
+
+PARAGRAPH = (
+    "<p>Bitcoin and Ethereum markets moved after the <b>SEC</b> decision on "
+    "<a href='https://example.com/etf'>spot ETF</a> applications &amp; traders "
+    "rushed to exchanges.</p>"
+)
+
+
+def build_feed(items: int, seed: int) -> bytes:
+    """RSS с items записями и ~3 КБ HTML в каждой"""
+    body = "".join(
+        f"<item><guid>feed{seed}-{i}</guid><title>Bitcoin ETF update {seed}-{i}</title>"
+        f"<link>https://example.com/{seed}/{i}</link>"
+        f"<pubDate>Mon, 01 Jan 2024 {i % 24:02d}:{i % 60:02d}:00 GMT</pubDate>"
+        f"<description><![CDATA[<img src='https://example.com/{i}.png'>{PARAGRAPH * 12}]]></description>"
+        f"</item>"
+        for i in range(items)
+    )
+    return (
+        f'<?xml version="1.0"?><rss version="2.0"><channel><title>Feed {seed}</title>'
+        f"{body}</channel></rss>"
+    ).encode("utf-8")
+
+
+async def parse_streaming(content: bytes, executor) -> dict:
+    """Как RSSParser._download + _fetch в потоковом режиме"""
+    reader = StreamingFeedParser(MAX_ENTRIES_PER_FEED, MAX_FEED_BYTES)
+    eof = True
+    for start in range(0, len(content), READ_CHUNK_SIZE):
+        reader.feed(content[start:start + READ_CHUNK_SIZE])
+        if reader.done:
+            eof = False
+            break
+        # Следующий кусок еще "в сети" - loop свободен
+        await asyncio.sleep(0)
+    reader.close(eof=eof)
+    return await asyncio.get_running_loop().run_in_executor(
+        executor, process_feed, reader.entries, {}
+    )
+
+
+async def run_mode(name: str, feeds: list, executor, streaming: bool = False) -> dict:
+    monitor = LoopLagMonitor(interval=0.01, threshold=0.05)
+    monitor.start()
+    # Даем монитору начать отсчет
+    await asyncio.sleep(0.05)
+
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+
+    async def parse(content: bytes):
+        if streaming:
+            return await parse_streaming(content, executor)
+        if executor is None:
+            return parse_feed(content, {})
+        return await loop.run_in_executor(executor, parse_feed, content, {})
+
+    results = await asyncio.gather(*(parse(content) for content in feeds))
+    elapsed = time.perf_counter() - started
+
+    await asyncio.sleep(0.05)
+    await monitor.stop()
+
+    assert all(result["news"] for result in results)
+    return {"name": name, "elapsed_ms": elapsed * 1000, **monitor.snapshot()}
+
+
+async def run(feeds: list, workers: int) -> list:
+    rows = [await run_mode("inline (на event loop)", feeds, None)]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        rows.append(await run_mode(f"thread pool x{workers}", feeds, executor))
+        rows.append(await run_mode(f"streaming + threads x{workers}", feeds, executor, streaming=True))
+
+    with ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        # Прогрев: запуск процессов и импорт модулей не должен попасть в замер
+        await asyncio.gather(*(
+            asyncio.get_running_loop().run_in_executor(executor, parse_feed, feeds[0], {})
+            for _ in range(workers)
+        ))
+        rows.append(await run_mode(f"process pool x{workers}", feeds, executor))
+
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--feeds", type=int, default=6)
+    parser.add_argument("--items", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+
+    feeds = [build_feed(args.items, seed) for seed in range(args.feeds)]
+    size_kb = sum(len(feed) for feed in feeds) / 1024
+    print(f"🧪 {args.feeds} лент по {args.items} записей ({size_kb:.0f} КБ)\n")
+
+    print(f"{'режим':<28} {'время':>9} {'макс. лаг':>10} {'залипания':>10} {'в сумме':>9}")
+    for row in asyncio.run(run(feeds, args.workers)):
+        print(
+            f"{row['name']:<28} {row['elapsed_ms']:7.0f}ms {row['max_lag_ms']:8.0f}ms "
+            f"{row['stalls']:>10} {row['stall_ms']:7.0f}ms"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+# benchmarks/bench_news_memory.py
+"""
+Пиковая память одного цикла парсинга: словари с raw_entry против NewsItem.
+
+Цикл - ленты из benchmarks/fixtures, повторенные --feeds раз (как будто
+это разные ленты). Старый вариант (до NewsItem): запись ленты -> dict
+с "raw_entry" (весь FeedParserDict с исходным HTML), все словари живут
+в all_news до конца цикла, затем копируются в словари для add_news_many.
+Новый - parse_feed() отдает NewsItem со __slots__, записи feedparser
+освобождаются сразу после разбора ленты.
+
+Каждый вариант запускается в отдельном процессе: замеряются пик
+tracemalloc за цикл и прирост пикового RSS процесса (ru_maxrss).
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_news_memory --feeds 200
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import feedparser
+
+from parser.rss_parser import MAX_ENTRIES_PER_FEED, RSSParser, _SUMMARY_NORMALIZER, parse_feed
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def load_feeds(count: int) -> list:
+    contents = [path.read_bytes() for path in sorted(FIXTURES.glob("*.xml"))]
+    return [contents[i % len(contents)] for i in range(count)]
+
+
+def old_cycle(feeds: list) -> int:
+    """Как было: dict на новость с raw_entry, потом еще словари для БД"""
+    all_news = []
+    for i, content in enumerate(feeds):
+        for entry in feedparser.parse(content).entries[:MAX_ENTRIES_PER_FEED]:
+            summary = _SUMMARY_NORMALIZER.normalize(entry.get("summary", ""))
+            if not RSSParser._is_relevant(entry.get("title", ""), summary):
+                continue
+            all_news.append({
+                "title": entry.get("title", "No title"),
+                "link": entry.get("link", ""),
+                "published": RSSParser._entry_timestamp(entry),
+                "summary": summary,
+                "source": f"feed-{i}",
+                "language": "ru",
+                "image_url": RSSParser._extract_image_from_entry(entry),
+                "raw_entry": entry,
+            })
+
+    rows = [
+        {
+            "url": news["link"], "title": news["title"], "summary": news["summary"],
+            "source": news["source"], "published_at": news["published"],
+            "image_url": news["image_url"],
+        }
+        for news in all_news
+    ]
+    return len(rows)
+
+
+def new_cycle(feeds: list) -> int:
+    all_news = []
+    for i, content in enumerate(feeds):
+        news = parse_feed(content, {})["news"]
+        for item in news:
+            item.source = f"feed-{i}"
+        all_news.extend(news)
+    return len(all_news)
+
+
+def run_child(mode: str, feed_count: int) -> dict:
+    feeds = load_feeds(feed_count)
+    cycle = old_cycle if mode == "old" else new_cycle
+    # Прогрев: импорт и кэши feedparser/re не должны попасть в замер
+    cycle(feeds[:4])
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+    started = time.perf_counter()
+    news = cycle(feeds)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return {
+        "news": news,
+        "peak_kb": peak / 1024,
+        # ru_maxrss в КБ на Linux
+        "rss_growth_kb": rss_after - rss_before,
+        "rss_peak_kb": rss_after,
+        "elapsed_ms": elapsed * 1000,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--feeds", type=int, default=200)
+    parser.add_argument("--child", choices=("old", "new"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args.child, args.feeds)))
+        return 0
+
+    print(f"🧪 {args.feeds} лент из {FIXTURES.name}/ за цикл\n")
+    print(f"{'вариант':<22} {'новостей':>9} {'пик (tracemalloc)':>18} {'рост RSS':>10} {'пик RSS':>10}")
+    for mode, name in (("old", "dict + raw_entry"), ("new", "NewsItem (__slots__)")):
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_news_memory", "--feeds", str(args.feeds),
+             "--child", mode],
+            capture_output=True, text=True, check=True
+        ).stdout
+        row = json.loads(output.strip().splitlines()[-1])
+        print(
+            f"{name:<22} {row['news']:>9} {row['peak_kb'] / 1024:>15.1f} МБ "
+            f"{row['rss_growth_kb'] / 1024:>7.1f} МБ {row['rss_peak_kb'] / 1024:>7.1f} МБ"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
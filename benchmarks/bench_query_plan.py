@@ -0,0 +1,147 @@
+# benchmarks/bench_query_plan.py
+"""
+Регрессионный бенчмарк планов запросов для таблицы news.
+
+Заполняет временную БД (по умолчанию 1 000 000 строк) и через
+EXPLAIN QUERY PLAN проверяет, что горячие запросы идут по индексам,
+а не полным сканом таблицы. Падает с кодом 1, если план деградировал.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_query_plan --rows 1000000
+"""
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+from database import (
+    NewsDatabase,
+    HOT_NEWS_QUERY,
+    QUEUE_NEWS_QUERY,
+    COUNTS_QUERY,
+    HOURLY_STATS_QUERY,
+    RETENTION_CANDIDATES_QUERY,
+    SOURCE_STATS_QUERY,
+)
+
+COUNTER_TABLES = ("news_source_stats", "news_hourly_stats")
+SOURCES = ["Forklog", "Coinspot", "CoinDesk", "Cointelegraph", "Decrypt", "The Block"]
+
+# (название, запрос, параметры, обязательный индекс)
+HOT_QUERIES = [
+    ("get_hot_news", HOT_NEWS_QUERY, (), "idx_news_queue"),
+    ("get_oldest_unposted_news", QUEUE_NEWS_QUERY, (), "idx_news_queue"),
+    ("retention candidates", RETENTION_CANDIDATES_QUERY,
+     (int(time.time()) - 30 * 86400, 5000), "idx_news_added"),
+    # Счетчики поддерживаются триггерами: сканируются только их маленькие таблицы
+    ("counts", COUNTS_QUERY, (), "news_source_stats"),
+    ("hourly stats", HOURLY_STATS_QUERY, (int(time.time()) - 86400,), "news_hourly_stats"),
+    ("source stats", SOURCE_STATS_QUERY, (10,), "news_source_stats"),
+]
+
+
+def seed(conn: sqlite3.Connection, rows: int, unposted: int):
+    """Заполняет таблицу: последние `unposted` строк - очередь, остальное - архив"""
+    rnd = random.Random(42)
+    # Строки равномерно распределены по последним ~2 годам
+    start_ts = int(time.time()) - 2 * 365 * 86400
+    step = max(1, (2 * 365 * 86400) // rows)
+
+    def generate():
+        for i in range(rows):
+            is_queued = i >= rows - unposted
+            added_at = start_ts + i * step
+            yield (
+                f"https://example.com/news/{i}",
+                f"Bitcoin news #{i}",
+                "Lorem ipsum " * 8,
+                None,
+                rnd.choice(SOURCES),
+                added_at - rnd.randrange(0, 3600),
+                added_at,
+                0 if is_queued else 1,
+                1 if is_queued and rnd.random() < 0.05 else 0,
+            )
+
+    conn.executemany(
+        """INSERT INTO news
+               (url, title, summary, image_url, source, published_at, added_at,
+                posted_to_telegram, priority)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        generate()
+    )
+    conn.commit()
+    conn.execute("ANALYZE")
+
+
+async def create_schema(db_path: str, archive_path: str):
+    """Схема создается теми же миграциями, что и в боевой БД"""
+    news_db = NewsDatabase(db_path, archive_path=archive_path)
+    await news_db.init()
+    await news_db.close()
+
+
+def check_plan(conn: sqlite3.Connection, query: str, args: tuple, required: str) -> str:
+    """Возвращает текст ошибки или пустую строку, если план корректен"""
+    plan = " | ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", args))
+
+    if required not in plan:
+        return f"ожидался '{required}', план: {plan}"
+    for step in plan.split(" | "):
+        # Полный скан таблицы без индекса
+        if step.split()[:2] == ["SCAN", "news"] and "INDEX" not in step:
+            return f"полный скан таблицы: {plan}"
+    # Таблицы счетчиков - по строке на источник/час, их сортировка ничего не стоит
+    small_table = any(name in query for name in COUNTER_TABLES)
+    if "TEMP B-TREE FOR ORDER BY" in plan and "GROUP BY" not in query and not small_table:
+        return f"сортировка во временном B-дереве: {plan}"
+    return ""
+
+
+def timed(conn: sqlite3.Connection, query: str, args: tuple, repeat: int = 20) -> float:
+    """Среднее время выполнения запроса в миллисекундах"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        conn.execute(query, args).fetchall()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--unposted", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        asyncio.run(create_schema(db_path, os.path.join(tmp, "bench_archive.db")))
+
+        conn = sqlite3.connect(db_path)
+        conn.execute("PRAGMA synchronous = OFF")
+
+        print(f"🌱 Заполняю {args.rows:,} строк...")
+        start = time.perf_counter()
+        seed(conn, args.rows, args.unposted)
+        print(f"   готово за {time.perf_counter() - start:.1f}с\n")
+
+        failures = 0
+        for name, query, params, required in HOT_QUERIES:
+            error = check_plan(conn, query, params, required)
+            elapsed = timed(conn, query, params)
+            status = "✅" if not error else "❌"
+            print(f"{status} {name:<28} {elapsed:9.3f} ms")
+            if error:
+                print(f"   {error}")
+                failures += 1
+
+        conn.close()
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+# benchmarks/bench_text_normalizer.py
+"""
+Бенчмарк очистки описаний: старая цепочка против TextNormalizer.
+
+Корпус - описания и полные тексты (content:encoded) из синтетических
+лент в benchmarks/fixtures: разметка WordPress (ForkLog, Decrypt), Cointelegraph
+с картинкой в описании, CoinDesk с сущностями в тексте.
+
+Старая цепочка (как было до TextNormalizer): при разборе ленты
+clean_html (3 прохода) + remove_source_mentions (find на каждое слово),
+при публикации еще раз AdvancedMessageFormatter.clean_text (регулярки
+компилируются на каждый вызов через кэш re). Новая - один проход при
+разборе, форматтер получает уже чистый текст.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_text_normalizer --repeat 200
+"""
+import argparse
+import re
+import sys
+import time
+from html import unescape
+from pathlib import Path
+
+import feedparser
+
+from parser.rss_parser import REMOVE_KEYWORDS
+from utils.text_normalizer import READ_MORE_KEYWORDS, TextNormalizer
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def old_clean_html(text: str) -> str:
+    text = re.sub(r'<[^>]+>', '', text)
+    text = unescape(text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text
+
+
+def old_remove_source_mentions(text: str) -> str:
+    text_lower = text.lower()
+    min_position = len(text)
+
+    for keyword in REMOVE_KEYWORDS:
+        pos = text_lower.find(keyword.lower())
+        if pos != -1 and pos < min_position:
+            min_position = pos
+
+    if min_position < len(text):
+        text = text[:min_position].strip()
+
+    text = text.rstrip('.,;: ')
+    return text
+
+
+def old_clean_text(text: str) -> str:
+    text = re.sub(r'<[^>]+>', '', text)
+    text = text.replace('[…]', '').replace('...', '')
+    text = re.sub(r'Читать далее.*', '', text, flags=re.IGNORECASE)
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text
+
+
+def old_pipeline(text: str) -> str:
+    stored = old_remove_source_mentions(old_clean_html(text))
+    return old_clean_text(stored)
+
+
+def load_corpus() -> list:
+    corpus = []
+    for path in sorted(FIXTURES.glob("*.xml")):
+        for entry in feedparser.parse(path.read_bytes()).entries:
+            corpus.append(entry.get("summary", ""))
+            corpus.extend(content.value for content in entry.get("content", []))
+    return corpus
+
+
+def measure(func, corpus: list, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for text in corpus:
+            func(text)
+    return time.perf_counter() - started
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    if not corpus:
+        print(f"⚠️ Нет лент в {FIXTURES}")
+        return 1
+
+    size_mb = sum(len(text.encode("utf-8")) for text in corpus) * args.repeat / 1024 / 1024
+    print(f"🧪 {len(corpus)} текстов из {FIXTURES.name}/ x{args.repeat} ({size_mb:.1f} МБ)\n")
+
+    normalizer = TextNormalizer(REMOVE_KEYWORDS + list(READ_MORE_KEYWORDS))
+    rows = [
+        ("clean_html + remove_source_mentions + clean_text", measure(old_pipeline, corpus, args.repeat)),
+        ("TextNormalizer.normalize", measure(normalizer.normalize, corpus, args.repeat)),
+    ]
+
+    texts = len(corpus) * args.repeat
+    baseline = rows[0][1]
+    print(f"{'способ':<50} {'мкс/текст':>10} {'МБ/с':>7} {'ускорение':>10}")
+    for name, elapsed in rows:
+        print(
+            f"{name:<50} {elapsed / texts * 1e6:>10.1f} {size_mb / elapsed:>7.1f} "
+            f"{baseline / elapsed:>9.1f}x"
+        )
+
+    sample = max(corpus, key=len)
+    print(f"\nПример (самый длинный текст, {len(sample)} символов):")
+    print(f"  было:  {old_pipeline(sample)[:160]!r}")
+    print(f"  стало: {normalizer.normalize(sample)[:160]!r}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+# benchmarks/check_feed_timeout.py
+"""
+Проверка дедлайна загрузки ленты без выхода в сеть.
+
+Локальный aiohttp сервер отдает синтетическую ленту из benchmarks/fixtures
+с задержкой. Обе ленты должны загрузиться: единственный дедлайн -
+asyncio.wait_for в RSSParser._fetch, общий таймаут сессии его не обрезает.
+
+- default: ответ через --delay с (15 - больше общего таймаута HTTP
+  клиента, меньше FEED_TIMEOUT), дедлайн по умолчанию;
+- registry: ответ через --slow-delay с (22 - больше FEED_TIMEOUT),
+  в реестре у ленты свой timeout --feed-timeout (30, как у The Block).
+
+Запуск из корня проекта (завершается с кодом 1 при ошибке):
+    python -m benchmarks.check_feed_timeout
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from aiohttp import web
+
+from parser.feed_registry import FeedRegistry, FeedSource
+from parser.rss_parser import FEED_OK, FEED_TIMEOUT, RSSParser
+from services.http_client import DEFAULT_TIMEOUT, http_client
+
+FIXTURE = Path(__file__).parent / "fixtures" / "forklog.xml"
+
+
+async def run(args) -> int:
+    content = FIXTURE.read_bytes()
+    delays = {"default": args.delay, "registry": args.slow_delay}
+
+    async def handle(request: web.Request) -> web.Response:
+        await asyncio.sleep(delays[request.match_info["name"]])
+        return web.Response(body=content, content_type="application/rss+xml")
+
+    app = web.Application()
+    app.router.add_get("/{name}", handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    base = f"http://127.0.0.1:{port}"
+    registry = FeedRegistry([
+        FeedSource(name="default", url=f"{base}/default"),
+        FeedSource(name="registry", url=f"{base}/registry", timeout=args.feed_timeout),
+    ])
+    parser = RSSParser(registry=registry)
+    print(f"🧪 Таймаут клиента {DEFAULT_TIMEOUT} с, дедлайн ленты {FEED_TIMEOUT} с\n")
+
+    async def check(source: FeedSource) -> bool:
+        deadline = source.timeout or FEED_TIMEOUT
+        started = time.monotonic()
+        status, result, _ = await parser._fetch(source.url)
+        elapsed = time.monotonic() - started
+        ok = status == FEED_OK and bool(result["entries"])
+        print(f"{'✅' if ok else '❌'} {source.name}: ответ через {delays[source.name]:g} с, "
+              f"дедлайн {deadline:g} с -> {status} за {elapsed:.1f} с")
+        return ok
+
+    try:
+        results = await asyncio.gather(*(check(source) for source in registry.sources))
+    finally:
+        parser.close()
+        await http_client.close()
+        await runner.cleanup()
+    return 0 if all(results) else 1
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--delay", type=float, default=15, help="задержка ответа default, с")
+    parser.add_argument("--slow-delay", type=float, default=22, help="задержка ответа registry, с")
+    parser.add_argument("--feed-timeout", type=float, default=30, help="timeout ленты registry, с")
+    args = parser.parse_args()
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -31,8 +31,19 @@ class Settings(BaseSettings):
     source_channels: str = Field("", description="Telegram channels to monitor (comma-separated)")
 
     # === PARSING SETTINGS ===
-    parse_interval: int = Field(300, ge=60, le=3600, description="RSS parsing interval (seconds)")
+    parse_interval: int = Field(300, ge=60, le=3600, description="Base RSS feed polling interval (seconds), adapted per feed")
     filter_enabled: bool = Field(True, description="Enable content filtering")
+    dedup_window_hours: int = Field(48, ge=1, le=720, description="Near-duplicate title window (hours)")
+    retention_days: int = Field(30, ge=1, description="Move posted news older than N days to the archive")
+    parser_workers: int = Field(2, ge=1, le=32, description="Feed parsing pool size")
+    parser_use_processes: bool = Field(False, description="Parse feeds in worker processes instead of threads")
+    parser_streaming: bool = Field(True, description="Parse feeds incrementally and stop after enough entries")
+    feed_max_bytes: int = Field(2 * 1024 * 1024, ge=64 * 1024, description="Max bytes read from one feed")
+    image_preflight: bool = Field(True, description="Check news image URLs at ingest and re-host images Telegram cannot fetch")
+    ingest_workers: int = Field(0, ge=0, le=64, description="Worker processes that fetch and parse feeds (0 - inside the bot process)")
+    feeds_file: str = Field("feeds.json", description="Feed registry file (names, URLs, weights, per-feed limits)")
+    feed_failure_threshold: int = Field(5, ge=1, le=100, description="Consecutive failures before a feed is switched off")
+    feed_open_delay: int = Field(600, ge=60, le=86400, description="First pause of a switched-off feed (seconds), doubles after failed probes")
 
     # === LOGGING ===
     log_level: str = Field("INFO", description="Logging level")
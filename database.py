@@ -1,40 +1,836 @@
 # database.py
+import asyncio
 import aiosqlite
 import logging
+import os
+import re
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 from thefuzz import fuzz
+from models import NewsItem
+from utils.bloom_filter import BloomFilter
+from utils.near_duplicate import lsh_buckets
 
 DB_PATH = "crypto_news.db"
+ARCHIVE_DB_PATH = "crypto_news_archive.db"  # подключается как схема archive
+READER_POOL_SIZE = 4
+INSERT_CHUNK_SIZE = 500  # лимит параметров в одном IN (...)
+SEEN_FILTER_MIN_CAPACITY = 1_000_000  # ~1.1 МБ при 1% ложных срабатываний
+SEEN_FILTER_ERROR_RATE = 0.01
+DEDUP_WINDOW_HOURS = 48  # окно поиска почти-дубликатов заголовков
+DEDUP_THRESHOLD = 85     # порог fuzz.token_sort_ratio
+RETENTION_DAYS = 30      # опубликованные новости старше - в архив
+RETENTION_BATCH_SIZE = 5000
+WRITE_BATCH_SIZE = 200    # операций записи в одной транзакции
+WRITE_FLUSH_DELAY = 0.005  # сколько ждать соседей по транзакции (сек)
 logger = logging.getLogger(__name__)
 
+# Прагмы применяются к каждому соединению пула
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",        # читатели не блокируют писателя
+    "PRAGMA synchronous = NORMAL",      # в WAL режиме безопасно и в разы быстрее FULL
+    "PRAGMA busy_timeout = 5000",       # ждем блокировку вместо "database is locked"
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -16000",       # ~16 МБ страничного кэша на соединение
+    "PRAGMA mmap_size = 134217728",     # 128 МБ memory-mapped I/O
+)
+
+# Для подключенных (ATTACH) баз журнал и синхронизация задаются отдельно
+ATTACHED_PRAGMAS = (
+    "PRAGMA {schema}.journal_mode = WAL",
+    "PRAGMA {schema}.synchronous = NORMAL",
+)
+
+NEWS_COLUMNS = (
+    "id, url, title, summary, image_url, source, published_at, "
+    "added_at, posted_to_telegram, priority"
+)
+# Колонки в порядке полей models.NewsItem
+NEWS_ITEM_COLUMNS = "url, title, summary, source, published_at, image_url, priority, id"
+
+
+# Исходная схема (миграция v1). Существующие БД без user_version уже
+# содержат эти таблицы - поэтому везде IF NOT EXISTS.
+SCHEMA_V1 = (
+    # Добавили колонку priority (0 - обычно, 1 - молния)
+    """
+    CREATE TABLE IF NOT EXISTS news
+    (
+        id                 INTEGER PRIMARY KEY AUTOINCREMENT,
+        url                TEXT UNIQUE NOT NULL,
+        title              TEXT        NOT NULL,
+        summary            TEXT,
+        image_url          TEXT,
+        source             TEXT        NOT NULL,
+        published_at       TEXT        NOT NULL,
+        added_at           TEXT    DEFAULT CURRENT_TIMESTAMP,
+        posted_to_telegram BOOLEAN DEFAULT 0,
+        priority           INTEGER DEFAULT 0
+    )
+    """,
+    # Очередь публикации: частичный индекс содержит только неопубликованные
+    # строки, поэтому не растет вместе с архивом и сразу отдает их в порядке выдачи
+    """
+    CREATE INDEX IF NOT EXISTS idx_news_queue
+        ON news (priority DESC, id) WHERE posted_to_telegram = 0
+    """,
+    # Покрывающий индекс для статистики по источникам (GROUP BY source)
+    "CREATE INDEX IF NOT EXISTS idx_news_source ON news (source)",
+    # LSH индекс заголовков (utils/near_duplicate.py) за окно DEDUP_WINDOW_HOURS
+    """
+    CREATE TABLE IF NOT EXISTS news_title_lsh
+    (
+        bucket     INTEGER NOT NULL,
+        news_id    INTEGER NOT NULL,
+        created_at INTEGER NOT NULL,
+        PRIMARY KEY (bucket, created_at, news_id)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_title_lsh_created ON news_title_lsh (created_at)",
+    # Архив опубликованных новостей (отдельный файл ARCHIVE_DB_PATH)
+    """
+    CREATE TABLE IF NOT EXISTS archive.news_archive
+    (
+        id                 INTEGER PRIMARY KEY,
+        url                TEXT UNIQUE NOT NULL,
+        title              TEXT        NOT NULL,
+        summary            TEXT,
+        image_url          TEXT,
+        source             TEXT        NOT NULL,
+        published_at       TEXT        NOT NULL,
+        added_at           TEXT,
+        posted_to_telegram BOOLEAN DEFAULT 1,
+        priority           INTEGER DEFAULT 0,
+        archived_at        TEXT    DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+)
+
+EPOCH_NOW_SQL = "(CAST(strftime('%s', 'now') AS INTEGER))"
+
+# v2: published_at / added_at - целые Unix timestamps (UTC)
+NEWS_TABLE_V2 = f"""
+    CREATE TABLE {{name}}
+    (
+        id                 INTEGER PRIMARY KEY AUTOINCREMENT,
+        url                TEXT UNIQUE NOT NULL,
+        title              TEXT    NOT NULL,
+        summary            TEXT,
+        image_url          TEXT,
+        source             TEXT    NOT NULL,
+        published_at       INTEGER NOT NULL,
+        added_at           INTEGER NOT NULL DEFAULT {EPOCH_NOW_SQL},
+        posted_to_telegram INTEGER NOT NULL DEFAULT 0,
+        priority           INTEGER NOT NULL DEFAULT 0
+    )
+"""
+ARCHIVE_TABLE_V2 = f"""
+    CREATE TABLE {{name}}
+    (
+        id                 INTEGER PRIMARY KEY,
+        url                TEXT UNIQUE NOT NULL,
+        title              TEXT    NOT NULL,
+        summary            TEXT,
+        image_url          TEXT,
+        source             TEXT    NOT NULL,
+        published_at       INTEGER NOT NULL,
+        added_at           INTEGER NOT NULL,
+        posted_to_telegram INTEGER NOT NULL DEFAULT 1,
+        priority           INTEGER NOT NULL DEFAULT 0,
+        archived_at        INTEGER NOT NULL DEFAULT {EPOCH_NOW_SQL}
+    )
+"""
+
+
+def _parse_legacy_timestamp(value, fallback):
+    """
+    Разбирает строковую дату из старой схемы в Unix timestamp.
+
+    Понимает RFC822 (RSS), ISO 8601 и CURRENT_TIMESTAMP SQLite ('YYYY-MM-DD HH:MM:SS', UTC).
+    Все остальное ("Just now", "Now", пустая строка) -> fallback.
+    """
+    if isinstance(value, (int, float)):
+        return int(value)
+
+    if value:
+        text = str(value).strip()
+        parsed = None
+        try:
+            parsed = datetime.fromisoformat(text)
+        except ValueError:
+            try:
+                parsed = parsedate_to_datetime(text)
+            except (TypeError, ValueError, IndexError):
+                pass
+
+        if parsed is not None:
+            if parsed.tzinfo is None:
+                parsed = parsed.replace(tzinfo=timezone.utc)
+            return int(parsed.timestamp())
+
+    return int(fallback) if fallback is not None else int(time.time())
+
+
+async def _migrate_epoch_timestamps(db):
+    """v2: пересобирает news и архив с целочисленными метками времени"""
+    await db.create_function("legacy_ts", 2, _parse_legacy_timestamp, deterministic=True)
+
+    for schema, table, ddl in (
+            ("main", "news", NEWS_TABLE_V2),
+            ("archive", "news_archive", ARCHIVE_TABLE_V2),
+    ):
+        extra = ", archived_at" if table == "news_archive" else ""
+        extra_value = ", legacy_ts(archived_at, NULL)" if extra else ""
+
+        await db.execute(ddl.format(name=f"{schema}.{table}_v2"))
+        await db.execute(f"""
+            INSERT INTO {schema}.{table}_v2 ({NEWS_COLUMNS}{extra})
+            SELECT id, url, title, summary, image_url, source,
+                   legacy_ts(published_at, legacy_ts(added_at, NULL)),
+                   legacy_ts(added_at, NULL),
+                   posted_to_telegram, priority{extra_value}
+            FROM {schema}.{table}
+        """)
+        await db.execute(f"DROP TABLE {schema}.{table}")
+        await db.execute(f"ALTER TABLE {schema}.{table}_v2 RENAME TO {table}")
+
+    for statement in (
+            # Очередь в порядке публикации в источнике
+            """
+            CREATE INDEX idx_news_queue
+                ON news (priority DESC, published_at, id) WHERE posted_to_telegram = 0
+            """,
+            "CREATE INDEX idx_news_source ON news (source)",
+            # Диапазоны по времени: статистика за период и retention
+            "CREATE INDEX idx_news_added ON news (added_at)",
+            "CREATE INDEX archive.idx_archive_published ON news_archive (published_at)",
+    ):
+        await db.execute(statement)
+
+
+def _fts_statements(schema: str, table: str) -> tuple:
+    """FTS5 индекс (title, summary, source) поверх table + триггеры синхронизации"""
+    fts = f"{table}_fts"
+    columns = "title, summary, source"
+    new_values = "new.title, new.summary, new.source"
+    old_values = "old.title, old.summary, old.source"
+    # Триггеры живут в той же схеме, что и таблица, и ссылаются на нее без префикса
+    return (
+        f"""
+        CREATE VIRTUAL TABLE {schema}.{fts} USING fts5(
+            {columns},
+            content='{table}', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+        """,
+        f"""
+        CREATE TRIGGER {schema}.{fts}_ai AFTER INSERT ON {table} BEGIN
+            INSERT INTO {fts} (rowid, {columns}) VALUES (new.id, {new_values});
+        END
+        """,
+        f"""
+        CREATE TRIGGER {schema}.{fts}_ad AFTER DELETE ON {table} BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+        END
+        """,
+        f"""
+        CREATE TRIGGER {schema}.{fts}_au AFTER UPDATE OF {columns} ON {table} BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+            INSERT INTO {fts} (rowid, {columns}) VALUES (new.id, {new_values});
+        END
+        """,
+        # Индексируем уже существующие строки
+        f"INSERT INTO {schema}.{fts} ({fts}) VALUES ('rebuild')",
+    )
+
+
+# v4: счетчики, которые поддерживают триггеры - /stats, /sources и /health
+# читают несколько строк вместо COUNT(*) по всей таблице.
+# Счетчики накопительные: перенос в архив (DELETE из news) их не уменьшает.
+COUNTER_STATEMENTS = (
+    """
+    CREATE TABLE news_source_stats
+    (
+        source TEXT PRIMARY KEY,
+        total  INTEGER NOT NULL DEFAULT 0,
+        posted INTEGER NOT NULL DEFAULT 0
+    ) WITHOUT ROWID
+    """,
+    # Почасовые срезы: hour - начало часа (Unix timestamp, UTC)
+    """
+    CREATE TABLE news_hourly_stats
+    (
+        hour   INTEGER PRIMARY KEY,
+        added  INTEGER NOT NULL DEFAULT 0,
+        posted INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TRIGGER news_stats_ai AFTER INSERT ON news BEGIN
+        INSERT INTO news_source_stats (source, total, posted)
+        VALUES (new.source, 1, new.posted_to_telegram != 0)
+        ON CONFLICT (source) DO UPDATE SET total = total + 1, posted = posted + excluded.posted;
+        INSERT INTO news_hourly_stats (hour, added) VALUES (new.added_at / 3600 * 3600, 1)
+        ON CONFLICT (hour) DO UPDATE SET added = added + 1;
+    END
+    """,
+    f"""
+    CREATE TRIGGER news_stats_posted AFTER UPDATE OF posted_to_telegram ON news
+        WHEN old.posted_to_telegram = 0 AND new.posted_to_telegram != 0
+    BEGIN
+        UPDATE news_source_stats SET posted = posted + 1 WHERE source = new.source;
+        INSERT INTO news_hourly_stats (hour, posted) VALUES ({EPOCH_NOW_SQL} / 3600 * 3600, 1)
+        ON CONFLICT (hour) DO UPDATE SET posted = posted + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER news_stats_unposted AFTER UPDATE OF posted_to_telegram ON news
+        WHEN old.posted_to_telegram != 0 AND new.posted_to_telegram = 0
+    BEGIN
+        UPDATE news_source_stats SET posted = posted - 1 WHERE source = new.source;
+    END
+    """,
+    # Заполняем по уже накопленным данным (время публикации раньше не хранилось,
+    # поэтому posted в старых часах остается 0)
+    """
+    INSERT INTO news_source_stats (source, total, posted)
+    SELECT source, COUNT(*), SUM(posted_to_telegram != 0) FROM (
+        SELECT source, posted_to_telegram FROM news
+        UNION ALL
+        SELECT source, posted_to_telegram FROM archive.news_archive
+    ) GROUP BY source
+    """,
+    """
+    INSERT INTO news_hourly_stats (hour, added)
+    SELECT added_at / 3600 * 3600 AS hour, COUNT(*) FROM (
+        SELECT added_at FROM news
+        UNION ALL
+        SELECT added_at FROM archive.news_archive
+    ) GROUP BY hour
+    """,
+    # GROUP BY source больше не выполняется - индекс только замедлял вставку
+    "DROP INDEX IF EXISTS idx_news_source",
+)
+
+# v5: состояние RSS лент для условных запросов (ETag / Last-Modified / хэш тела)
+FEED_STATE_STATEMENTS = (
+    f"""
+    CREATE TABLE feed_state
+    (
+        feed_url      TEXT PRIMARY KEY,
+        etag          TEXT,
+        last_modified TEXT,
+        content_hash  TEXT,
+        body_bytes    INTEGER NOT NULL DEFAULT 0,
+        parse_ms      REAL    NOT NULL DEFAULT 0,
+        updated_at    INTEGER NOT NULL DEFAULT {EPOCH_NOW_SQL}
+    ) WITHOUT ROWID
+    """,
+)
+# v6: high-water mark ленты - самая свежая уже обработанная запись
+FEED_HWM_STATEMENTS = (
+    "ALTER TABLE feed_state ADD COLUMN hwm_id TEXT",
+    "ALTER TABLE feed_state ADD COLUMN hwm_published INTEGER",
+)
+FEED_STATE_COLUMNS = (
+    "feed_url", "etag", "last_modified", "content_hash", "body_bytes", "parse_ms",
+    "hwm_id", "hwm_published",
+)
+# v7: расписание опроса ленты (services/feed_scheduler.py)
+FEED_SCHEDULE_STATEMENTS = (
+    "ALTER TABLE feed_state ADD COLUMN entry_rate REAL",
+    "ALTER TABLE feed_state ADD COLUMN poll_interval REAL",
+    "ALTER TABLE feed_state ADD COLUMN error_count INTEGER NOT NULL DEFAULT 0",
+    "ALTER TABLE feed_state ADD COLUMN last_poll INTEGER",
+    "ALTER TABLE feed_state ADD COLUMN next_poll INTEGER",
+)
+FEED_SCHEDULE_COLUMNS = (
+    "feed_url", "entry_rate", "poll_interval", "error_count", "last_poll", "next_poll",
+)
+
+# Версионированные миграции (PRAGMA user_version):
+# (версия, описание, список SQL или корутина от соединения)
+MIGRATIONS = (
+    (1, "базовая схема", SCHEMA_V1),
+    (2, "целочисленные метки времени и индексы по времени", _migrate_epoch_timestamps),
+    (3, "полнотекстовый поиск FTS5",
+     _fts_statements("main", "news") + _fts_statements("archive", "news_archive")),
+    (4, "счетчики по источникам и почасовая статистика", COUNTER_STATEMENTS),
+    (5, "состояние RSS лент для условных запросов", FEED_STATE_STATEMENTS),
+    (6, "high-water mark RSS лент", FEED_HWM_STATEMENTS),
+    (7, "расписание опроса RSS лент", FEED_SCHEDULE_STATEMENTS),
+)
+
+# Горячие запросы (их план проверяет бенчмарк)
+HOT_NEWS_QUERY = (
+    f"SELECT {NEWS_ITEM_COLUMNS} FROM news WHERE posted_to_telegram = 0 AND priority = 1 "
+    "ORDER BY published_at ASC, id ASC LIMIT 1"
+)
+QUEUE_NEWS_QUERY = (
+    f"SELECT {NEWS_ITEM_COLUMNS} FROM news WHERE posted_to_telegram = 0 "
+    "ORDER BY priority DESC, published_at ASC, id ASC LIMIT 1"
+)
+COUNTS_QUERY = (
+    "SELECT COALESCE(SUM(total), 0), COALESCE(SUM(posted), 0) FROM news_source_stats"
+)
+HOURLY_STATS_QUERY = (
+    "SELECT hour, added, posted FROM news_hourly_stats WHERE hour >= ? ORDER BY hour"
+)
+RETENTION_CANDIDATES_QUERY = (
+    "SELECT id FROM news WHERE added_at < ? AND posted_to_telegram = 1 LIMIT ?"
+)
+# Поиск: в каждом индексе берем :per_source лучших по bm25 (заголовок важнее
+# текста) среди всех совпадений, а не только среди свежих. bm25() двух индексов
+# несравнимы (разное число документов и средняя длина), поэтому каждый источник
+# ранжируется отдельно, а выдача чередует их по месту. Для страницы с offset
+# нужно не больше offset + limit строк от каждого источника.
+SEARCH_QUERY = """
+    SELECT id, url, title, source, published_at, posted_to_telegram, score FROM (
+        SELECT n.id, n.url, n.title, n.source, n.published_at, n.posted_to_telegram, m.score,
+               ROW_NUMBER() OVER (ORDER BY m.score, n.published_at DESC) AS place
+        FROM (SELECT rowid, bm25(news_fts, 10.0, 2.0, 1.0) AS score FROM news_fts
+              WHERE news_fts MATCH :q ORDER BY score, rowid DESC LIMIT :per_source) m
+        JOIN news n ON n.id = m.rowid
+        UNION ALL
+        SELECT a.id, a.url, a.title, a.source, a.published_at, a.posted_to_telegram, m.score,
+               ROW_NUMBER() OVER (ORDER BY m.score, a.published_at DESC) AS place
+        FROM (SELECT rowid, bm25(news_archive_fts, 10.0, 2.0, 1.0) AS score
+              FROM archive.news_archive_fts
+              WHERE news_archive_fts MATCH :q ORDER BY score, rowid DESC LIMIT :per_source) m
+        JOIN archive.news_archive a ON a.id = m.rowid
+    )
+    ORDER BY place, published_at DESC
+    LIMIT :limit OFFSET :offset
+"""
+SOURCE_STATS_QUERY = (
+    "SELECT source, total FROM news_source_stats ORDER BY total DESC LIMIT ?"
+)
+# Темп источников за окно: только при запуске планировщика лент
+SOURCE_RATE_QUERY = (
+    "SELECT source, COUNT(*), MIN(added_at) FROM news WHERE added_at >= ? GROUP BY source"
+)
+
+
+class ConnectionPool:
+    """
+    Долгоживущие соединения SQLite: один писатель и несколько читателей.
+
+    SQLite допускает только одного писателя, поэтому запись сериализуется
+    через asyncio.Lock, а чтения (благодаря WAL) идут параллельно.
+    """
+
+    def __init__(self, db_path: str, readers: int = READER_POOL_SIZE,
+                 attachments: Optional[Dict[str, str]] = None):
+        self.db_path = db_path
+        self.readers_count = readers
+        self.attachments = attachments or {}
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._readers: Optional[asyncio.Queue] = None
+        self._all_readers: List[aiosqlite.Connection] = []
+        self._write_lock = asyncio.Lock()
+        self._open_lock = asyncio.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self._writer is not None
+
+    async def _connect(self, read_only: bool = False) -> aiosqlite.Connection:
+        conn = await aiosqlite.connect(self.db_path)
+        for pragma in CONNECTION_PRAGMAS:
+            await conn.execute(pragma)
+        for schema, path in self.attachments.items():
+            await conn.execute(f"ATTACH DATABASE ? AS {schema}", (path,))
+            for pragma in ATTACHED_PRAGMAS:
+                await conn.execute(pragma.format(schema=schema))
+        if read_only:
+            await conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    async def open(self):
+        """Открывает соединения (повторный вызов безопасен)"""
+        async with self._open_lock:
+            if self.is_open:
+                return
+
+            # Писатель открывается первым: он переводит файл в WAL режим
+            self._writer = await self._connect()
+            self._readers = asyncio.Queue()
+            for _ in range(self.readers_count):
+                conn = await self._connect(read_only=True)
+                self._all_readers.append(conn)
+                self._readers.put_nowait(conn)
+
+            logger.info(f"🗄️ Пул SQLite открыт (1 writer + {self.readers_count} readers, WAL)")
+
+    @asynccontextmanager
+    async def reader(self):
+        """Выдает соединение только для чтения"""
+        if not self.is_open:
+            await self.open()
+
+        conn = await self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put_nowait(conn)
+
+    @asynccontextmanager
+    async def writer(self):
+        """Выдает единственное пишущее соединение (commit/rollback автоматически)"""
+        if not self.is_open:
+            await self.open()
+
+        async with self._write_lock:
+            try:
+                yield self._writer
+                await self._writer.commit()
+            except BaseException:
+                # И при отмене задачи (CancelledError): иначе следующий writer()
+                # получит соединение посреди чужой транзакции
+                await self._writer.rollback()
+                raise
+
+    async def close(self):
+        """Закрывает все соединения, предварительно сбросив WAL в основной файл"""
+        async with self._open_lock:
+            if not self.is_open:
+                return
+
+            async with self._write_lock:
+                try:
+                    await self._writer.execute("PRAGMA optimize")
+                    await self._writer.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                except Exception as e:
+                    logger.warning(f"⚠️ Не удалось выполнить checkpoint: {e}")
+
+                for conn in self._all_readers:
+                    await conn.close()
+                await self._writer.close()
+
+            self._writer = None
+            self._readers = None
+            self._all_readers = []
+            logger.info("✅ Пул SQLite закрыт")
+
+
+WriteOp = Callable[[aiosqlite.Connection], Awaitable[Any]]
+
+
+class WriteBehindQueue:
+    """
+    Общая очередь записи для всех продюсеров (RSS, Userbot, webhook, публикатор).
+
+    Операции копятся до WRITE_BATCH_SIZE штук или WRITE_FLUSH_DELAY секунд
+    и выполняются одной транзакцией, каждая под своим SAVEPOINT - ошибка
+    одной операции (например, IntegrityError) не откатывает остальные.
+
+    submit() возвращает future, который завершается только после COMMIT:
+    это подтверждение того, что запись на диске. Срочные операции
+    (молнии) сбрасываются сразу, не дожидаясь таймера.
+    """
+
+    def __init__(self, pool: ConnectionPool, max_batch: int = WRITE_BATCH_SIZE,
+                 max_delay: float = WRITE_FLUSH_DELAY):
+        self.pool = pool
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        # (операция, on_commit, future)
+        self._pending: List[tuple] = []
+        self._has_work = asyncio.Event()
+        self._flush_now = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        # Статистика для /health
+        self.batches = 0
+        self.operations = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None
+
+    def start(self):
+        if self._task is None:
+            self._closing = False
+            self._task = asyncio.create_task(self._run())
+
+    def submit(self, op: WriteOp, on_commit: Optional[Callable[[Any], None]] = None,
+               urgent: bool = False) -> asyncio.Future:
+        """
+        Ставит операцию в очередь.
+
+        op: async (writer_connection) -> результат
+        on_commit: вызывается с результатом op после успешного COMMIT
+        urgent: сбросить очередь немедленно
+        """
+        if self._task is None or self._closing:
+            raise RuntimeError("Очередь записи не запущена")
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((op, on_commit, future))
+        self._has_work.set()
+        if urgent or len(self._pending) >= self.max_batch:
+            self._flush_now.set()
+        return future
+
+    async def close(self):
+        """Сбрасывает все накопленные операции и останавливает цикл"""
+        if self._task is None:
+            return
+
+        self._closing = True
+        self._has_work.set()
+        self._flush_now.set()
+        await self._task
+        self._task = None
+
+    async def _run(self):
+        while True:
+            await self._has_work.wait()
+            if not self._flush_now.is_set():
+                # Даем соседям пару миллисекунд попасть в ту же транзакцию
+                try:
+                    await asyncio.wait_for(self._flush_now.wait(), self.max_delay)
+                except asyncio.TimeoutError:
+                    pass
+
+            batch = self._pending[:self.max_batch]
+            self._pending = self._pending[self.max_batch:]
+            if not self._pending and not self._closing:
+                self._has_work.clear()
+                self._flush_now.clear()
+
+            if batch:
+                await self._flush(batch)
+            elif self._closing:
+                return
+
+    async def _flush(self, batch: List[tuple]):
+        results = []
+        try:
+            async with self.pool.writer() as db:
+                await db.execute("BEGIN IMMEDIATE")
+                for op, _, future in batch:
+                    if future.done():
+                        # Вызывающий отменил ожидание - операцию не выполняем
+                        results.append(None)
+                        continue
+
+                    await db.execute("SAVEPOINT write_op")
+                    try:
+                        results.append((True, await op(db)))
+                    except Exception as e:
+                        await db.execute("ROLLBACK TO write_op")
+                        results.append((False, e))
+                    await db.execute("RELEASE write_op")
+        except Exception as e:
+            logger.error(f"❌ Ошибка записи пакета из {len(batch)} операций: {e}")
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.operations += len(batch)
+
+        for (_, on_commit, future), result in zip(batch, results):
+            if result is None or future.done():
+                continue
+
+            ok, value = result
+            if not ok:
+                future.set_exception(value)
+                continue
+
+            if on_commit:
+                try:
+                    on_commit(value)
+                except Exception as e:
+                    logger.error(f"❌ Ошибка обработчика после commit: {e}")
+            future.set_result(value)
+
 
 class NewsDatabase:
-    def __init__(self):
-        self.db_path = DB_PATH
+    def __init__(self, db_path: str = DB_PATH, archive_path: str = ARCHIVE_DB_PATH,
+                 dedup_window_hours: int = DEDUP_WINDOW_HOURS):
+        self.db_path = db_path
+        self.pool = ConnectionPool(db_path, attachments={"archive": archive_path})
+        # Все записи новостей и статусов идут через общую очередь
+        self.writes = WriteBehindQueue(self.pool)
+        self.dedup_window_hours = dedup_window_hours
+        # Результат последнего прогона retention (для /health)
+        self.last_retention: Optional[dict] = None
+        # Подписчики на вставку новостей (например, публикатор): callback(priority)
+        self._insert_listeners: List[Callable[[int], None]] = []
+        # Фильтр уже сохраненных URL (None - еще не прогрет)
+        self.seen_urls: Optional[BloomFilter] = None
+        self._filter_rebuilding = False
+        self._filter_backlog: List[str] = []
 
 
     async def init(self):
-        async with aiosqlite.connect(self.db_path) as db:
-            # Добавили колонку priority (0 - обычно, 1 - молния)
-            await db.execute("""
-                             CREATE TABLE IF NOT EXISTS news
-                             (
-                                 id                 INTEGER PRIMARY KEY AUTOINCREMENT,
-                                 url                TEXT UNIQUE NOT NULL,
-                                 title              TEXT        NOT NULL,
-                                 summary            TEXT,
-                                 image_url          TEXT,
-                                 source             TEXT        NOT NULL,
-                                 published_at       TEXT        NOT NULL,
-                                 added_at           TEXT    DEFAULT CURRENT_TIMESTAMP,
-                                 posted_to_telegram BOOLEAN DEFAULT 0,
-                                 priority           INTEGER DEFAULT 0
-                             )
-                             """)
+        await self.pool.open()
+        await self._enable_incremental_vacuum()
+        await self._migrate()
+
+        await self._warm_seen_urls()
+        await self._backfill_title_index()
+        self.writes.start()
+
+    async def _enable_incremental_vacuum(self):
+        """Переводит основной файл в auto_vacuum=INCREMENTAL (однократно, через VACUUM)"""
+        async with self.pool.writer() as db:
+            async with db.execute("PRAGMA main.auto_vacuum") as cursor:
+                mode = (await cursor.fetchone())[0]
+            if mode == 2:
+                return
+
+            logger.info("🧹 Включаю incremental auto_vacuum (однократный VACUUM)...")
             await db.commit()
+            await db.execute("PRAGMA main.auto_vacuum = INCREMENTAL")
+            await db.execute("VACUUM main")
+
+    async def _migrate(self):
+        """Применяет недостающие миграции, каждую в своей транзакции"""
+        async with self.pool.reader() as db:
+            async with db.execute("PRAGMA user_version") as cursor:
+                current = (await cursor.fetchone())[0]
+
+        for version, description, migration in MIGRATIONS:
+            if version <= current:
+                continue
+
+            logger.info(f"🔧 Миграция БД v{version}: {description}...")
+            async with self.pool.writer() as db:
+                await db.execute("BEGIN IMMEDIATE")
+                if callable(migration):
+                    await migration(db)
+                else:
+                    for statement in migration:
+                        await db.execute(statement)
+                await db.execute(f"PRAGMA user_version = {version}")
+
+    async def _warm_seen_urls(self):
+        """Строит фильтр Блума по колонке url (при старте и при переполнении)"""
+        self._filter_rebuilding = True
+        try:
+            async with self.pool.reader() as db:
+                async with db.execute(
+                        "SELECT (SELECT COUNT(*) FROM news) + (SELECT COUNT(*) FROM archive.news_archive)"
+                ) as cursor:
+                    total = (await cursor.fetchone())[0]
+
+                seen = BloomFilter(
+                    capacity=max(SEEN_FILTER_MIN_CAPACITY, total * 2),
+                    error_rate=SEEN_FILTER_ERROR_RATE
+                )
+                # Архивные URL тоже считаются увиденными
+                async with db.execute(
+                        "SELECT url FROM news UNION ALL SELECT url FROM archive.news_archive"
+                ) as cursor:
+                    while rows := await cursor.fetchmany(10_000):
+                        seen.update(row[0] for row in rows)
+
+            # URL, добавленные пока шло построение
+            seen.update(self._filter_backlog)
+            self.seen_urls = seen
+            logger.info(
+                f"🧮 Фильтр URL прогрет: {len(seen)} записей, "
+                f"{seen.memory_bytes / 1024 / 1024:.1f} МБ"
+            )
+        finally:
+            self._filter_backlog = []
+            self._filter_rebuilding = False
+
+    def add_insert_listener(self, callback: Callable[[int], None]):
+        """Подписывает callback(priority) на каждую успешную вставку (после commit)"""
+        self._insert_listeners.append(callback)
+
+    def _notify_inserted(self, priority: int):
+        for callback in self._insert_listeners:
+            try:
+                callback(priority)
+            except Exception as e:
+                logger.error(f"❌ Ошибка подписчика на вставку: {e}")
+
+    def _remember_urls(self, urls: List[str]):
+        """Добавляет сохраненные URL в фильтр (вызывается после commit)"""
+        if self._filter_rebuilding:
+            self._filter_backlog.extend(urls)
+        if self.seen_urls is None:
+            return
+
+        self.seen_urls.update(urls)
+        if self.seen_urls.is_saturated and not self._filter_rebuilding:
+            logger.info("🧮 Фильтр URL переполнен, перестраиваю с большей емкостью...")
+            self._filter_rebuilding = True
+            asyncio.create_task(self._warm_seen_urls())
+
+    async def _backfill_title_index(self):
+        """Строит LSH индекс для новостей окна, если таблица индекса пуста (первый запуск)"""
+        async with self.pool.writer() as db:
+            async with db.execute("SELECT 1 FROM news_title_lsh LIMIT 1") as cursor:
+                if await cursor.fetchone():
+                    return
+
+            async with db.execute(
+                    "SELECT id, title, added_at FROM news WHERE added_at >= ?",
+                    (int(time.time()) - self.dedup_window_hours * 3600,)
+            ) as cursor:
+                rows = await cursor.fetchall()
+
+            for news_id, title, created_at in rows:
+                await self._index_title(db, news_id, title, created_at)
+
+        if rows:
+            logger.info(f"🧬 LSH индекс заголовков построен для {len(rows)} новостей")
+
+    @staticmethod
+    async def _index_title(db, news_id: int, title: str, created_at: int):
+        await db.executemany(
+            "INSERT OR IGNORE INTO news_title_lsh (bucket, news_id, created_at) VALUES (?, ?, ?)",
+            [(bucket, news_id, created_at) for bucket in lsh_buckets(title)]
+        )
+
+    async def _find_near_duplicate(self, db, title: str, threshold: int) -> Optional[tuple]:
+        """
+        Ищет похожий заголовок через LSH корзины за окно дедупликации.
+
+        Returns:
+            (existing_title, ratio) или None
+        """
+        buckets = lsh_buckets(title)
+        if not buckets:
+            return None
+
+        since = int(time.time()) - self.dedup_window_hours * 3600
+        placeholders = ",".join("?" * len(buckets))
+        async with db.execute(
+                f"""SELECT DISTINCT n.title
+                    FROM news_title_lsh l JOIN news n ON n.id = l.news_id
+                    WHERE l.bucket IN ({placeholders}) AND l.created_at >= ?""",
+                (*buckets, since)
+        ) as cursor:
+            candidates = await cursor.fetchall()
+
+        title_lower = title.lower()
+        for (existing_title,) in candidates:
+            # Сравниваем похожесть строк (0-100)
+            ratio = fuzz.token_sort_ratio(title_lower, existing_title.lower())
+            if ratio >= threshold:
+                return existing_title, ratio
+        return None
+
+    async def close(self):
+        """Сбрасывает очередь записи и закрывает пул (вызывается при остановке бота)"""
+        await self.writes.close()
+        await self.pool.close()
 
     async def execute(self, query: str, args=()):
         """Выполняет SQL запрос и возвращает результат (для статистики)"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.reader() as db:
             async with db.execute(query, args) as cursor:
                 # Если это SELECT count(*), возвращаем число
                 if "SELECT COUNT" in query.upper():
@@ -45,69 +841,374 @@ class NewsDatabase:
 
 
     async def news_exists(self, url: str) -> bool:
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute("SELECT id FROM news WHERE url = ?", (url,)) as cursor:
+        # Отрицательный ответ фильтра точный - в SQLite не ходим
+        if self.seen_urls is not None and url not in self.seen_urls:
+            return False
+
+        # "Возможно есть" - подтверждаем запросом
+        async with self.pool.reader() as db:
+            async with db.execute(
+                    "SELECT 1 FROM news WHERE url = ? "
+                    "UNION ALL SELECT 1 FROM archive.news_archive WHERE url = ? LIMIT 1",
+                    (url, url)
+            ) as cursor:
                 return await cursor.fetchone() is not None
 
-    async def is_duplicate_by_content(self, title: str, threshold: int = 85) -> bool:
-        """Проверяет, нет ли похожей новости в последних 50 записях"""
+    async def is_duplicate_by_content(self, title: str, threshold: int = DEDUP_THRESHOLD) -> bool:
+        """Проверяет, нет ли похожей новости за окно дедупликации (по LSH индексу)"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                # Берем последние 50 новостей
-                async with db.execute("SELECT title FROM news ORDER BY id DESC LIMIT 50") as cursor:
-                    rows = await cursor.fetchall()
-
-                for row in rows:
-                    existing_title = row[0]
-                    # Сравниваем похожесть строк (0-100)
-                    ratio = fuzz.token_sort_ratio(title.lower(), existing_title.lower())
-                    if ratio >= threshold:
-                        logger.info(f"♻️ Найден дубликат (сходство {ratio}%): '{title}' == '{existing_title}'")
-                        return True
+            async with self.pool.reader() as db:
+                duplicate = await self._find_near_duplicate(db, title, threshold)
+
+            if duplicate:
+                existing_title, ratio = duplicate
+                logger.info(f"♻️ Найден дубликат (сходство {ratio}%): '{title}' == '{existing_title}'")
+                return True
             return False
         except Exception as e:
             logger.error(f"Ошибка при fuzzy matching: {e}")
             return False
 
-    async def add_news(self, url: str, title: str, summary: str, source: str,
-                       published_at: str, image_url: str = None, priority: int = 0) -> bool:
+    async def add_news(self, item: NewsItem) -> bool:
+        """
+        Добавляет одну новость. Ждет подтверждения записи (COMMIT);
+        новости с priority > 0 сбрасываются на диск без задержки.
+        """
+        async def insert(db):
+            cursor = await db.execute(
+                """INSERT INTO news
+                       (url, title, summary, source, published_at, image_url, priority)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (item.url, item.title, item.summary, item.source, item.published_at,
+                 item.image_url, item.priority)
+            )
+            await self._index_title(db, cursor.lastrowid, item.title, int(time.time()))
+
+        def committed(_):
+            self._remember_urls([item.url])
+            self._notify_inserted(item.priority)
+
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute(
-                    """INSERT INTO news
-                           (url, title, summary, source, published_at, image_url, priority)
-                       VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                    (url, title, summary, source, published_at, image_url, priority)
-                )
-                await db.commit()
+            await self.writes.submit(insert, on_commit=committed, urgent=item.priority > 0)
             return True
         except aiosqlite.IntegrityError:
             return False
 
-    async def get_hot_news(self):
+    async def add_news_many(self, items: List[NewsItem], skip_near_duplicates: bool = True,
+                            threshold: int = DEDUP_THRESHOLD) -> List[str]:
+        """
+        Пакетная вставка новостей одной операцией очереди записи.
+
+        Уже существующие URL (и повторы внутри пакета) пропускаются,
+        при skip_near_duplicates - также почти-дубликаты по заголовку
+        (в том числе внутри самого пакета).
+
+        Returns:
+            Список URL, которые действительно были добавлены
+        """
+        # Повторы внутри пакета: побеждает первое вхождение
+        batch = {}
+        for item in items:
+            batch.setdefault(item.url, item)
+
+        if not batch:
+            return []
+
+        async def insert(db):
+            urls = list(batch)
+            existing = set()
+            for i in range(0, len(urls), INSERT_CHUNK_SIZE):
+                chunk = urls[i:i + INSERT_CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                async with db.execute(
+                        f"SELECT url FROM news WHERE url IN ({placeholders}) "
+                        f"UNION ALL SELECT url FROM archive.news_archive WHERE url IN ({placeholders})",
+                        chunk * 2
+                ) as cursor:
+                    existing.update(row[0] for row in await cursor.fetchall())
+
+            now = int(time.time())
+            new_urls = []
+            for url in urls:
+                if url in existing:
+                    continue
+
+                item = batch[url]
+                if skip_near_duplicates:
+                    duplicate = await self._find_near_duplicate(db, item.title, threshold)
+                    if duplicate:
+                        logger.info(f"♻️ Пропуск дубликата ({duplicate[1]}%): {item.title}")
+                        continue
+
+                # OR IGNORE страхует от гонки с внешними писателями (другой процесс)
+                cursor = await db.execute(
+                    """INSERT OR IGNORE INTO news
+                           (url, title, summary, source, published_at, image_url, priority)
+                       VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                    (url, item.title, item.summary, item.source,
+                     item.published_at, item.image_url, item.priority)
+                )
+                if cursor.rowcount:
+                    await self._index_title(db, cursor.lastrowid, item.title, now)
+                    new_urls.append(url)
+
+            # Корзины старше окна больше не нужны
+            await db.execute(
+                "DELETE FROM news_title_lsh WHERE created_at < ?",
+                (now - self.dedup_window_hours * 3600,)
+            )
+            return new_urls
+
+        def committed(new_urls):
+            self._remember_urls(new_urls)
+            if new_urls:
+                self._notify_inserted(max(batch[url].priority for url in new_urls))
+
+        return await self.writes.submit(
+            insert, on_commit=committed,
+            urgent=any(item.priority > 0 for item in batch.values())
+        )
+
+    async def get_hot_news(self) -> Optional[NewsItem]:
         """Ищет самую старую НЕОПУБЛИКОВАННУЮ новость с ВЫСОКИМ приоритетом"""
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            async with db.execute(
-                    "SELECT * FROM news WHERE posted_to_telegram = 0 AND priority = 1 ORDER BY id ASC LIMIT 1"
-            ) as cursor:
+        async with self.pool.reader() as db:
+            async with db.execute(HOT_NEWS_QUERY) as cursor:
                 row = await cursor.fetchone()
-                return dict(row) if row else None
+                return NewsItem(*row) if row else None
 
-    async def get_oldest_unposted_news(self):
+    async def get_oldest_unposted_news(self) -> Optional[NewsItem]:
         """Обычная очередь (низкий приоритет)"""
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
+        async with self.pool.reader() as db:
+            async with db.execute(QUEUE_NEWS_QUERY) as cursor:
+                row = await cursor.fetchone()
+                return NewsItem(*row) if row else None
+
+    async def get_counts(self) -> dict:
+        """
+        Общее число новостей (включая архив), опубликованные, очередь
+        и добавленные/опубликованные за сутки - по счетчикам, без сканов news.
+        """
+        async with self.pool.reader() as db:
+            async with db.execute(COUNTS_QUERY) as cursor:
+                total, posted = await cursor.fetchone()
+            # Сутки = 24 почасовых среза, включая текущий (неполный) час
             async with db.execute(
-                    "SELECT * FROM news WHERE posted_to_telegram = 0 ORDER BY priority DESC, id ASC LIMIT 1"
+                    "SELECT COALESCE(SUM(added), 0), COALESCE(SUM(posted), 0) "
+                    "FROM news_hourly_stats WHERE hour >= ?",
+                    (self._hours_ago(24),)
             ) as cursor:
-                row = await cursor.fetchone()
-                return dict(row) if row else None
+                added_24h, posted_24h = await cursor.fetchone()
+
+        return {
+            "total": total,
+            "posted": posted,
+            "queued": total - posted,
+            "last_24h": added_24h,
+            "posted_24h": posted_24h,
+        }
+
+    async def get_hourly_stats(self, hours: int = 24) -> List[tuple]:
+        """
+        Почасовая статистика за последние hours часов (включая текущий):
+        [(начало часа, добавлено, опубликовано), ...]; часы без событий пропущены
+        """
+        async with self.pool.reader() as db:
+            async with db.execute(HOURLY_STATS_QUERY, (self._hours_ago(hours),)) as cursor:
+                return await cursor.fetchall()
+
+    @staticmethod
+    def _hours_ago(hours: int) -> int:
+        """Начало часа, с которого идут последние hours почасовых срезов"""
+        return (int(time.time()) // 3600 - hours + 1) * 3600
+
+    async def get_source_stats(self, limit: int = 10) -> List[tuple]:
+        """Топ источников по количеству новостей (включая архив): [(source, count), ...]"""
+        async with self.pool.reader() as db:
+            async with db.execute(SOURCE_STATS_QUERY, (limit,)) as cursor:
+                return await cursor.fetchall()
+
+    @staticmethod
+    def build_fts_query(text: str) -> str:
+        """
+        Превращает пользовательский ввод в безопасный запрос FTS5:
+        каждое слово - префиксный терм в кавычках, термы через AND.
+        """
+        tokens = re.findall(r"\w+", text.lower())[:8]
+        return " ".join(f'"{token}"*' for token in tokens)
+
+    async def search_news(self, text: str, limit: int = 5, offset: int = 0) -> List[dict]:
+        """
+        Полнотекстовый поиск по новостям и архиву.
+
+        Новости и архив ранжируются по bm25 каждый в своем индексе; выдача
+        чередует их по месту (1-я новость, 1-я из архива, 2-я, ...), при
+        равном месте - свежие раньше. score - bm25 в индексе источника.
+
+        Возвращает limit + 1 строк (лишняя - признак следующей страницы):
+        [{"id", "url", "title", "source", "published_at", "posted_to_telegram", "score"}, ...]
+        """
+        fts_query = self.build_fts_query(text)
+        if not fts_query:
+            return []
+
+        async with self.pool.reader() as db:
+            async with db.execute(
+                    SEARCH_QUERY,
+                    {"q": fts_query, "limit": limit + 1, "offset": offset,
+                     "per_source": offset + limit + 1}
+            ) as cursor:
+                rows = await cursor.fetchall()
+                return [self._row_to_dict(cursor, row) for row in rows]
+
+    async def get_feed_states(self) -> Dict[str, dict]:
+        """Сохраненные валидаторы RSS лент: {feed_url: {etag, last_modified, ...}}"""
+        async with self.pool.reader() as db:
+            async with db.execute(f"SELECT {', '.join(FEED_STATE_COLUMNS)} FROM feed_state") as cursor:
+                rows = await cursor.fetchall()
+                return {row[0]: self._row_to_dict(cursor, row) for row in rows}
+
+    async def save_feed_states(self, states: List[dict]):
+        """Сохраняет валидаторы лент (после того как новости цикла записаны)"""
+        columns = ", ".join(FEED_STATE_COLUMNS)
+        updates = ", ".join(f"{col} = excluded.{col}" for col in FEED_STATE_COLUMNS[1:])
+
+        async def upsert(db):
+            await db.executemany(
+                f"""INSERT INTO feed_state ({columns}, updated_at)
+                    VALUES ({", ".join("?" * len(FEED_STATE_COLUMNS))}, {EPOCH_NOW_SQL})
+                    ON CONFLICT (feed_url) DO UPDATE SET {updates}, updated_at = excluded.updated_at""",
+                [tuple(state.get(col) for col in FEED_STATE_COLUMNS) for state in states]
+            )
+
+        await self.writes.submit(upsert)
+
+    async def get_source_rates(self, hours: int) -> Dict[str, float]:
+        """
+        Средний темп источников за последние hours часов: {source: новостей в час}.
+
+        Если бот работает меньше hours, делим на время с первой новости окна.
+        """
+        now = int(time.time())
+        async with self.pool.reader() as db:
+            async with db.execute(SOURCE_RATE_QUERY, (now - hours * 3600,)) as cursor:
+                rows = await cursor.fetchall()
+
+        if not rows:
+            return {}
+        span = max(3600, now - min(row[2] for row in rows))
+        return {source: count * 3600 / span for source, count, _ in rows}
+
+    async def get_feed_schedules(self) -> Dict[str, dict]:
+        """Сохраненное расписание опроса лент: {feed_url: {entry_rate, poll_interval, ...}}"""
+        async with self.pool.reader() as db:
+            async with db.execute(
+                    f"SELECT {', '.join(FEED_SCHEDULE_COLUMNS)} FROM feed_state "
+                    f"WHERE poll_interval IS NOT NULL"
+            ) as cursor:
+                rows = await cursor.fetchall()
+                return {row[0]: self._row_to_dict(cursor, row) for row in rows}
+
+    async def save_feed_schedules(self, schedules: List[dict]):
+        """Сохраняет расписание опроса (валидаторы лент не трогает)"""
+        columns = ", ".join(FEED_SCHEDULE_COLUMNS)
+        updates = ", ".join(f"{col} = excluded.{col}" for col in FEED_SCHEDULE_COLUMNS[1:])
+
+        async def upsert(db):
+            await db.executemany(
+                f"""INSERT INTO feed_state ({columns})
+                    VALUES ({", ".join("?" * len(FEED_SCHEDULE_COLUMNS))})
+                    ON CONFLICT (feed_url) DO UPDATE SET {updates}""",
+                [tuple(schedule.get(col) for col in FEED_SCHEDULE_COLUMNS) for schedule in schedules]
+            )
+
+        await self.writes.submit(upsert)
 
     async def mark_as_posted(self, url: str):
-        async with aiosqlite.connect(self.db_path) as db:
+        """Помечает новость опубликованной; ждет COMMIT, чтобы очередь не выдала ее повторно"""
+        async def update(db):
             await db.execute("UPDATE news SET posted_to_telegram = 1 WHERE url = ?", (url,))
-            await db.commit()
+
+        await self.writes.submit(update)
+
+    async def archive_old_news(self, retention_days: int = RETENTION_DAYS,
+                               batch_size: int = RETENTION_BATCH_SIZE) -> dict:
+        """
+        Переносит опубликованные новости старше retention_days в архив
+        и возвращает освободившиеся страницы файлу (incremental vacuum).
+
+        Перенос идет пачками по batch_size, чтобы не держать писателя надолго.
+
+        Returns:
+            {"archived": строк, "pages_freed": страниц, "bytes_reclaimed": байт,
+             "file_bytes_before": ..., "file_bytes_after": ...}
+        """
+        cutoff = int(time.time()) - retention_days * 86400
+        file_before = self._file_size()
+        archived = 0
+
+        while True:
+            async with self.pool.writer() as db:
+                async with db.execute(RETENTION_CANDIDATES_QUERY, (cutoff, batch_size)) as cursor:
+                    ids = [row[0] for row in await cursor.fetchall()]
+                if not ids:
+                    break
+
+                placeholders = ",".join("?" * len(ids))
+                await db.execute(
+                    f"INSERT OR IGNORE INTO archive.news_archive ({NEWS_COLUMNS}) "
+                    f"SELECT {NEWS_COLUMNS} FROM news WHERE id IN ({placeholders})",
+                    ids
+                )
+                await db.execute(f"DELETE FROM news_title_lsh WHERE news_id IN ({placeholders})", ids)
+                await db.execute(f"DELETE FROM news WHERE id IN ({placeholders})", ids)
+            archived += len(ids)
+
+            if len(ids) < batch_size:
+                break
+
+        async with self.pool.writer() as db:
+            async with db.execute("PRAGMA main.page_size") as cursor:
+                page_size = (await cursor.fetchone())[0]
+            async with db.execute("PRAGMA main.freelist_count") as cursor:
+                free_before = (await cursor.fetchone())[0]
+            # Прагма освобождает по странице за шаг sqlite3_step, а execute() делает
+            # только один шаг - поэтому executescript (он же фиксирует транзакцию)
+            await db.executescript("PRAGMA main.incremental_vacuum")
+            async with db.execute("PRAGMA main.freelist_count") as cursor:
+                free_after = (await cursor.fetchone())[0]
+
+        # В WAL режиме файл укорачивается только при checkpoint
+        async with self.pool.writer() as db:
+            await db.execute("PRAGMA main.wal_checkpoint(TRUNCATE)")
+
+        pages_freed = free_before - free_after
+        result = {
+            "archived": archived,
+            "pages_freed": pages_freed,
+            "bytes_reclaimed": pages_freed * page_size,
+            "file_bytes_before": file_before,
+            "file_bytes_after": self._file_size(),
+        }
+        self.last_retention = result
+        logger.info(
+            f"🗃️ Retention: в архив {archived} новостей, "
+            f"освобождено {result['bytes_reclaimed'] / 1024:.0f} КБ "
+            f"({pages_freed} страниц)"
+        )
+        return result
+
+    def _file_size(self) -> int:
+        try:
+            return os.path.getsize(self.db_path)
+        except OSError:
+            return 0
+
+    @staticmethod
+    def _row_to_dict(cursor, row) -> Optional[dict]:
+        """Преобразует строку в dict (row_factory у общих соединений не меняем)"""
+        if row is None:
+            return None
+        return {col[0]: value for col, value in zip(cursor.description, row)}
 
 
-db = NewsDatabase()
\ No newline at end of file
+db = NewsDatabase()
@@ -0,0 +1,26 @@
+# models.py
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(slots=True)
+class NewsItem:
+    """
+    Новость на всем пути: парсер -> БД -> публикатор.
+
+    slots=True: у экземпляра нет __dict__ (~2-3 раза меньше памяти, чем dict
+    с теми же полями), а опечатка в имени поля - сразу AttributeError.
+    Хранит только извлеченные поля - ссылок на FeedParserDict и исходный
+    HTML нет, поэтому разобранная лента освобождается сразу после очистки.
+
+    Порядок полей совпадает с NEWS_ITEM_COLUMNS в database.py:
+    строка БД превращается в NewsItem(*row).
+    """
+    url: str
+    title: str
+    summary: str
+    source: str
+    published_at: int  # Unix timestamp
+    image_url: Optional[str] = None
+    priority: int = 0  # 0 - обычная, 1 - молния
+    id: Optional[int] = None  # проставляет БД
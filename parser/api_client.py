@@ -1,8 +1,9 @@
 # parser/api_client.py
-import aiohttp
 import asyncio
 from typing import List, Dict
 
+from services.http_client import http_client
+
 
 class CryptoPanicAPI:
     """
@@ -29,11 +30,9 @@ class CryptoPanicAPI:
                 "currency": currency,
             }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self.BASE_URL, params=params, timeout=aiohttp.ClientTimeout(total=10)) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        return data.get("results", [])
+            data = await http_client.get_json(self.BASE_URL, params=params)
+            if data:
+                return data.get("results", [])
         except Exception as e:
             print(f"❌ CryptoPanic API error: {e}")
 
@@ -0,0 +1,116 @@
+# parser/feed_registry.py
+"""
+Реестр RSS лент из конфигурационного файла (feeds.json).
+
+Формат:
+
+    {
+      "defaults": {"language": "ru", "tier": 2, "max_entries": 20},
+      "feeds": [
+        {"name": "Forklog", "url": "https://forklog.com/feed/", "weight": 1.5},
+        {"name": "CoinDesk", "url": "https://...", "language": "en", "tier": 1, "timeout": 30}
+      ]
+    }
+
+Поля ленты (все, кроме name и url, можно задать в "defaults"):
+    language     - язык ленты ("ru", "en", ...)
+    tier         - 1 для премиум источников, 2 для остальных
+    weight       - вес в расписании опроса: 2.0 - опрашивать как ленту
+                   с вдвое большим темпом, 0.5 - вдвое реже
+    max_entries  - сколько записей ленты разбирать
+    timeout      - свой дедлайн загрузки (сек) вместо общего feed_timeout
+    enabled      - false, чтобы временно выключить ленту, не удаляя ее
+
+Ошибки в файле (нет url, повтор url или имени, отрицательный вес)
+останавливают запуск с понятным сообщением - как и ошибки в .env.
+"""
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from pydantic import BaseModel, Field, ValidationError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FEEDS_FILE = Path(__file__).resolve().parent.parent / "feeds.json"
+
+
+class FeedSource(BaseModel):
+    """Одна лента реестра"""
+    name: str = Field(..., min_length=1)
+    url: str = Field(..., pattern=r"^https?://")
+    language: str = "ru"
+    tier: int = Field(2, ge=1, le=3)
+    weight: float = Field(1.0, gt=0, le=10)
+    max_entries: int = Field(20, ge=1, le=200)
+    timeout: Optional[float] = Field(None, gt=0, le=120)
+    enabled: bool = True
+
+    model_config = {"extra": "forbid", "frozen": True}
+
+
+class FeedRegistry:
+    """
+    registry = FeedRegistry.load("feeds.json")
+    registry.select(languages=["ru"], tiers=[1]) -> {name: url}
+    registry.get(url)                            -> FeedSource или None
+    """
+
+    def __init__(self, sources: Iterable[FeedSource]):
+        self.sources: List[FeedSource] = []
+        self._by_url: Dict[str, FeedSource] = {}
+        names = set()
+
+        for source in sources:
+            if source.url in self._by_url:
+                raise ValueError(f"Лента {source.url} указана дважды")
+            if source.name in names:
+                raise ValueError(f"Имя ленты {source.name!r} указано дважды")
+            names.add(source.name)
+            self._by_url[source.url] = source
+            self.sources.append(source)
+
+    def __len__(self) -> int:
+        return len(self.sources)
+
+    def get(self, url: str) -> Optional[FeedSource]:
+        return self._by_url.get(url)
+
+    @classmethod
+    def load(cls, path=DEFAULT_FEEDS_FILE) -> "FeedRegistry":
+        path = Path(path)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            defaults = data.get("defaults", {})
+            registry = cls(FeedSource(**{**defaults, **feed}) for feed in data["feeds"])
+        except FileNotFoundError:
+            logger.error(f"❌ Нет файла лент {path}")
+            raise SystemExit(1)
+        except (ValueError, KeyError, TypeError, ValidationError) as e:
+            logger.error(f"❌ ОШИБКА В {path.name}: {e}")
+            raise SystemExit(1)
+
+        enabled = sum(1 for source in registry.sources if source.enabled)
+        logger.info(f"📚 Реестр лент {path.name}: {enabled} из {len(registry)} включено")
+        return registry
+
+    def select(self, languages: Optional[Iterable[str]] = None,
+               tiers: Optional[Iterable[int]] = None) -> Dict[str, str]:
+        """
+        Включенные ленты {name: url}: нужного языка ИЛИ нужного уровня.
+
+        select(languages=["ru"], tiers=[1]) - русские и премиум англоязычные,
+        как раньше RSS_FEEDS + TIER_1_FEEDS. Без фильтров - все включенные.
+        """
+        enabled = [source for source in self.sources if source.enabled]
+        if languages is None and tiers is None:
+            return {source.name: source.url for source in enabled}
+
+        languages = set(languages or ())
+        tiers = set(tiers or ())
+        return {
+            source.name: source.url
+            for source in enabled
+            if source.language in languages or source.tier in tiers
+        }
@@ -2,51 +2,69 @@
 import feedparser
 import aiohttp
 import asyncio
+import calendar
+import multiprocessing
 import re
-from typing import List, Dict
-from html import unescape
-
-# ✅ ОСТАВЛЯЕМ ТОЛЬКО РАБОЧИЕ
-RSS_FEEDS = {
-    "Forklog": "https://forklog.com/feed/",
-    "Coinspot": "https://coinspot.io/feed/",
-}
-
-TIER_1_FEEDS = {
-    "CoinDesk": "https://www.coindesk.com/arc/outboundfeeds/rss/",
-    "Cointelegraph": "https://cointelegraph.com/rss",
-    "Decrypt": "https://decrypt.co/feed",
-    "The Block": "https://www.theblock.co/rss.xml",
-}
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
+from hashlib import blake2b
+
+from parser.feed_registry import FeedRegistry
+from parser.stream_parser import MAX_FEED_BYTES, StreamingFeedParser
+from models import NewsItem
+from services.http_client import http_client
+from services.source_health import SourceHealth
+from utils.keyword_matcher import KeywordMatcher
+from utils.text_normalizer import READ_MORE_KEYWORDS, TextNormalizer
+
+MAX_CONCURRENT_FEEDS = 10  # одновременных загрузок лент
+FEED_TIMEOUT = 20          # дедлайн одной ленты (сек)
+MAX_ENTRIES_PER_FEED = 20
+PARSER_WORKERS = 2         # потоков/процессов для feedparser
+READ_CHUNK_SIZE = 16 * 1024
+
+# Результат загрузки ленты
+FEED_OK = "ok"
+FEED_NOT_MODIFIED = "not_modified"  # 304 по ETag / Last-Modified
+FEED_UNCHANGED = "unchanged"        # 200, но тело совпало по хэшу
+FEED_ERROR = "error"
+FEED_SKIPPED = "skipped"            # circuit breaker разомкнут - запрос не отправлялся
+
+# Ответы, которыми источник просит подождать (Retry-After)
+THROTTLE_STATUSES = (429, 503)
+
+# Ленты - в feeds.json (parser/feed_registry.py)
 
 # ✅ WHITELIST расширен
+# Слово целиком ("sec" не совпадет с "second"), "*" на конце - основа слова
 WHITELIST_KEYWORDS = [
     # Криптовалюты
-    "bitcoin", "ethereum", "btc", "eth", "crypto", "blockchain",
+    "bitcoin*", "ethereum", "btc", "eth", "crypto*", "blockchain*",
     "solana", "cardano", "polygon", "bnb", "usdt", "usdc",
     "ripple", "xrp", "doge", "dogecoin", "shib", "ada", "dot",
 
     # Регуляция
-    "sec", "regulation", "регуляция", "законодательство",
-    "trump", "трамп", "biden", "байден", "congress", "конгресс",
+    "sec", "regulat*", "регуляци*", "законодательств*",
+    "trump*", "трамп*", "biden*", "байден*", "congress*", "конгресс*",
 
     # Компании
     "coinbase", "binance", "bybit", "okx", "kraken",
     "microstrategy", "tesla", "blackrock", "grayscale",
 
     # События
-    "etf", "listing", "листинг", "hack", "взлом",
-    "trading", "торговля", "market", "рынок", "price", "цена",
+    "etf*", "listing*", "листинг*", "hack*", "взлом*",
+    "trading", "торгов*", "market*", "рын*", "price*", "цен*",
 
     # Русский
-    "крипто", "биткойн", "эфириум", "блокчейн",
-    "биржа", "обмен", "майнинг",
+    "крипто*", "биткойн*", "биткоин*", "эфириум*", "блокчейн*",
+    "бирж*", "обмен*", "майнинг*",
 ]
 
 BLACKLIST_KEYWORDS = [
-    "nft collection", "airdrop", "presale", "promo", "giveaway",
-    "casino", "gambling", "lottery", "scam", "ponzi",
-    "гивэвей", "казино", "лотерея", "схема", "развод",
+    "nft collection*", "airdrop*", "presale*", "promo*", "giveaway*",
+    "casino*", "gambling", "lottery", "scam*", "ponzi",
+    "гивэве*", "казино", "лотере*", "схема", "развод*",
 ]
 
 REMOVE_KEYWORDS = [
@@ -56,69 +74,90 @@ REMOVE_KEYWORDS = [
     "forklog", "bits.media", "rbc", "coinspot",
 ]
 
-
-def clean_html(text: str) -> str:
-    """Удалите HTML теги и расшифруйте HTML сущности"""
-    text = re.sub(r'<[^>]+>', '', text)
-    text = unescape(text)
-    text = re.sub(r'\s+', ' ', text).strip()
-    return text
-
-
-def remove_source_mentions(text: str) -> str:
-    """Удалите упоминания источников из текста"""
-    text_lower = text.lower()
-    min_position = len(text)
-
-    for keyword in REMOVE_KEYWORDS:
-        pos = text_lower.find(keyword.lower())
-        if pos != -1 and pos < min_position:
-            min_position = pos
-
-    if min_position < len(text):
-        text = text[:min_position].strip()
-
-    text = text.rstrip('.,;: ')
-    return text
+# Списки компилируются один раз (utils/keyword_matcher.py)
+_WHITELIST_MATCHER = KeywordMatcher(WHITELIST_KEYWORDS)
+_BLACKLIST_MATCHER = KeywordMatcher(BLACKLIST_KEYWORDS)
+# Очистка описаний: HTML, сущности, пробелы и все, начиная с упоминания источника
+_SUMMARY_NORMALIZER = TextNormalizer(REMOVE_KEYWORDS + list(READ_MORE_KEYWORDS))
 
 
 class RSSParser:
-    def __init__(self, use_russian: bool = True, include_tier1: bool = True):
+    def __init__(self, use_russian: bool = True, include_tier1: bool = True,
+                 max_concurrency: int = MAX_CONCURRENT_FEEDS, feed_timeout: float = FEED_TIMEOUT,
+                 state_store=None, workers: int = PARSER_WORKERS, use_processes: bool = False,
+                 streaming: bool = True, max_feed_bytes: int = MAX_FEED_BYTES,
+                 registry: Optional[FeedRegistry] = None, health: Optional[SourceHealth] = None):
         """
         use_russian: русскоязычные источники
         include_tier1: добавить премиум англоязычные
+        max_concurrency: сколько лент качать одновременно
+        feed_timeout: дедлайн на загрузку одной ленты (сек)
+        state_store: где хранить ETag/Last-Modified лент (NewsDatabase);
+                     без него валидаторы живут только в памяти
+        workers: размер пула, в котором разбираются ленты
+        use_processes: пул процессов вместо потоков (разбор не делит GIL с ботом)
+        streaming: разбирать XML по мере загрузки и прекращать чтение,
+                   как только набрано MAX_ENTRIES_PER_FEED записей
+        max_feed_bytes: сколько байт ленты читать максимум
+        registry: реестр лент (по умолчанию feeds.json рядом с проектом)
+        health: статистика и circuit breaker источников
         """
-        self.feeds = {}
-
-        if use_russian:
-            self.feeds.update(RSS_FEEDS)
-
-        if include_tier1:
-            self.feeds.update(TIER_1_FEEDS)
+        self.max_concurrency = max_concurrency
+        self.feed_timeout = feed_timeout
+        self.state_store = state_store
+        self.workers = workers
+        self.use_processes = use_processes
+        self.streaming = streaming
+        self.max_feed_bytes = max_feed_bytes
+        self._executor: Optional[Executor] = None
+        # Подтвержденные состояния лент: feed_url -> {etag, last_modified, content_hash, ...}
+        self._feed_states: Dict[str, dict] = {}
+        self._states_loaded = False
+        # Состояния текущего цикла, ждущие commit_feed_states()
+        self._pending_states: List[dict] = []
+        # Статистика последнего цикла (304, сэкономленные байты и время парсинга)
+        self.last_cycle_stats: Optional[dict] = None
+        # Итог последнего цикла по лентам: feed_url -> {"status", "fresh"}
+        self.last_feed_results: Dict[str, dict] = {}
+        self.registry = registry if registry is not None else FeedRegistry.load()
+        self.health = health if health is not None else SourceHealth()
+        self.feeds = self.registry.select(
+            languages=["ru"] if use_russian else [],
+            tiers=[1] if include_tier1 else []
+        )
 
     @staticmethod
     def _is_relevant(title: str, description: str = "") -> bool:
         """Проверьте релевантность новости"""
-        text = (title + " " + description).lower()
+        text = title + " " + description
 
         # Blacklist
-        for keyword in BLACKLIST_KEYWORDS:
-            if keyword in text:
-                return False
+        if _BLACKLIST_MATCHER.matches(text):
+            return False
 
         # Whitelist
-        for keyword in WHITELIST_KEYWORDS:
-            if keyword in text:
-                return True
+        return _WHITELIST_MATCHER.matches(text)
 
-        return False
+    @staticmethod
+    def _entry_published(entry: dict) -> Optional[int]:
+        """Дата публикации entry как Unix timestamp (UTC), разобранная feedparser, или None"""
+        for key in ("published_parsed", "updated_parsed"):
+            parsed = entry.get(key)
+            if parsed:
+                # Даты "из будущего" (кривой часовой пояс ленты) не должны обгонять очередь
+                return min(calendar.timegm(parsed), int(time.time()))
+        return None
+
+    @classmethod
+    def _entry_timestamp(cls, entry: dict) -> int:
+        """Дата публикации entry; без даты - текущее время"""
+        published = cls._entry_published(entry)
+        return published if published is not None else int(time.time())
 
     @staticmethod
-    def _detect_language(text: str) -> str:
-        """Определите язык текста"""
-        if re.search(r'[а-яА-ЯёЁ]', text):
-            return "ru"
-        return "en"
+    def _entry_key(entry: dict) -> str:
+        """Стабильный идентификатор записи: guid/id, иначе ссылка"""
+        return entry.get("id") or entry.get("link", "")
 
     @staticmethod
     def _extract_image_from_entry(entry: dict) -> str:
@@ -173,75 +212,385 @@ class RSSParser:
 
         return None
 
-    async def fetch_feed(self, feed_url: str) -> List[dict]:
-        """Парсьте RSS ленту с улучшенной обработкой ошибок"""
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.use_processes:
+                # spawn: fork процесса с потоками aiosqlite/aiohttp небезопасен
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="feed-parser"
+                )
+        return self._executor
+
+    def close(self):
+        """Останавливает пул разбора лент (при остановке бота)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def fetch_feed(self, feed_url: str) -> List[NewsItem]:
+        """Парсьте RSS ленту (пустой список - ошибка или лента не изменилась)"""
+        status, result, _ = await self._fetch(feed_url)
+        return result["news"] if status == FEED_OK else []
+
+    async def _fetch(self, feed_url: str) -> Tuple[str, Optional[dict], Optional[dict]]:
+        """
+        Условная загрузка ленты с улучшенной обработкой ошибок.
+
+        Разомкнутую ленту (circuit breaker) не запрашивает; итог загрузки
+        записывает в статистику источника.
+
+        Returns:
+            (статус FEED_*, результат parse_feed() или None, новое состояние ленты или None)
+        """
+        if not self.health.allow(feed_url):
+            return FEED_SKIPPED, None, None
+
+        source = self.registry.get(feed_url)
+        timeout = source.timeout if source and source.timeout else self.feed_timeout
+        max_entries = source.max_entries if source else MAX_ENTRIES_PER_FEED
+        state = self._feed_states.get(feed_url, {})
+        started = time.monotonic()
         try:
-            # ✅ ДОБАВЛЕН User-Agent (некоторые сайты блокируют без него)
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+            # Дедлайн на всю ленту - один, без повторов общего HTTP клиента
+            status, body, headers = await asyncio.wait_for(
+                self._download(feed_url, state, max_entries, timeout), timeout
+            )
+            if status == 304:
+                self.health.record_success(feed_url, time.monotonic() - started)
+                return FEED_NOT_MODIFIED, None, None
+            if status != 200:
+                print(f"⚠️ HTTP {status}: {feed_url}")
+                retry_after = (
+                    self._retry_after(headers.get("Retry-After"))
+                    if status in THROTTLE_STATUSES else None
+                )
+                self.health.record_failure(feed_url, f"HTTP {status}", retry_after=retry_after)
+                return FEED_ERROR, None, None
+            latency = time.monotonic() - started
+
+            reader = body if isinstance(body, StreamingFeedParser) else None
+            content = reader.content if reader else body
+            new_state = {
+                "feed_url": feed_url,
+                "etag": headers.get("ETag"),
+                "last_modified": headers.get("Last-Modified"),
+                "content_hash": blake2b(content, digest_size=16).hexdigest(),
+                "body_bytes": len(content),
+                "parse_ms": state.get("parse_ms", 0.0),
+                "hwm_id": state.get("hwm_id"),
+                "hwm_published": state.get("hwm_published"),
             }
-
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                        feed_url,
-                        headers=headers,
-                        timeout=aiohttp.ClientTimeout(total=20)
-                ) as resp:
-                    if resp.status == 200:
-                        content = await resp.text()
-                        feed = feedparser.parse(content)
-                        return feed.entries[:20]
-                    else:
-                        print(f"⚠️ HTTP {resp.status}: {feed_url}")
+            # Сервер не умеет в валидаторы, но тело то же - парсить незачем
+            if new_state["content_hash"] == state.get("content_hash"):
+                self.health.record_success(feed_url, latency)
+                return FEED_UNCHANGED, None, new_state
+
+            # Разбор и очистка - CPU работа, выносим с event loop
+            mark = {"hwm_id": state.get("hwm_id"), "hwm_published": state.get("hwm_published")}
+            loop = asyncio.get_running_loop()
+            if reader is not None and not reader.needs_fallback:
+                # Записи уже разобраны потоково - в пул уходит только отбор и очистка
+                result = await loop.run_in_executor(
+                    self._get_executor(), process_feed, reader.entries, mark
+                )
+                result["parse_ms"] += reader.parse_ms
+            else:
+                result = await loop.run_in_executor(
+                    self._get_executor(), parse_feed, content, mark, max_entries
+                )
+            result["stopped_early"] = reader is not None and reader.stopped_early
+            new_state.update(result["mark"])
+            new_state["parse_ms"] = result["parse_ms"]
+            self.health.record_success(feed_url, latency)
+            return FEED_OK, result, new_state
 
         except asyncio.TimeoutError:
-            print(f"⏱️ Timeout (20s): {feed_url}")
-        except aiohttp.ClientConnectorError:
+            elapsed = time.monotonic() - started
+            print(f"⏱️ Timeout ({elapsed:.1f}s of {timeout:g}s): {feed_url}")
+            self.health.record_failure(feed_url, f"таймаут {elapsed:.0f}с (дедлайн {timeout:g}с)")
+        except aiohttp.ClientConnectorError as e:
             print(f"🔌 Connection error: {feed_url}")
+            self.health.record_failure(feed_url, f"нет соединения: {e}")
         except Exception as e:
             print(f"❌ Error: {feed_url}: {e}")
+            self.health.record_failure(feed_url, f"{type(e).__name__}: {e}")
 
-        return []
+        return FEED_ERROR, None, None
 
-    async def get_all_news(self) -> List[Dict]:
-        """Получите новости из всех источников"""
-        all_news = []
+    @staticmethod
+    def _retry_after(value: Optional[str]) -> Optional[float]:
+        """Retry-After в секундах (форму с HTTP датой источники почти не шлют) или None"""
+        try:
+            return max(0.0, float(value))
+        except (TypeError, ValueError):
+            return None
 
-        for source_name, feed_url in self.feeds.items():
-            print(f"🔄 Fetching: {source_name}...")
-            entries = await self.fetch_feed(feed_url)
+    async def _download(self, feed_url: str, state: dict,
+                        max_entries: int = MAX_ENTRIES_PER_FEED,
+                        timeout: float = FEED_TIMEOUT) -> tuple:
+        """
+        GET с If-None-Match / If-Modified-Since.
 
-            if not entries:
-                print(f"⚠️ No entries from {source_name}")
+        timeout - дедлайн ленты: заменяет общий таймаут HTTP клиента (10 с),
+        который иначе обрывал бы чтение медленной ленты раньше срока.
+        Повторов нет - следующая попытка будет в следующем цикле.
+
+        Тело читается кусками и не больше max_feed_bytes; в потоковом режиме
+        чтение прекращается, как только набрано max_entries записей.
+
+        Returns:
+            (status, StreamingFeedParser / bytes / None, headers)
+        """
+        headers = {}
+        if state.get("etag"):
+            headers["If-None-Match"] = state["etag"]
+        if state.get("last_modified"):
+            headers["If-Modified-Since"] = state["last_modified"]
+
+        async with http_client.get(feed_url, headers=headers, timeout=timeout, retries=0) as resp:
+            if resp.status != 200:
+                return resp.status, None, resp.headers
+
+            reader = (
+                StreamingFeedParser(max_entries, self.max_feed_bytes)
+                if self.streaming else None
+            )
+            body = bytearray()
+            eof = True
+            async for chunk in resp.content.iter_chunked(READ_CHUNK_SIZE):
+                if reader is not None:
+                    reader.feed(chunk)
+                    stop = reader.done
+                else:
+                    body.extend(chunk)
+                    stop = len(body) >= self.max_feed_bytes
+                if stop:
+                    # Остаток не читаем: соединение закроется при выходе из контекста
+                    eof = False
+                    break
+
+            if reader is not None:
+                reader.close(eof=eof)
+                return resp.status, reader, resp.headers
+            return resp.status, bytes(body), resp.headers
+
+    def reload_feed_states(self):
+        """Перечитать состояния лент из state_store в начале следующего цикла (новые ленты воркера)"""
+        self._states_loaded = False
+
+    async def commit_feed_states(self):
+        """
+        Сохраняет валидаторы лент текущего цикла.
+
+        Вызывается после того, как новости цикла записаны в БД: если запись
+        упала, следующий цикл скачает и разберет ленты заново.
+        """
+        if not self._pending_states:
+            return
+
+        if self.state_store is not None:
+            await self.state_store.save_feed_states(self._pending_states)
+        for state in self._pending_states:
+            self._feed_states[state["feed_url"]] = state
+        self._pending_states = []
+
+    @classmethod
+    def _select_new_entries(cls, entries: List[dict], state: dict) -> Tuple[List[tuple], dict]:
+        """
+        Отбирает записи новее high-water mark ленты (самой свежей уже виденной записи).
+
+        Записи с датой перебираются от свежих к старым (порядок в документе
+        не важен) до первой, которая строго старше hwm_published. Записи с той
+        же датой, что у отметки (pubDate с точностью до минуты), проходят все,
+        кроме самой hwm_id: какие из них уже видели, решит дедупликация БД.
+        Записи без даты сравнить не с чем - они проходят всегда (дубли отсеет БД).
+
+        Returns:
+            ([(published, entry), ...], новая отметка {"hwm_id", "hwm_published"})
+        """
+        hwm_id = state.get("hwm_id")
+        hwm_published = state.get("hwm_published") or 0
+
+        dated, undated = [], []
+        for entry in entries:
+            published = cls._entry_published(entry)
+            if published is None:
+                undated.append((int(time.time()), entry))
+            else:
+                dated.append((published, entry))
+        dated.sort(key=lambda item: item[0], reverse=True)
+
+        fresh = []
+        for published, entry in dated:
+            if published < hwm_published:
+                break
+            if published == hwm_published and cls._entry_key(entry) == hwm_id:
                 continue
+            fresh.append((published, entry))
 
-            print(f"✅ Found {len(entries)} entries from {source_name}")
+        mark = {"hwm_id": hwm_id, "hwm_published": state.get("hwm_published")}
+        if dated and dated[0][0] >= hwm_published:
+            mark = {"hwm_id": cls._entry_key(dated[0][1]), "hwm_published": dated[0][0]}
 
-            for entry in entries:
-                title = entry.get("title", "No title")
-                link = entry.get("link", "")
-                published = entry.get("published", "")
-                summary = entry.get("summary", "")
+        return fresh + undated, mark
 
-                summary = clean_html(summary)
-                summary = remove_source_mentions(summary)
+    @classmethod
+    def _process_entries(cls, entries: List[tuple]) -> List[NewsItem]:
+        """
+        Фильтрует и нормализует записи одной ленты: [(published, entry), ...].
 
-                # Проверка релевантности
-                if not self._is_relevant(title, summary):
-                    continue
+        Из FeedParserDict берутся только нужные поля - сами записи (с исходным
+        HTML) дальше не живут. Источник проставляет вызывающий.
+        """
+        news = []
+        for published, entry in entries:
+            title = entry.get("title", "No title")
+            summary = _SUMMARY_NORMALIZER.normalize(entry.get("summary", ""))
+
+            # Проверка релевантности
+            if not cls._is_relevant(title, summary):
+                continue
 
-                lang = self._detect_language(title + " " + summary)
-                image_url = self._extract_image_from_entry(entry)
+            news.append(NewsItem(
+                url=entry.get("link", ""),
+                title=title,
+                summary=summary,
+                source="",
+                published_at=published,
+                image_url=cls._extract_image_from_entry(entry),
+            ))
 
-                all_news.append({
-                    "title": title,
-                    "link": link,
-                    "source": source_name,
-                    "published": published,
-                    "summary": summary,
-                    "language": lang,
-                    "image_url": image_url,
-                    "raw_entry": entry,
-                })
+        return news
 
-        return all_news
\ No newline at end of file
+    async def get_all_news(self, feeds: Optional[Dict[str, str]] = None) -> List[NewsItem]:
+        """
+        Получите новости из всех источников (или только из feeds: {source: url}).
+
+        Ленты качаются параллельно (не больше max_concurrency одновременно,
+        у каждой свой дедлайн - timeout из реестра или feed_timeout), записи
+        ленты обрабатываются сразу, как только она загрузилась. Цикл длится
+        примерно столько, сколько самая медленная из живых лент, а не сумму
+        всех. Отключенные circuit breaker'ом ленты пропускаются без запроса.
+        """
+        feeds = self.feeds if feeds is None else feeds
+        all_news = []
+        started = time.monotonic()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        if self.state_store is not None and not self._states_loaded:
+            self._feed_states = await self.state_store.get_feed_states()
+            self._states_loaded = True
+        self._pending_states = []
+        self.last_feed_results = {}
+
+        stats = {
+            "feeds": len(feeds), "not_modified": 0, "unchanged": 0, "errors": 0, "skipped": 0,
+            "bytes_downloaded": 0, "bytes_saved": 0, "parse_ms": 0.0, "parse_ms_saved": 0.0,
+            "entries": 0, "entries_skipped": 0, "stopped_early": 0,
+        }
+
+        async def fetch_source(source_name: str, feed_url: str):
+            async with semaphore:
+                print(f"🔄 Fetching: {source_name}...")
+                return (source_name, feed_url, *await self._fetch(feed_url))
+
+        tasks = [
+            fetch_source(source_name, feed_url)
+            for source_name, feed_url in feeds.items()
+        ]
+        for next_done in asyncio.as_completed(tasks):
+            source_name, feed_url, status, result, new_state = await next_done
+            previous = self._feed_states.get(feed_url, {})
+            self.last_feed_results[feed_url] = {
+                "status": status, "fresh": result["fresh"] if status == FEED_OK else 0,
+                "retry_at": self.health.retry_at(feed_url),
+            }
+
+            if status == FEED_SKIPPED:
+                stats["skipped"] += 1
+                retry_at = self.last_feed_results[feed_url]["retry_at"]
+                print(f"🚫 {source_name}: отключена до {time.strftime('%H:%M', time.localtime(retry_at))}")
+                continue
+
+            if status == FEED_ERROR:
+                stats["errors"] += 1
+                print(f"⚠️ No entries from {source_name}")
+                continue
+
+            if status in (FEED_NOT_MODIFIED, FEED_UNCHANGED):
+                stats[status] += 1
+                stats["parse_ms_saved"] += previous.get("parse_ms", 0.0)
+                if new_state:
+                    # 200 с тем же телом: скачали, но не разбирали
+                    stats["bytes_downloaded"] += new_state["body_bytes"]
+                    self._pending_states.append(new_state)
+                else:
+                    stats["bytes_saved"] += previous.get("body_bytes", 0)
+                print(f"💤 {source_name}: без изменений")
+                continue
+
+            stats["bytes_downloaded"] += new_state["body_bytes"]
+            if not result["entries"]:
+                print(f"⚠️ No entries from {source_name}")
+            else:
+                print(f"✅ Found {result['entries']} entries from {source_name}")
+
+            stats["entries"] += result["entries"]
+            stats["entries_skipped"] += result["entries"] - result["fresh"]
+            stats["stopped_early"] += result["stopped_early"]
+            stats["parse_ms"] += result["parse_ms"]
+            for news in result["news"]:
+                news.source = source_name
+            all_news.extend(result["news"])
+            self._pending_states.append(new_state)
+
+        self.last_cycle_stats = stats
+        print(
+            f"⏱️ {len(feeds)} feeds in {time.monotonic() - started:.1f}s: "
+            f"304 - {stats['not_modified']}, без изменений - {stats['unchanged']}, "
+            f"ошибок - {stats['errors']}, отключено - {stats['skipped']}, "
+            f"скачано {stats['bytes_downloaded'] / 1024:.0f} КБ, "
+            f"сэкономлено ~{stats['bytes_saved'] / 1024:.0f} КБ "
+            f"и ~{stats['parse_ms_saved']:.0f} мс парсинга, "
+            f"уже известных записей пропущено - {stats['entries_skipped']}, "
+            f"лент дочитано не до конца - {stats['stopped_early']}"
+        )
+        return all_news
+
+
+def parse_feed(content: bytes, state: dict, max_entries: int = MAX_ENTRIES_PER_FEED) -> dict:
+    """
+    Разбор ленты feedparser, отбор новых записей и очистка - выполняется
+    в пуле потоков/процессов.
+
+    Принимает байты и возвращает компактные NewsItem (без FeedParserDict),
+    поэтому результат дешево передается между процессами.
+
+    state: {"hwm_id", "hwm_published"} ленты
+    Returns:
+        {"news": [...], "mark": новая high-water mark, "entries": записей в ленте,
+         "fresh": новых записей, "parse_ms": время разбора и очистки}
+    """
+    started = time.perf_counter()
+    entries = feedparser.parse(content).entries[:max_entries]
+    result = process_feed(entries, state)
+    result["parse_ms"] = (time.perf_counter() - started) * 1000
+    return result
+
+
+def process_feed(entries: List[dict], state: dict) -> dict:
+    """То же, что parse_feed(), для уже разобранных записей (потоковый режим)"""
+    started = time.perf_counter()
+    fresh, mark = RSSParser._select_new_entries(entries, state)
+    news = RSSParser._process_entries(fresh)
+    return {
+        "news": news,
+        "mark": mark,
+        "entries": len(entries),
+        "fresh": len(fresh),
+        "parse_ms": (time.perf_counter() - started) * 1000,
+    }
@@ -0,0 +1,195 @@
+# parser/stream_parser.py
+"""
+Потоковый разбор RSS/Atom поверх тела ответа.
+
+XMLPullParser получает тело кусками по мере загрузки и отдает готовые
+записи (<item> / <entry>), как только закрылся их тег. Чтение ленты
+прекращается, когда набрано max_entries записей или прочитано max_bytes
+байт, поэтому лента на сотни статей с полным HTML не скачивается
+и не держится в памяти целиком.
+
+Записи - FeedParserDict с теми же ключами, что у feedparser (title, link,
+id, summary, published_parsed, media_content, ...), чтобы дальше работал
+общий конвейер RSSParser. Если документ не разбирается как XML (битые
+сущности, HTML вместо ленты), needs_fallback=True и прочитанные байты
+разбирает толерантный feedparser.
+"""
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import mktime_tz, parsedate_tz
+from typing import List, Optional
+
+from feedparser import FeedParserDict
+
+MAX_FEED_BYTES = 2 * 1024 * 1024  # не читаем больше 2 МБ одной ленты
+
+ATOM_NS = "http://www.w3.org/2005/Atom"
+MEDIA_NS = "http://search.yahoo.com/mrss/"
+CONTENT_NS = "http://purl.org/rss/1.0/modules/content/"
+
+ENTRY_TAGS = {"item", "entry"}
+FEED_ROOTS = {"rss", "feed", "RDF"}
+
+
+def _split_tag(tag: str) -> tuple:
+    """'{ns}name' -> ('ns', 'name')"""
+    if tag.startswith("{"):
+        ns, _, name = tag[1:].partition("}")
+        return ns, name
+    return "", tag
+
+
+def _text(elem: ET.Element) -> str:
+    return "".join(elem.itertext()).strip()
+
+
+def _parse_date(text: str) -> Optional[time.struct_time]:
+    """RFC 822 (RSS) или ISO 8601 (Atom) -> struct_time в UTC, как *_parsed у feedparser"""
+    if not text:
+        return None
+
+    parsed = parsedate_tz(text)
+    if parsed:
+        try:
+            return time.gmtime(mktime_tz(parsed))
+        except (OverflowError, ValueError):
+            return None
+
+    try:
+        value = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).timetuple()
+
+
+def _entry_from_element(elem: ET.Element) -> FeedParserDict:
+    entry = FeedParserDict()
+    links, media = [], []
+    content = None
+
+    for child in elem:
+        ns, name = _split_tag(child.tag)
+
+        if ns == MEDIA_NS:
+            if name in ("content", "thumbnail") and child.get("url"):
+                media.append({"url": child.get("url"), "type": child.get("type", "")})
+            continue
+
+        if ns == CONTENT_NS and name == "encoded":
+            content = child.text or ""
+        elif name == "title":
+            entry["title"] = _text(child)
+        elif name == "link":
+            if child.get("href"):
+                # Atom: <link rel="alternate" href="..."/>
+                rel = child.get("rel", "alternate")
+                links.append({"href": child.get("href"), "rel": rel, "type": child.get("type", "")})
+                if rel == "alternate" and "link" not in entry:
+                    entry["link"] = child.get("href")
+            elif child.text:
+                entry["link"] = child.text.strip()
+        elif name in ("guid", "id"):
+            entry["id"] = _text(child)
+            if name == "guid" and child.get("isPermaLink", "true") != "false":
+                entry.setdefault("link", entry["id"])
+        elif name in ("description", "summary"):
+            entry["summary"] = child.text or _text(child)
+        elif name == "content" and ns == ATOM_NS:
+            content = child.text or _text(child)
+        elif name in ("pubDate", "published", "issued", "date"):
+            entry["published_parsed"] = _parse_date(_text(child))
+        elif name in ("updated", "modified"):
+            entry["updated_parsed"] = _parse_date(_text(child))
+        elif name == "enclosure" and child.get("url"):
+            # FeedParserDict строит entry["enclosures"] из links с rel="enclosure", как feedparser
+            links.append({"href": child.get("url"), "rel": "enclosure", "type": child.get("type", "")})
+
+    if "summary" not in entry and content is not None:
+        entry["summary"] = content
+    if links:
+        entry["links"] = links
+    if media:
+        entry["media_content"] = media
+    return entry
+
+
+class StreamingFeedParser:
+    """
+    Инкрементальный разбор ленты: feed(chunk) по мере загрузки, потом close().
+
+    Держит прочитанные байты (не больше max_bytes + один кусок) - для хэша
+    "лента не изменилась" и для разбора feedparser, если XML не разобрался.
+    """
+
+    def __init__(self, max_entries: int = 20, max_bytes: int = MAX_FEED_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries: List[FeedParserDict] = []
+        self.bytes_read = 0
+        self.parse_ms = 0.0
+        self.failed = False
+        self.stopped_early = False
+        self._root: Optional[str] = None
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._buffer = bytearray()
+
+    @property
+    def done(self) -> bool:
+        """Дальше читать не нужно: записей достаточно или исчерпан бюджет байт"""
+        return len(self.entries) >= self.max_entries or self.bytes_read >= self.max_bytes
+
+    @property
+    def needs_fallback(self) -> bool:
+        """XML не разобрался или это не RSS/Atom - нужен feedparser"""
+        return self.failed or (not self.entries and self._root not in FEED_ROOTS)
+
+    @property
+    def content(self) -> bytes:
+        return bytes(self._buffer)
+
+    def feed(self, chunk: bytes):
+        self.bytes_read += len(chunk)
+        self._buffer.extend(chunk)
+        if self.failed:
+            return
+
+        started = time.perf_counter()
+        try:
+            self._parser.feed(chunk)
+            self._collect()
+        except ET.ParseError:
+            self.failed = True
+        self.parse_ms += (time.perf_counter() - started) * 1000
+
+    def close(self, eof: bool = True):
+        """
+        eof=False - чтение прервано досрочно (done): незакрытый документ
+        в этом случае не ошибка.
+        """
+        self.stopped_early = not eof
+        if self.failed or not eof:
+            return
+
+        started = time.perf_counter()
+        try:
+            self._parser.close()
+            self._collect()
+        except ET.ParseError:
+            self.failed = True
+        self.parse_ms += (time.perf_counter() - started) * 1000
+
+    def _collect(self):
+        for event, elem in self._parser.read_events():
+            _, name = _split_tag(elem.tag)
+            if event == "start":
+                if self._root is None:
+                    self._root = name
+                continue
+
+            if name in ENTRY_TAGS and len(self.entries) < self.max_entries:
+                self.entries.append(_entry_from_element(elem))
+                # Разобранная запись больше не нужна - освобождаем поддерево
+                elem.clear()
@@ -1,10 +1,16 @@
 # services/exchange_monitor.py
-import aiohttp
+from typing import List
 
-async def check_binance_listings():
+from services.http_client import http_client
+
+
+async def check_binance_listings() -> List[str]:
     url = "https://api.binance.com/api/v3/exchangeInfo"
-    async with aiohttp.ClientSession() as session:
-        data = await session.get(url)
-        symbols = [s['symbol'] for s in data['symbols']]
-        # Сравниваем с сохраненным списком. Если есть новый - АЛЕРТ!
-        # ... логика сравнения ...
\ No newline at end of file
+    data = await http_client.get_json(url)
+    if not data:
+        return []
+
+    symbols = [s['symbol'] for s in data.get('symbols', [])]
+    # Сравниваем с сохраненным списком. Если есть новый - АЛЕРТ!
+    # ... логика сравнения ...
+    return symbols
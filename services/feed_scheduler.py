@@ -0,0 +1,208 @@
+# services/feed_scheduler.py
+import asyncio
+import logging
+import random
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from parser.rss_parser import FEED_ERROR, FEED_SKIPPED
+
+logger = logging.getLogger(__name__)
+
+HISTORY_HOURS = 7 * 24          # окно истории БД для начальной оценки темпа источника
+RATE_HALF_LIFE = 6 * 3600       # сек: за это время вес старой оценки темпа падает вдвое
+TARGET_ENTRIES_PER_POLL = 0.5    # сколько новых записей в среднем ждать за один опрос
+MIN_INTERVAL_FACTOR = 0.5       # самая активная лента - раз в parse_interval / 2
+MAX_INTERVAL_FACTOR = 4         # самая тихая - раз в 4 * parse_interval
+MIN_INTERVAL = 60               # сек, нижняя граница при любом parse_interval
+JITTER = 0.15                   # +-15% к интервалу, чтобы ленты не сходились в одну волну
+BATCH_WINDOW = 5                # сек: ленты, которым пора в ближайшие секунды, опрашиваются вместе
+RETRY_DELAY = 30                # пауза после сбоя самого планировщика (сек)
+ERROR_BACKOFF_MAX_STEP = 4      # после ошибок интервал удваивается, не больше 2**4 раз
+
+IngestFunc = Callable[[Dict[str, str]], Awaitable[Optional[Dict[str, dict]]]]
+
+
+class FeedScheduler:
+    """
+    Опрос каждой RSS ленты по своему расписанию (вместо общего прохода раз в 10 минут).
+
+    Темп ленты (новых записей в час) сначала берется из истории БД,
+    дальше уточняется после каждого опроса экспоненциальным сглаживанием
+    по времени (полураспад RATE_HALF_LIFE). Интервал подбирается так,
+    чтобы за опрос приходило ~TARGET_ENTRIES_PER_POLL записей, и зажат
+    в [parse_interval / 2, 4 * parse_interval]: Cointelegraph и Forklog
+    опрашиваются чаще, тихие ленты - реже.
+
+    Вес ленты из реестра умножает ее темп: weight 2.0 - опрашивать как
+    вдвое более активную. После ошибки интервал удваивается с каждой
+    ошибкой подряд (не дольше 4 * parse_interval), а когда circuit breaker
+    источника (services/source_health.py) отключил ленту, она ждет
+    retry_at. Ко всем интервалам добавляется джиттер, а первый
+    проход после запуска размазан по времени - ленты не качаются одной пачкой.
+    """
+
+    def __init__(self, ingest_func: IngestFunc, feeds: Dict[str, str],
+                 base_interval: float = 300, state_store=None,
+                 weights: Optional[Dict[str, float]] = None):
+        """
+        ingest_func: async ({source: url}) -> {feed_url: {"status", "fresh", "retry_at"}}
+                     или None при сбое
+        feeds: {source: url} всех лент
+        base_interval: config.parse_interval (сек)
+        state_store: где хранить расписание (NewsDatabase); без него - только в памяти
+        weights: {feed_url: вес} из реестра лент, по умолчанию 1.0
+        """
+        self.ingest_func = ingest_func
+        self.feeds = dict(feeds)
+        self.weights = dict(weights or {})
+        self.state_store = state_store
+        self.min_interval = max(MIN_INTERVAL, base_interval * MIN_INTERVAL_FACTOR)
+        self.max_interval = max(self.min_interval, base_interval * MAX_INTERVAL_FACTOR)
+        # feed_url -> {source, entry_rate, poll_interval, error_count, last_poll, next_poll}
+        self.schedule: Dict[str, dict] = {}
+        self.polls = 0
+        self.is_running = False
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self.is_running:
+            return
+
+        await self.load()
+        self.is_running = True
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            f"🗓️ Планировщик лент запущен: {len(self.schedule)} лент, "
+            f"~{self.polls_per_hour():.0f} опросов в час"
+        )
+
+    async def stop(self):
+        self.is_running = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        logger.info("🛑 Планировщик лент остановлен")
+
+    async def load(self, now: Optional[float] = None):
+        """Восстанавливает расписание из БД; новым лентам оценивает темп по истории"""
+        now = time.time() if now is None else now
+        saved, history = {}, {}
+        if self.state_store is not None:
+            saved = await self.state_store.get_feed_schedules()
+            history = await self.state_store.get_source_rates(HISTORY_HOURS)
+
+        self.schedule = {}
+        for source, feed_url in self.feeds.items():
+            entry = saved.get(feed_url)
+            if entry is None:
+                rate = history.get(source, 0.0)
+                interval = self.interval_for(rate * self.weights.get(feed_url, 1.0))
+                entry = {
+                    "feed_url": feed_url, "entry_rate": rate, "poll_interval": interval,
+                    "error_count": 0, "last_poll": None,
+                    # Первый проход размазываем, чтобы не бить по всем лентам разом
+                    "next_poll": now + random.uniform(0, min(interval, self.min_interval)),
+                }
+            else:
+                entry = dict(entry)
+                # parse_interval мог измениться с прошлого запуска
+                entry["next_poll"] = min(entry["next_poll"] or now, now + entry["poll_interval"])
+            entry["source"] = source
+            self.schedule[feed_url] = entry
+
+    def interval_for(self, rate: float) -> float:
+        """Интервал опроса для темпа rate (записей в час)"""
+        if rate <= 0:
+            return self.max_interval
+        interval = TARGET_ENTRIES_PER_POLL * 3600 / rate
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def record_poll(self, feed_url: str, status: str, fresh: int, now: float,
+                    retry_at: Optional[float] = None):
+        """
+        Учитывает итог опроса и назначает следующий.
+
+        retry_at: лента отключена circuit breaker'ом до этого момента
+        """
+        entry = self.schedule[feed_url]
+
+        if status == FEED_SKIPPED:
+            # Запроса не было - темп не трогаем, ждем пробы
+            entry["next_poll"] = int(retry_at or now + entry["poll_interval"])
+            return
+
+        if status == FEED_ERROR:
+            entry["error_count"] += 1
+            # До срабатывания breaker'а не долбим падающую ленту с полной частотой
+            step = min(entry["error_count"], ERROR_BACKOFF_MAX_STEP)
+            delay = min(self.max_interval, entry["poll_interval"] * 2 ** step)
+        else:
+            entry["error_count"] = 0
+            # Первый опрос ленты без high-water mark вернет всю ленту - темп по нему не считаем
+            if entry["last_poll"] is not None:
+                elapsed = max(1.0, now - entry["last_poll"])
+                observed = fresh * 3600 / elapsed
+                weight = 1 - 0.5 ** (elapsed / RATE_HALF_LIFE)
+                entry["entry_rate"] += weight * (observed - entry["entry_rate"])
+            entry["last_poll"] = int(now)
+            entry["poll_interval"] = self.interval_for(
+                entry["entry_rate"] * self.weights.get(feed_url, 1.0)
+            )
+            delay = entry["poll_interval"]
+
+        entry["next_poll"] = int(now + delay * random.uniform(1 - JITTER, 1 + JITTER))
+        if retry_at is not None:
+            # Breaker разомкнулся этим опросом - раньше пробы опрашивать незачем
+            entry["next_poll"] = max(entry["next_poll"], int(retry_at))
+
+    def due_feeds(self, now: float) -> List[dict]:
+        return [entry for entry in self.schedule.values() if entry["next_poll"] <= now + BATCH_WINDOW]
+
+    def polls_per_hour(self) -> float:
+        return sum(3600 / entry["poll_interval"] for entry in self.schedule.values())
+
+    def snapshot(self) -> dict:
+        """Для /health: сколько опросов в час и когда ближайший"""
+        now = time.time()
+        return {
+            "feeds": len(self.schedule),
+            "polls": self.polls,
+            "polls_per_hour": self.polls_per_hour(),
+            "failing": sum(1 for entry in self.schedule.values() if entry["error_count"]),
+            "next_in": max(0.0, min((e["next_poll"] for e in self.schedule.values()), default=now) - now),
+        }
+
+    async def _run(self):
+        while self.is_running:
+            try:
+                now = time.time()
+                due = self.due_feeds(now)
+                if due:
+                    await self._poll(due)
+                    continue
+                # Без лент (воркеру не досталось ни одной) - просто ждем
+                delay = min((entry["next_poll"] for entry in self.schedule.values()),
+                            default=now + RETRY_DELAY) - now
+            except Exception as e:
+                logger.error(f"❌ Ошибка планировщика лент: {e}", exc_info=True)
+                delay = RETRY_DELAY
+            await asyncio.sleep(delay)
+
+    async def _poll(self, due: List[dict]):
+        results = await self.ingest_func({entry["source"]: entry["feed_url"] for entry in due})
+        now = time.time()
+        for entry in due:
+            # Нет результата (упал сбор или запись в БД) - считаем ошибкой ленты
+            result = (results or {}).get(entry["feed_url"]) or {"status": FEED_ERROR, "fresh": 0}
+            self.record_poll(
+                entry["feed_url"], result["status"], result["fresh"], now, result.get("retry_at")
+            )
+        self.polls += len(due)
+
+        if self.state_store is not None:
+            await self.state_store.save_feed_schedules(due)
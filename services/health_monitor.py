@@ -90,7 +90,7 @@ class HealthMonitor:
         """
         try:
             # Простой запрос для проверки
-            count = await db.execute("SELECT COUNT(*) FROM news")
+            count = (await db.get_counts())["total"]
             self.last_db_check = datetime.now()
             logger.debug(f"✅ БД здорова ({count} записей)")
             return True
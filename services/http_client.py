@@ -0,0 +1,135 @@
+# services/http_client.py
+import asyncio
+import logging
+import random
+from contextlib import asynccontextmanager
+from typing import Any, Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+
+DEFAULT_TIMEOUT = 10       # сек на одну попытку
+DEFAULT_RETRIES = 2        # повторов после первой попытки
+RETRY_BASE_DELAY = 0.5     # сек, удваивается с каждой попыткой
+RETRY_MAX_DELAY = 8.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+POOL_LIMIT = 100           # всего соединений
+POOL_LIMIT_PER_HOST = 8    # соединений на один хост
+DNS_CACHE_TTL = 300        # сек
+KEEPALIVE_TIMEOUT = 60     # сек простоя, после которых соединение закрывается
+
+
+class HttpClient:
+    """
+    Общий HTTP клиент для всех исходящих запросов (RSS, CoinGecko, Fear&Greed, ...).
+
+    Одна aiohttp.ClientSession на все приложение: соединения переиспользуются
+    (keep-alive), DNS ответы кэшируются, число соединений на хост ограничено.
+    Сетевые ошибки, таймауты и ответы 429/5xx повторяются с экспоненциальной
+    задержкой и случайным джиттером (full jitter).
+
+    Жизненный цикл: start() при запуске бота, close() при остановке.
+    Если start() не вызывали (скрипты, бенчмарки), сессия создается при первом запросе.
+    """
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT, retries: int = DEFAULT_RETRIES,
+                 limit: int = POOL_LIMIT, limit_per_host: int = POOL_LIMIT_PER_HOST):
+        self.timeout = timeout
+        self.retries = retries
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._session is not None and not self._session.closed
+
+    async def start(self):
+        if self.is_running:
+            return
+
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            ttl_dns_cache=DNS_CACHE_TTL,
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={"User-Agent": USER_AGENT},
+        )
+        logger.info(
+            f"🌐 HTTP клиент запущен (до {self.limit} соединений, "
+            f"{self.limit_per_host} на хост)"
+        )
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+            logger.info("✅ HTTP клиент закрыт")
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+
+    async def _send(self, method: str, url: str, retries: int, timeout: Optional[float],
+                    **kwargs) -> aiohttp.ClientResponse:
+        if not self.is_running:
+            await self.start()
+
+        if timeout is not None:
+            kwargs["timeout"] = aiohttp.ClientTimeout(total=timeout)
+
+        attempt = 0
+        while True:
+            try:
+                resp = await self._session.request(method, url, **kwargs)
+                if resp.status not in RETRY_STATUSES or attempt >= retries:
+                    return resp
+                resp.release()
+                reason = f"HTTP {resp.status}"
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt >= retries:
+                    raise
+                reason = type(e).__name__
+
+            delay = self._backoff(attempt)
+            attempt += 1
+            logger.debug(f"🔁 {reason}: {url}, повтор {attempt}/{retries} через {delay:.1f}с")
+            await asyncio.sleep(delay)
+
+    @asynccontextmanager
+    async def request(self, method: str, url: str, *, retries: Optional[int] = None,
+                      timeout: Optional[float] = None, **kwargs):
+        """
+        Запрос с повторами; отдает aiohttp.ClientResponse и освобождает соединение на выходе.
+
+        timeout - на одну попытку (по умолчанию общий для клиента)
+        """
+        resp = await self._send(
+            method, url, self.retries if retries is None else retries, timeout, **kwargs
+        )
+        try:
+            yield resp
+        finally:
+            resp.release()
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    async def get_json(self, url: str, **kwargs) -> Optional[Any]:
+        """GET и разбор JSON; None, если ответ не 200"""
+        async with self.get(url, **kwargs) as resp:
+            if resp.status != 200:
+                logger.warning(f"⚠️ HTTP {resp.status}: {url}")
+                return None
+            return await resp.json(content_type=None)
+
+
+http_client = HttpClient()
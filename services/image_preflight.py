@@ -0,0 +1,293 @@
+# services/image_preflight.py
+import asyncio
+import logging
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+from urllib.parse import urlsplit
+
+from services.http_client import http_client
+
+logger = logging.getLogger(__name__)
+
+# Вердикты
+IMAGE_OK = "ok"            # Telegram сам скачает картинку по URL
+IMAGE_REHOST = "rehost"    # картинка годная, но Telegram ее не получит - качаем и загружаем байты
+IMAGE_BAD = "bad"          # 404, не картинка, слишком большая, SVG - публикуем без нее
+
+# Лимиты Bot API для send_photo
+TELEGRAM_URL_LIMIT = 5 * 1024 * 1024       # фото по URL
+TELEGRAM_UPLOAD_LIMIT = 10 * 1024 * 1024   # фото файлом
+
+PREFLIGHT_TIMEOUT = 5       # сек на проверку одного URL
+PREFLIGHT_CONCURRENCY = 16  # одновременных проверок при сборе лент
+SNIFF_BYTES = 32            # сколько байт нужно, чтобы узнать формат
+URL_CACHE_SIZE = 10_000
+URL_TTL = 24 * 3600         # сек: вердикт по URL (картинки по одному адресу меняются редко)
+HOST_TTL = 6 * 3600         # сек: вердикт по хосту
+HOST_TRUST_AFTER = 20       # OK подряд - картинки хоста больше не проверяем
+HOST_REHOST_AFTER = 3       # отказов Telegram - картинки хоста сразу загружаем байтами
+HOST_BAD_AFTER = 5          # недоступен столько раз подряд - хост пропускаем
+
+# Сигнатуры форматов: (формат, префикс, смещение)
+_SIGNATURES = (
+    ("jpeg", b"\xff\xd8\xff", 0),
+    ("png", b"\x89PNG\r\n\x1a\n", 0),
+    ("gif", b"GIF8", 0),
+    ("webp", b"WEBP", 8),
+)
+# По URL Telegram берет JPEG, PNG и GIF; WebP - только файлом
+URL_FORMATS = {"jpeg", "png", "gif"}
+UPLOAD_FORMATS = {"webp"}
+_TOTAL_SIZE_RE = re.compile(r"/(\d+)$")
+
+
+@dataclass(slots=True)
+class HostStats:
+    """Опыт с картинками одного хоста"""
+    ok: int = 0                  # хороших проверок подряд
+    unreachable: int = 0         # недоступен подряд
+    telegram_failures: int = 0   # Telegram не смог скачать картинку по URL
+    verdict: Optional[str] = None
+    expires: float = 0.0
+
+
+class ImagePreflight:
+    """
+    Проверка картинок новостей до публикации.
+
+    При сборе лент URL картинок добавленных в БД новостей проверяются
+    параллельно одним GET с Range: bytes=0-31 - статус, Content-Type,
+    размер (Content-Range) и первые байты (формат по сигнатуре). Плохие
+    картинки (404, не картинка, SVG, больше 10 МБ) publish_news_item
+    убирает по вердикту - форматтер подставит картинку монеты. Проверка
+    идет в процессе бота (и при INGEST_WORKERS), чтобы кэш достался
+    публикатору. Вердикты кэшируются по URL и по хосту:
+
+    - хост, у которого HOST_TRUST_AFTER картинок подряд в порядке, больше
+      не проверяется;
+    - хост, с которого Telegram HOST_REHOST_AFTER раз не смог скачать
+      картинку (защита от хотлинков, блокировка), отдается байтами;
+    - недоступный хост пропускается до истечения HOST_TTL.
+
+    При публикации RichMediaMessage спрашивает вердикт: IMAGE_OK - фото
+    по URL, IMAGE_REHOST - бот сам качает картинку (с Referer статьи)
+    и загружает файлом. Неудачная попытка Telegram больше не повторяется
+    для того же URL.
+    """
+
+    def __init__(self, concurrency: int = PREFLIGHT_CONCURRENCY, timeout: float = PREFLIGHT_TIMEOUT):
+        self.concurrency = concurrency
+        self.timeout = timeout
+        # url -> (вердикт, истекает, referer)
+        self.urls: "OrderedDict[str, Tuple[str, float, Optional[str]]]" = OrderedDict()
+        self.hosts: Dict[str, HostStats] = {}
+        self.stats = {"checked": 0, "cached": 0, IMAGE_OK: 0, IMAGE_REHOST: 0, IMAGE_BAD: 0, "rehosted": 0}
+
+    @staticmethod
+    def _host(url: str) -> str:
+        return urlsplit(url).hostname or ""
+
+    def verdict(self, url: str, now: Optional[float] = None) -> Optional[str]:
+        """Вердикт из кэша (по URL или по хосту) или None"""
+        now = time.time() if now is None else now
+        cached = self.urls.get(url)
+        if cached is not None:
+            if cached[1] > now:
+                self.urls.move_to_end(url)
+                return cached[0]
+            del self.urls[url]
+
+        host = self.hosts.get(self._host(url))
+        if host is not None and host.verdict and host.expires > now:
+            return host.verdict
+        return None
+
+    def referer(self, url: str) -> Optional[str]:
+        cached = self.urls.get(url)
+        return cached[2] if cached else None
+
+    def _remember(self, url: str, verdict: str, referer: Optional[str], now: float):
+        self.urls[url] = (verdict, now + URL_TTL, referer)
+        self.urls.move_to_end(url)
+        while len(self.urls) > URL_CACHE_SIZE:
+            self.urls.popitem(last=False)
+        self.stats[verdict] += 1
+
+    def _host_stats(self, url: str) -> HostStats:
+        host = self._host(url)
+        stats = self.hosts.get(host)
+        if stats is None:
+            stats = self.hosts[host] = HostStats()
+        return stats
+
+    async def check(self, url: Optional[str], referer: Optional[str] = None) -> str:
+        """Вердикт для картинки (из кэша или проверкой)"""
+        if not url or not url.lower().startswith(("http://", "https://")):
+            return IMAGE_BAD
+
+        now = time.time()
+        verdict = self.verdict(url, now)
+        if verdict is not None:
+            self.stats["cached"] += 1
+            return verdict
+
+        self.stats["checked"] += 1
+        host = self._host_stats(url)
+        try:
+            verdict = await asyncio.wait_for(self._probe(url, referer), self.timeout)
+            host.unreachable = 0
+        except Exception as e:
+            logger.debug(f"🖼️ Картинка недоступна ({type(e).__name__}): {url}")
+            verdict = IMAGE_BAD
+            host.unreachable += 1
+            if host.unreachable >= HOST_BAD_AFTER:
+                self._set_host_verdict(url, host, IMAGE_BAD, now)
+
+        if verdict == IMAGE_OK:
+            host.ok += 1
+            if host.ok >= HOST_TRUST_AFTER and host.telegram_failures == 0:
+                self._set_host_verdict(url, host, IMAGE_OK, now)
+        elif verdict == IMAGE_BAD:
+            host.ok = 0
+        self._remember(url, verdict, referer, now)
+        return verdict
+
+    def _set_host_verdict(self, url: str, host: HostStats, verdict: str, now: float):
+        if host.verdict != verdict:
+            logger.info(f"🖼️ Картинки с {self._host(url)}: {verdict} на {HOST_TTL // 3600} ч")
+        host.verdict = verdict
+        host.expires = now + HOST_TTL
+
+    async def _probe(self, url: str, referer: Optional[str]) -> str:
+        status, content_type, size, head = await self._fetch_head(url)
+        if status in (401, 403) and referer:
+            # Защита от хотлинков: с Referer статьи отдают - значит, загрузим сами
+            status, content_type, size, head = await self._fetch_head(url, referer)
+            if status in (200, 206):
+                return self._classify(content_type, size, head, rehost=True)
+        if status not in (200, 206):
+            return IMAGE_BAD
+        return self._classify(content_type, size, head)
+
+    async def _fetch_head(self, url: str, referer: Optional[str] = None) -> tuple:
+        """(status, content-type, полный размер или None, первые байты)"""
+        headers = {"Range": f"bytes=0-{SNIFF_BYTES - 1}"}
+        if referer:
+            headers["Referer"] = referer
+        async with http_client.get(url, headers=headers, retries=0, timeout=self.timeout) as resp:
+            if resp.status not in (200, 206):
+                return resp.status, None, None, b""
+
+            size = None
+            content_range = resp.headers.get("Content-Range", "")
+            match = _TOTAL_SIZE_RE.search(content_range)
+            if match:
+                size = int(match.group(1))
+            elif resp.status == 200 and resp.content_length is not None:
+                # Range не поддерживается: тело целиком не читаем, размер из заголовка
+                size = resp.content_length
+            head = await self._read(resp, SNIFF_BYTES)
+            return resp.status, resp.headers.get("Content-Type", ""), size, head
+
+    @staticmethod
+    async def _read(resp, limit: int) -> bytes:
+        """Не больше limit байт тела (остаток не читается)"""
+        data = bytearray()
+        async for chunk in resp.content.iter_chunked(64 * 1024):
+            data.extend(chunk)
+            if len(data) >= limit:
+                break
+        return bytes(data[:limit])
+
+    @staticmethod
+    def _format(content_type: str, head: bytes) -> Optional[str]:
+        for name, signature, offset in _SIGNATURES:
+            if head[offset:offset + len(signature)] == signature:
+                return name
+        # Сигнатуру не узнали (AVIF, SVG, HTML-заглушка) - решает Content-Type
+        content_type = (content_type or "").split(";")[0].strip().lower()
+        if content_type in ("image/jpeg", "image/png", "image/gif"):
+            return content_type.split("/")[1]
+        return None
+
+    @classmethod
+    def _classify(cls, content_type: str, size: Optional[int], head: bytes,
+                  rehost: bool = False) -> str:
+        image_format = cls._format(content_type, head)
+        if image_format is None or (size is not None and size > TELEGRAM_UPLOAD_LIMIT):
+            return IMAGE_BAD
+        if image_format in UPLOAD_FORMATS or (size is not None and size > TELEGRAM_URL_LIMIT):
+            return IMAGE_REHOST
+        if image_format in URL_FORMATS:
+            return IMAGE_REHOST if rehost else IMAGE_OK
+        return IMAGE_BAD
+
+    async def preflight_news(self, items: Iterable) -> dict:
+        """
+        Проверяет картинки новостей (NewsItem) при сборе лент.
+
+        Плохие картинки убираются из переданных объектов (image_url = None).
+        Returns:
+            {вердикт: число новостей}
+        """
+        items = [item for item in items if item.image_url]
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def check(item):
+            async with semaphore:
+                return await self.check(item.image_url, referer=item.url)
+
+        verdicts = await asyncio.gather(*(check(item) for item in items))
+        counts = {IMAGE_OK: 0, IMAGE_REHOST: 0, IMAGE_BAD: 0}
+        for item, verdict in zip(items, verdicts):
+            counts[verdict] += 1
+            if verdict == IMAGE_BAD:
+                item.image_url = None
+
+        if counts[IMAGE_REHOST] or counts[IMAGE_BAD]:
+            logger.info(
+                f"🖼️ Картинки: {counts[IMAGE_OK]} ок, {counts[IMAGE_REHOST]} загрузим сами, "
+                f"{counts[IMAGE_BAD]} убрано"
+            )
+        return counts
+
+    def record_telegram_failure(self, url: str):
+        """Telegram не скачал картинку по URL: в следующий раз - байтами"""
+        now = time.time()
+        self._remember(url, IMAGE_REHOST, self.referer(url), now)
+        host = self._host_stats(url)
+        host.telegram_failures += 1
+        host.ok = 0
+        if host.verdict == IMAGE_OK:
+            host.verdict = None
+        if host.telegram_failures >= HOST_REHOST_AFTER:
+            self._set_host_verdict(url, host, IMAGE_REHOST, now)
+
+    def record_upload_failure(self, url: str):
+        """Не удалось ни скачать, ни загрузить - картинку больше не пробуем"""
+        self._remember(url, IMAGE_BAD, self.referer(url), time.time())
+
+    async def download(self, url: str) -> Optional[bytes]:
+        """Картинка целиком (не больше TELEGRAM_UPLOAD_LIMIT) или None"""
+        referer = self.referer(url)
+        headers = {"Referer": referer} if referer else {}
+        try:
+            async with http_client.get(url, headers=headers, timeout=self.timeout * 3) as resp:
+                if resp.status != 200:
+                    return None
+                if resp.content_length and resp.content_length > TELEGRAM_UPLOAD_LIMIT:
+                    return None
+                data = await self._read(resp, TELEGRAM_UPLOAD_LIMIT + 1)
+                if len(data) > TELEGRAM_UPLOAD_LIMIT:
+                    return None
+                self.stats["rehosted"] += 1
+                return data
+        except Exception as e:
+            logger.warning(f"⚠️ Не удалось скачать картинку {url}: {e}")
+            return None
+
+
+image_preflight = ImagePreflight()
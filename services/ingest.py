@@ -0,0 +1,58 @@
+# services/ingest.py
+"""
+Цикл сбора RSS лент: ленты -> БД -> валидаторы лент -> проверка картинок.
+
+Общий для бота (scheduled_parsing в app.py) и бенчмарка
+benchmarks/bench_ingest.py. config и .env не нужны - парсер, хранилище
+и проверка картинок передаются параметрами.
+
+Картинки проверяются только у новостей, которые действительно добавлены:
+в установившемся режиме почти все записи лент - дубли и почти-дубли.
+"""
+import logging
+from typing import Dict, List, Optional
+
+from models import NewsItem
+from parser.rss_parser import RSSParser
+from services.image_preflight import ImagePreflight
+
+logger = logging.getLogger(__name__)
+
+
+async def ingest_cycle(parser: RSSParser, store, feeds: Optional[Dict[str, str]] = None,
+                       preflight: Optional[ImagePreflight] = None) -> List[str]:
+    """
+    Один цикл сбора лент feeds ({source: url}, по умолчанию все).
+
+    store: NewsDatabase (add_news_many отсеивает дубли и почти-дубли и будит публикатор)
+    preflight: проверка картинок (None - не проверять)
+
+    Returns:
+        URL добавленных новостей; итог по лентам - parser.last_feed_results
+    """
+    logger.info(f"🔍 Парсер: ищу свежие новости ({len(feeds or parser.feeds)} лент)...")
+    news = await parser.get_all_news(feeds)
+
+    # Весь цикл парсинга - одна транзакция
+    new_urls = await store.add_news_many(news)
+    if new_urls:
+        logger.info(f"📥 Добавлено {len(new_urls)} новостей")
+
+    # Валидаторы лент фиксируем только после успешной записи новостей
+    await parser.commit_feed_states()
+    await preflight_inserted(preflight, news, new_urls)
+    return new_urls
+
+
+async def preflight_inserted(preflight: Optional[ImagePreflight], news: List[NewsItem],
+                             new_urls: List[str]):
+    """
+    Проверяет картинки добавленных новостей - вердикты ложатся в кэш для публикации.
+
+    Новость уже в БД: битую картинку уберет publish_news_item по вердикту.
+    """
+    if preflight is None or not new_urls:
+        return
+    # Одна и та же ссылка может прийти из нескольких лент - проверяем один раз
+    added = {item.url: item for item in news if item.url}
+    await preflight.preflight_news(added[url] for url in new_urls if url in added)
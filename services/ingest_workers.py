@@ -0,0 +1,467 @@
+# services/ingest_workers.py
+"""
+Сбор RSS лент в нескольких процессах-воркерах.
+
+Реестр лент делится между N воркерами консистентным хэшированием
+по URL ленты (utils/hash_ring.py). Каждый воркер - отдельный процесс
+со своим event loop, HTTP клиентом, RSSParser и FeedScheduler: качает,
+разбирает (feedparser - CPU) и фильтрует только свои ленты.
+
+Воркеры не открывают БД. Новости, состояния лент (ETag, high-water mark)
+и расписание они отправляют в общую очередь, а координатор в процессе
+бота пишет их через единственный writer БД. Поэтому публикатор в app.py
+остается единственным потребителем: он просыпается по вставкам в БД,
+как и раньше. Состояния лент воркер отправляет только после того,
+как координатор подтвердил запись новостей (как commit_feed_states).
+
+Координатор следит за процессами: если воркер упал, его ленты
+переходят к соседям по кольцу (остальные ленты не двигаются), а сам
+воркер перезапускается с нарастающей паузой и забирает их обратно.
+
+    worker-0: свои ленты -> RSSParser ─┐
+    worker-1: свои ленты -> RSSParser ─┼─> очередь -> координатор -> БД -> публикатор
+    ...                                ─┘
+"""
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import os
+import queue
+import time
+from typing import Dict, List, Optional
+
+from parser.feed_registry import FeedRegistry
+from parser.rss_parser import RSSParser
+from services.feed_scheduler import HISTORY_HOURS, FeedScheduler
+from services.http_client import http_client
+from services.image_preflight import ImagePreflight
+from services.ingest import preflight_inserted
+from services.source_health import SourceHealth
+from utils.error_handling import alert_manager
+from utils.hash_ring import HashRing
+
+logger = logging.getLogger(__name__)
+
+WATCH_INTERVAL = 2        # сек между проверками, живы ли воркеры
+RESTART_DELAY = 30        # сек до перезапуска упавшего воркера, удваивается
+MAX_RESTART_DELAY = 600   # сек; воркер, проживший столько, снова перезапускается быстро
+ACK_TIMEOUT = 60          # сек: сколько воркер ждет подтверждения записи новостей
+STOP_TIMEOUT = 10         # сек на штатную остановку воркера
+QUEUE_POLL = 0.5          # сек: таймаут блокирующего get() в потоке
+
+# Воркер -> координатор (общая очередь)
+MSG_INGEST = "ingest"            # (MSG_INGEST, worker, generation, seq, news, health)
+MSG_FEED_STATES = "feed_states"  # (MSG_FEED_STATES, states)
+MSG_SCHEDULES = "schedules"      # (MSG_SCHEDULES, schedules)
+# Координатор -> воркер (своя очередь у каждого)
+MSG_ACK = "ack"                  # (MSG_ACK, generation, seq, ok)
+MSG_ASSIGN = "assign"            # (MSG_ASSIGN, feeds, snapshot)
+MSG_RESET = "reset"              # (MSG_RESET, feed_url) - /feeds reset
+MSG_STOP = "stop"                # (MSG_STOP,)
+
+
+# === ВОРКЕР ===
+class CoordinatorStore:
+    """
+    state_store воркера для RSSParser и FeedScheduler.
+
+    Читает из снимка, который координатор прислал вместе с лентами,
+    пишет - в очередь координатора (и в снимок, чтобы не перечитывать).
+    """
+
+    def __init__(self, outbox, snapshot: dict):
+        self.outbox = outbox
+        self.feed_states: Dict[str, dict] = {}
+        self.schedules: Dict[str, dict] = {}
+        self.rates: Dict[str, float] = {}
+        self.update(snapshot)
+
+    def update(self, snapshot: dict):
+        self.feed_states.update(snapshot["feed_states"])
+        self.schedules.update(snapshot["schedules"])
+        self.rates = snapshot["rates"]
+
+    async def get_feed_states(self) -> Dict[str, dict]:
+        return dict(self.feed_states)
+
+    async def save_feed_states(self, states: List[dict]):
+        for state in states:
+            self.feed_states[state["feed_url"]] = state
+        self.outbox.put((MSG_FEED_STATES, states))
+
+    async def get_feed_schedules(self) -> Dict[str, dict]:
+        return dict(self.schedules)
+
+    async def get_source_rates(self, hours: int) -> Dict[str, float]:
+        return dict(self.rates)
+
+    async def save_feed_schedules(self, schedules: List[dict]):
+        schedules = [dict(schedule) for schedule in schedules]
+        for schedule in schedules:
+            self.schedules[schedule["feed_url"]] = schedule
+        self.outbox.put((MSG_SCHEDULES, schedules))
+
+
+def run_worker(name: str, generation: int, feeds: Dict[str, str], snapshot: dict, options: dict,
+               inbox, outbox):
+    """
+    Точка входа процесса-воркера.
+
+    generation: номер запуска воркера name - seq у каждого запуска свой
+    и начинается с нуля, поэтому подтверждения сверяются и по нему.
+    """
+    # force: импорт главного модуля при spawn не должен решать, куда пишет воркер
+    logging.basicConfig(
+        level=options["log_level"],
+        format=f"%(asctime)s - {name} - %(name)s - %(levelname)s - %(message)s",
+        force=True
+    )
+    try:
+        asyncio.run(_worker_main(name, generation, feeds, snapshot, options, inbox, outbox))
+    except KeyboardInterrupt:
+        pass
+
+
+async def _worker_main(name: str, generation: int, feeds: Dict[str, str], snapshot: dict,
+                       options: dict, inbox, outbox):
+    loop = asyncio.get_running_loop()
+    store = CoordinatorStore(outbox, snapshot)
+    registry = FeedRegistry.load(options["feeds_file"])
+    parser = RSSParser(
+        state_store=store,
+        workers=options["parser_workers"],
+        streaming=options["parser_streaming"],
+        max_feed_bytes=options["feed_max_bytes"],
+        registry=registry,
+        health=SourceHealth(
+            failure_threshold=options["feed_failure_threshold"],
+            open_delay=options["feed_open_delay"]
+        )
+    )
+    parser.feeds = dict(feeds)
+    acks: Dict[int, asyncio.Future] = {}
+    sequence = itertools.count()
+
+    async def ingest(batch: Dict[str, str]) -> Optional[Dict[str, dict]]:
+        """То же, что scheduled_parsing в app.py, но запись - через координатора"""
+        news = await parser.get_all_news(batch)
+        seq = next(sequence)
+        acks[seq] = loop.create_future()
+        health = {url: parser.health.get(url) for url in batch.values()}
+        outbox.put((MSG_INGEST, name, generation, seq, news, health))
+        try:
+            written = await asyncio.wait_for(acks[seq], ACK_TIMEOUT)
+        except asyncio.TimeoutError:
+            written = False
+        finally:
+            acks.pop(seq, None)
+
+        if not written:
+            logger.error(f"❌ {name}: координатор не подтвердил запись {len(news)} новостей")
+            return None
+        await parser.commit_feed_states()
+        return parser.last_feed_results
+
+    scheduler = FeedScheduler(
+        ingest,
+        parser.feeds,
+        base_interval=options["parse_interval"],
+        state_store=store,
+        weights={source.url: source.weight for source in registry.sources}
+    )
+
+    await http_client.start()
+    await scheduler.start()
+    parent = os.getppid()
+    logger.info(f"👷 {name}: {len(parser.feeds)} лент (pid {os.getpid()})")
+
+    try:
+        while True:
+            try:
+                message = await loop.run_in_executor(None, inbox.get, True, QUEUE_POLL)
+            except queue.Empty:
+                # Бот умер, не успев остановить воркеров
+                if os.getppid() != parent:
+                    logger.warning(f"⚠️ {name}: процесс бота завершился, останавливаюсь")
+                    break
+                continue
+
+            kind = message[0]
+            if kind == MSG_ACK:
+                _, acked_generation, seq, written = message
+                if acked_generation != generation:
+                    continue
+                future = acks.get(seq)
+                if future is not None and not future.done():
+                    future.set_result(written)
+            elif kind == MSG_ASSIGN:
+                _, feeds, snapshot = message
+                store.update(snapshot)
+                await scheduler.stop()
+                parser.feeds = dict(feeds)
+                parser.reload_feed_states()
+                scheduler.feeds = dict(feeds)
+                await scheduler.start()
+                logger.info(f"🔀 {name}: теперь {len(feeds)} лент")
+            elif kind == MSG_RESET:
+                feed_url = message[1]
+                parser.health.reset(feed_url)
+                if feed_url in scheduler.schedule:
+                    scheduler.schedule[feed_url]["next_poll"] = 0
+            elif kind == MSG_STOP:
+                break
+    finally:
+        await scheduler.stop()
+        await http_client.close()
+        parser.close()
+
+
+# === КООРДИНАТОР ===
+class IngestCoordinator:
+    """
+    Процессы-воркеры сбора лент и запись их результатов в БД (в процессе бота).
+
+    coordinator = IngestCoordinator(rss_parser.feeds, 4, state_store=db, options={...})
+    await coordinator.start() ... await coordinator.stop()
+    """
+
+    def __init__(self, feeds: Dict[str, str], workers: int, state_store, options: dict,
+                 health: Optional[SourceHealth] = None, preflight: Optional[ImagePreflight] = None):
+        """
+        feeds: {source: url} всех лент
+        workers: число процессов
+        state_store: NewsDatabase
+        options: настройки воркера (см. app.py)
+        health: куда складывать статистику источников от воркеров (для /feeds)
+        preflight: проверка картинок записанных новостей - в процессе бота,
+            чтобы вердикты достались публикатору (None - не проверять)
+        """
+        self.feeds = dict(feeds)
+        self.state_store = state_store
+        self.options = options
+        self.health = health
+        self.preflight = preflight
+        self.ring = HashRing()
+        self._context = multiprocessing.get_context("spawn")
+        self._outbox = self._context.Queue()
+        # name -> {process, inbox, feeds, started, restarts, restart_at, generation}
+        self.workers: Dict[str, dict] = {
+            f"worker-{i}": {
+                "process": None, "inbox": None, "feeds": {},
+                "started": 0.0, "restarts": 0, "restart_at": 0.0, "generation": 0,
+            }
+            for i in range(workers)
+        }
+        # Последнее расписание каждой ленты (для /health)
+        self.schedules: Dict[str, dict] = {}
+        self.batches = 0
+        self.news = 0
+        self.is_running = False
+        self._tasks: List[asyncio.Task] = []
+        self._handlers: set = set()
+
+    async def start(self):
+        if self.is_running:
+            return
+
+        self.is_running = True
+        for name in self.workers:
+            self.ring.add(name)
+        await self._rebalance()
+        self._tasks = [
+            asyncio.create_task(self._receive()),
+            asyncio.create_task(self._watch()),
+        ]
+        logger.info(f"👷 Сбор лент: {len(self.feeds)} лент на {len(self.workers)} воркерах")
+
+    async def stop(self):
+        self.is_running = False
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        loop = asyncio.get_running_loop()
+        for name, worker in self.workers.items():
+            process = worker["process"]
+            if process is None or not process.is_alive():
+                continue
+            worker["inbox"].put((MSG_STOP,))
+            await loop.run_in_executor(None, process.join, STOP_TIMEOUT)
+            if process.is_alive():
+                logger.warning(f"⚠️ {name} не остановился за {STOP_TIMEOUT}с, завершаю принудительно")
+                process.terminate()
+
+        if self._handlers:
+            await asyncio.gather(*self._handlers, return_exceptions=True)
+        logger.info("🛑 Воркеры сбора лент остановлены")
+
+    def snapshot(self) -> dict:
+        """Для /health"""
+        now = time.time()
+        schedules = [self.schedules[url] for url in self.feeds.values() if url in self.schedules]
+        return {
+            "workers": len(self.workers),
+            "alive": sum(1 for w in self.workers.values() if w["process"] and w["process"].is_alive()),
+            "restarts": sum(w["restarts"] for w in self.workers.values()),
+            "feeds": len(self.feeds),
+            "batches": self.batches,
+            "news": self.news,
+            "polls_per_hour": sum(3600 / s["poll_interval"] for s in schedules),
+            "failing": sum(1 for s in schedules if s["error_count"]),
+            "next_in": max(0.0, min((s["next_poll"] for s in schedules), default=now) - now),
+        }
+
+    def reset_source(self, feed_url: str):
+        """Включает отключенную ленту у воркера, которому она принадлежит"""
+        worker = self.workers.get(self.ring.node_for(feed_url))
+        if worker and worker["process"] is not None:
+            worker["inbox"].put((MSG_RESET, feed_url))
+
+    async def _rebalance(self):
+        """Раздает ленты по кольцу; воркерам, у которых набор изменился, шлет новый"""
+        urls = {url: source for source, url in self.feeds.items()}
+        shards = self.ring.assign(urls)
+        states = await self.state_store.get_feed_states()
+        schedules = await self.state_store.get_feed_schedules()
+        schedules.update(self.schedules)
+        rates = await self.state_store.get_source_rates(HISTORY_HOURS)
+
+        for name, worker in self.workers.items():
+            if name not in shards:
+                worker["feeds"] = {}
+                continue
+
+            feeds = {urls[url]: url for url in shards[name]}
+            process = worker["process"]
+            alive = process is not None and process.is_alive()
+            if alive and feeds == worker["feeds"]:
+                continue
+
+            # Состояния только для новых лент: свои воркер знает лучше БД
+            known = set(worker["feeds"].values()) if alive else set()
+            gained = [url for url in shards[name] if url not in known]
+            snapshot = {
+                "feed_states": {url: states[url] for url in gained if url in states},
+                "schedules": {url: schedules[url] for url in gained if url in schedules},
+                "rates": rates,
+            }
+            if alive:
+                worker["inbox"].put((MSG_ASSIGN, feeds, snapshot))
+            else:
+                self._spawn(name, feeds, snapshot)
+            worker["feeds"] = feeds
+
+        logger.info(
+            "🔀 Ленты по воркерам: "
+            + ", ".join(f"{name} - {len(w['feeds'])}" for name, w in self.workers.items())
+        )
+
+    def _spawn(self, name: str, feeds: Dict[str, str], snapshot: dict):
+        worker = self.workers[name]
+        # Новая очередь: в старой могли остаться подтверждения для умершего процесса
+        worker["inbox"] = self._context.Queue()
+        worker["generation"] += 1
+        worker["process"] = self._context.Process(
+            target=run_worker,
+            args=(name, worker["generation"], feeds, snapshot, self.options,
+                  worker["inbox"], self._outbox),
+            name=f"ingest-{name}",
+            daemon=True
+        )
+        worker["process"].start()
+        worker["started"] = time.time()
+
+    async def _watch(self):
+        """Упавший воркер выводится из кольца, его ленты переходят к соседям"""
+        while self.is_running:
+            await asyncio.sleep(WATCH_INTERVAL)
+            try:
+                await self._check_workers(time.time())
+            except Exception as e:
+                logger.error(f"❌ Ошибка проверки воркеров: {e}", exc_info=True)
+
+    async def _check_workers(self, now: float):
+        changed = False
+        for name, worker in self.workers.items():
+            process = worker["process"]
+            if name in self.ring.nodes:
+                if process is not None and process.is_alive():
+                    if worker["restarts"] and now - worker["started"] > MAX_RESTART_DELAY:
+                        worker["restarts"] = 0
+                    continue
+
+                worker["restarts"] += 1
+                delay = min(MAX_RESTART_DELAY, RESTART_DELAY * 2 ** (worker["restarts"] - 1))
+                worker["restart_at"] = now + delay
+                worker["process"] = None
+                self.ring.remove(name)
+                changed = True
+                await alert_manager.send_alert(
+                    f"Воркер сбора лент {name} упал (код {process.exitcode if process else '?'}), "
+                    f"{len(worker['feeds'])} лент переданы остальным, перезапуск через {delay}с",
+                    level="WARNING"
+                )
+            elif now >= worker["restart_at"]:
+                logger.info(f"♻️ Перезапуск {name}")
+                self.ring.add(name)
+                changed = True
+
+        if changed:
+            await self._rebalance()
+
+    def _get_message(self):
+        try:
+            return self._outbox.get(True, QUEUE_POLL)
+        except queue.Empty:
+            return None
+
+    async def _receive(self):
+        loop = asyncio.get_running_loop()
+        while self.is_running:
+            message = await loop.run_in_executor(None, self._get_message)
+            if message is None:
+                continue
+            # Записи от разных воркеров идут параллельно и сливаются очередью записи БД
+            task = asyncio.create_task(self._handle(message))
+            self._handlers.add(task)
+            task.add_done_callback(self._handlers.discard)
+
+    async def _handle(self, message: tuple):
+        kind = message[0]
+        try:
+            if kind == MSG_INGEST:
+                await self._ingest(*message[1:])
+            elif kind == MSG_FEED_STATES:
+                await self.state_store.save_feed_states(message[1])
+            elif kind == MSG_SCHEDULES:
+                for schedule in message[1]:
+                    self.schedules[schedule["feed_url"]] = schedule
+                await self.state_store.save_feed_schedules(message[1])
+        except Exception as e:
+            logger.error(f"❌ Ошибка записи от воркера ({kind}): {e}", exc_info=True)
+
+    async def _ingest(self, name: str, generation: int, seq: int, news: list, health: dict):
+        if self.health is not None:
+            self.health.sources.update(health)
+
+        written = False
+        new_urls = []
+        try:
+            new_urls = await self.state_store.add_news_many(news)
+            written = True
+            self.batches += 1
+            self.news += len(new_urls)
+            if new_urls:
+                logger.info(f"📥 {name}: добавлено {len(new_urls)} новостей")
+        finally:
+            worker = self.workers.get(name)
+            # Воркер перезапустился, пока шла запись: seq нового процесса начинаются
+            # заново, и чужое подтверждение закрыло бы не ту пачку
+            if worker and worker["inbox"] is not None and worker["generation"] == generation:
+                worker["inbox"].put((MSG_ACK, generation, seq, written))
+            else:
+                logger.debug(f"{name}: подтверждение пачки {seq} прежнего процесса отброшено")
+        # После подтверждения: воркер не ждет проверки картинок
+        await preflight_inserted(self.preflight, news, new_urls)
@@ -1,11 +1,16 @@
 # services/message_builder.py
 import logging
 import re
-import aiohttp
 from typing import Optional, Dict
 from functools import lru_cache
 import asyncio
 
+from aiogram.types import BufferedInputFile
+
+from services.http_client import http_client
+from services.image_preflight import IMAGE_OK, IMAGE_REHOST, ImagePreflight
+from utils.text_normalizer import text_normalizer
+
 logger = logging.getLogger(__name__)
 
 
@@ -74,20 +79,18 @@ async def get_multiple_crypto_prices() -> Optional[Dict]:
             "include_24hr_change": "true"
         }
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params, timeout=10) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    prices = {}
+        data = await http_client.get_json(url, params=params)
+        if data:
+            prices = {}
 
-                    for coin in ["bitcoin", "ethereum", "solana"]:
-                        if coin in data:
-                            prices[coin] = {
-                                "price": data[coin]["usd"],
-                                "change": data[coin].get("usd_24h_change", 0)
-                            }
+            for coin in ["bitcoin", "ethereum", "solana"]:
+                if coin in data:
+                    prices[coin] = {
+                        "price": data[coin]["usd"],
+                        "change": data[coin].get("usd_24h_change", 0)
+                    }
 
-                    return prices
+            return prices
 
     except Exception as e:
         logger.error(f"Ошибка получения цен: {e}")
@@ -128,28 +131,25 @@ class FearGreedIndexTracker:
     async def get_fear_greed_index() -> Optional[Dict]:
         """Получает индекс страха с автоматическим кэшированием"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get("https://api.alternative.me/fng/", timeout=10) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        if data.get("data"):
-                            item = data["data"][0]
-                            result = {
-                                "value": int(item["value"]),
-                                "label": item["value_classification"]
-                            }
-
-                            # Перевод
-                            translations = {
-                                "Extreme Fear": "Экстремальный страх",
-                                "Fear": "Страх",
-                                "Neutral": "Нейтрально",
-                                "Greed": "Жадность",
-                                "Extreme Greed": "Экстремальная жадность"
-                            }
-                            result["label"] = translations.get(result["label"], result["label"])
-
-                            return result
+            data = await http_client.get_json("https://api.alternative.me/fng/")
+            if data and data.get("data"):
+                item = data["data"][0]
+                result = {
+                    "value": int(item["value"]),
+                    "label": item["value_classification"]
+                }
+
+                # Перевод
+                translations = {
+                    "Extreme Fear": "Экстремальный страх",
+                    "Fear": "Страх",
+                    "Neutral": "Нейтрально",
+                    "Greed": "Жадность",
+                    "Extreme Greed": "Экстремальная жадность"
+                }
+                result["label"] = translations.get(result["label"], result["label"])
+
+                return result
 
         except Exception as e:
             logger.error(f"Ошибка индекса страха: {e}")
@@ -206,11 +206,7 @@ class AdvancedMessageFormatter:
 
     @staticmethod
     def clean_text(text: str) -> str:
-        text = re.sub(r'<[^>]+>', '', text)
-        text = text.replace('[…]', '').replace('...', '')
-        text = re.sub(r'Читать далее.*', '', text, flags=re.IGNORECASE)
-        text = re.sub(r'\s+', ' ', text).strip()
-        return text
+        return text_normalizer.normalize(text)
 
     @staticmethod
     def smart_truncate(text: str, length: int = 900) -> str:
@@ -234,8 +230,10 @@ class AdvancedMessageFormatter:
             prices: Optional[Dict] = None,
             fear_greed: Optional[Dict] = None,
             image_url: Optional[str] = None,
-            ai_data: Optional[Dict] = None
+            ai_data: Optional[Dict] = None,
+            summary_normalized: bool = False
     ) -> Dict:
+        """summary_normalized: summary уже очищен (так хранится в БД) - не чистим повторно"""
 
         # Заголовок
         sentiment_emoji = "🔔"
@@ -278,7 +276,8 @@ class AdvancedMessageFormatter:
         if available_len < 100:
             available_len = 100
 
-        summary = AdvancedMessageFormatter.clean_text(summary)
+        if not summary_normalized:
+            summary = AdvancedMessageFormatter.clean_text(summary)
         summary_display = AdvancedMessageFormatter.smart_truncate(summary, length=available_len)
 
         return {
@@ -288,36 +287,91 @@ class AdvancedMessageFormatter:
 
 
 class RichMediaMessage:
-    def __init__(self, text: str, image_url: Optional[str] = None):
+    # Ошибки Bot API, в которых виновата картинка, а не текст
+    IMAGE_ERROR_MARKERS = (
+        "HTTP URL", "web page content", "wrong file", "IMAGE_PROCESS_FAILED",
+        "PHOTO_INVALID", "too big",
+    )
+
+    def __init__(self, text: str, image_url: Optional[str] = None, referer: Optional[str] = None,
+                 preflight: Optional[ImagePreflight] = None):
+        """
+        referer: ссылка на статью - с ней качаем картинки с защитой от хотлинков
+        preflight: проверка картинок (None - фото просто по URL, без проверки и загрузки файлом)
+        """
         self.text = text
         self.image_url = image_url
-
-    async def send(self, bot, chat_id: int):
-        try:
-            if self.image_url and ImageExtractor.is_valid_image_url(self.image_url):
+        self.referer = referer
+        self.preflight = preflight
+
+    async def _send_photo(self, bot, chat_id: int) -> bool:
+        """Фото с подписью по вердикту preflight; False - публиковать текстом"""
+        if self.preflight is None:
+            try:
+                await bot.send_photo(
+                    chat_id=chat_id,
+                    photo=self.image_url,
+                    caption=self.text,
+                    parse_mode="HTML"
+                )
+                logger.info("✅ Фото + текст отправлены")
+                return True
+            except Exception as e:
+                logger.warning(f"⚠️ Ошибка фото: {e}. Отправляю текст.")
+                return False
+
+        preflight = self.preflight
+        verdict = await preflight.check(self.image_url, self.referer)
+
+        if verdict == IMAGE_OK:
+            try:
+                await bot.send_photo(
+                    chat_id=chat_id,
+                    photo=self.image_url,
+                    caption=self.text,
+                    parse_mode="HTML"
+                )
+                logger.info("✅ Фото + текст отправлены")
+                return True
+            except Exception as e:
+                if not any(marker in str(e) for marker in self.IMAGE_ERROR_MARKERS):
+                    logger.warning(f"⚠️ Ошибка фото: {e}. Отправляю текст.")
+                    return False
+                # Telegram не смог скачать сам - больше по URL не пробуем, загружаем байтами
+                logger.warning(f"⚠️ Telegram не получил картинку ({e}), загружаю файлом")
+                preflight.record_telegram_failure(self.image_url)
+                verdict = IMAGE_REHOST
+
+        if verdict == IMAGE_REHOST:
+            data = await preflight.download(self.image_url)
+            if data:
                 try:
                     await bot.send_photo(
                         chat_id=chat_id,
-                        photo=self.image_url,
+                        photo=BufferedInputFile(data, filename="image"),
                         caption=self.text,
                         parse_mode="HTML"
                     )
-                    logger.info("✅ Фото + текст отправлены")
+                    logger.info("✅ Фото (загружено файлом) + текст отправлены")
+                    return True
                 except Exception as e:
-                    logger.warning(f"⚠️ Ошибка фото: {e}. Отправляю текст.")
-                    await bot.send_message(
-                        chat_id=chat_id,
-                        text=self.text,
-                        parse_mode="HTML",
-                        disable_web_page_preview=True
-                    )
-            else:
-                await bot.send_message(
-                    chat_id=chat_id,
-                    text=self.text,
-                    parse_mode="HTML",
-                    disable_web_page_preview=True
-                )
+                    logger.warning(f"⚠️ Ошибка фото файлом: {e}. Отправляю текст.")
+            preflight.record_upload_failure(self.image_url)
+
+        return False
+
+    async def send(self, bot, chat_id: int):
+        try:
+            if (self.image_url and ImageExtractor.is_valid_image_url(self.image_url)
+                    and await self._send_photo(bot, chat_id)):
+                return True
+
+            await bot.send_message(
+                chat_id=chat_id,
+                text=self.text,
+                parse_mode="HTML",
+                disable_web_page_preview=True
+            )
             return True
 
         except Exception as e:
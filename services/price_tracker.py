@@ -1,10 +1,11 @@
 # services/price_tracker.py
 import asyncio
 
-import aiohttp
 import logging
 from typing import Optional, Dict
 
+from services.http_client import http_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,28 +19,26 @@ class PriceTracker:
         Возвращает: {usd, change_24h}
         """
         try:
-            async with aiohttp.ClientSession() as session:
-                url = "https://api.coingecko.com/api/v3/simple/price"
-                params = {
-                    "ids": "bitcoin",
-                    "vs_currencies": "usd",
-                    "include_24hr_change": "true"
-                }
-
-                async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=10)) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        btc_data = data.get("bitcoin", {})
-
-                        price = btc_data.get("usd")
-                        change = btc_data.get("usd_24h_change", 0)
-
-                        if price:
-                            return {
-                                "price": int(price),
-                                "change_24h": round(change, 2),
-                                "emoji": "📈" if change >= 0 else "📉"
-                            }
+            url = "https://api.coingecko.com/api/v3/simple/price"
+            params = {
+                "ids": "bitcoin",
+                "vs_currencies": "usd",
+                "include_24hr_change": "true"
+            }
+
+            data = await http_client.get_json(url, params=params)
+            if data:
+                btc_data = data.get("bitcoin", {})
+
+                price = btc_data.get("usd")
+                change = btc_data.get("usd_24h_change", 0)
+
+                if price:
+                    return {
+                        "price": int(price),
+                        "change_24h": round(change, 2),
+                        "emoji": "📈" if change >= 0 else "📉"
+                    }
         except asyncio.TimeoutError:
             logger.warning("⚠️ Timeout при получении цены BTC")
         except Exception as e:
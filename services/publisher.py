@@ -0,0 +1,108 @@
+# services/publisher.py
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+
+from database import db
+from models import NewsItem
+from services.rate_limiter import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+class NewsPublisher:
+    """
+    Событийный публикатор очереди новостей (вместо опроса каждые 30 секунд).
+
+    Цикл спит на asyncio.Event и просыпается:
+    - сразу, когда в БД появилась новость с priority=1 ("молния");
+    - когда появилась обычная новость и Rate Limiter уже разрешает пост;
+    - по таймеру ровно в момент, когда Rate Limiter откроется снова.
+
+    Пока очередь пуста, к БД не обращается вообще.
+    """
+
+    RETRY_DELAY = 30  # пауза после неудачной публикации (сек)
+
+    def __init__(
+            self,
+            publish_func: Callable[[NewsItem, bool], Awaitable[Optional[bool]]],
+            rate_limiter: RateLimiter
+    ):
+        """
+        publish_func: async (news_item, is_hot) -> True если опубликовано
+        """
+        self.publish_func = publish_func
+        self.rate_limiter = rate_limiter
+        self.is_running = False
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def notify(self, priority: int = 0):
+        """Вызывается БД после вставки новости"""
+        if priority > 0 or self.rate_limiter.can_post():
+            self._wakeup.set()
+
+    def start(self):
+        if self.is_running:
+            return
+
+        self.is_running = True
+        db.add_insert_listener(self.notify)
+        self._task = asyncio.create_task(self._run())
+        logger.info("📣 Публикатор запущен (событийный режим)")
+
+    async def stop(self):
+        self.is_running = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        logger.info("🛑 Публикатор остановлен")
+
+    async def _run(self):
+        while self.is_running:
+            # Сбрасываем до обработки: события, пришедшие во время публикации, не теряются
+            self._wakeup.clear()
+
+            try:
+                timeout = await self._publish_pending()
+            except Exception as e:
+                logger.error(f"❌ Ошибка публикатора: {e}", exc_info=True)
+                timeout = self.RETRY_DELAY
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _publish_pending(self) -> Optional[float]:
+        """
+        Публикует все, что можно опубликовать прямо сейчас.
+
+        Returns:
+            Через сколько секунд проснуться, или None - ждать только события
+        """
+        while True:
+            # 1. Горячие новости (без учета Rate Limiter)
+            hot_news = await db.get_hot_news()
+            if hot_news:
+                logger.info("🔥 Молния! Публикую вне очереди.")
+                if not await self.publish_func(hot_news, True):
+                    return self.RETRY_DELAY
+                continue
+
+            # 2. Обычная очередь
+            if not self.rate_limiter.can_post():
+                # Небольшой запас, чтобы не проснуться на микросекунды раньше
+                return self.rate_limiter.get_wait_seconds() + 0.05
+
+            news_item = await db.get_oldest_unposted_news()
+            if not news_item:
+                return None
+
+            if not await self.publish_func(news_item, False):
+                return self.RETRY_DELAY
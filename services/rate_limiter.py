@@ -36,13 +36,17 @@ class RateLimiter:
 
     def get_wait_time(self) -> int:
         """Получите время ожидания до следующей публикации (в секундах)"""
+        return int(self.get_wait_seconds())
+
+    def get_wait_seconds(self) -> float:
+        """Точное время ожидания до следующей публикации (для таймеров)"""
         if self.can_post():
-            return 0
+            return 0.0
 
         time_since_last = datetime.now() - self.last_post_time
         wait_seconds = (self.min_interval - time_since_last).total_seconds()
 
-        return max(0, int(wait_seconds))
+        return max(0.0, wait_seconds)
 
     def mark_posted(self):
         """Отметьте что пост был опубликован"""
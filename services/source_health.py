@@ -0,0 +1,152 @@
+# services/source_health.py
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Состояния автомата
+BREAKER_CLOSED = "closed"        # лента работает, запросы идут
+BREAKER_OPEN = "open"            # лента лежит, запросы не отправляются до retry_at
+BREAKER_HALF_OPEN = "half_open"  # пробный запрос: успех закрывает, ошибка открывает снова
+
+FAILURE_THRESHOLD = 5      # ошибок подряд до размыкания
+OPEN_DELAY = 600           # сек: первая пауза разомкнутой ленты
+MAX_OPEN_DELAY = 6 * 3600  # сек: пауза удваивается после каждой неудачной пробы, но не больше
+LATENCY_ALPHA = 0.2        # вес нового замера в скользящем среднем задержки
+MAX_ERROR_LENGTH = 200
+
+
+@dataclass(slots=True)
+class SourceStats:
+    """Статистика одной ленты с момента запуска бота"""
+    feed_url: str
+    state: str = BREAKER_CLOSED
+    successes: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    latency_ms: float = 0.0          # скользящее среднее успешных загрузок
+    last_error: Optional[str] = None
+    last_success: Optional[float] = None
+    last_failure: Optional[float] = None
+    opened: int = 0                  # размыканий подряд (растет пауза)
+    retry_at: Optional[float] = None  # когда разомкнутая лента получит пробный запрос
+
+    @property
+    def success_rate(self) -> Optional[float]:
+        total = self.successes + self.failures
+        return self.successes / total if total else None
+
+
+class SourceHealth:
+    """
+    Здоровье RSS источников: успехи, ошибки, задержка и circuit breaker на каждую ленту.
+
+    После FAILURE_THRESHOLD ошибок подряд лента "размыкается": запросы
+    к ней не отправляются OPEN_DELAY секунд. Затем один пробный запрос
+    (half-open): успех возвращает ленту в работу, ошибка размыкает снова
+    с удвоенной паузой (до MAX_OPEN_DELAY). HTTP 429/503 с Retry-After
+    размыкают сразу - источник сам просит подождать.
+
+    Мертвая или душащая нас лента больше не стоит полного запроса
+    с таймаутом в каждом цикле.
+    """
+
+    def __init__(self, failure_threshold: int = FAILURE_THRESHOLD,
+                 open_delay: float = OPEN_DELAY, max_open_delay: float = MAX_OPEN_DELAY):
+        self.failure_threshold = failure_threshold
+        self.open_delay = open_delay
+        self.max_open_delay = max(open_delay, max_open_delay)
+        self.sources: Dict[str, SourceStats] = {}
+
+    def get(self, feed_url: str) -> SourceStats:
+        stats = self.sources.get(feed_url)
+        if stats is None:
+            stats = self.sources[feed_url] = SourceStats(feed_url)
+        return stats
+
+    def allow(self, feed_url: str, now: Optional[float] = None) -> bool:
+        """Можно ли сейчас запрашивать ленту; разомкнутую по истечении паузы переводит в half-open"""
+        stats = self.get(feed_url)
+        if stats.state == BREAKER_CLOSED:
+            return True
+
+        now = time.time() if now is None else now
+        if now < stats.retry_at:
+            # Пауза еще идет или пробный запрос уже в пути
+            return False
+        stats.state = BREAKER_HALF_OPEN
+        # Если проба потеряется (отмена задачи), через open_delay будет новая
+        stats.retry_at = now + self.open_delay
+        return True
+
+    def retry_at(self, feed_url: str) -> Optional[float]:
+        """Когда разомкнутая лента снова получит запрос (None - лента в работе)"""
+        stats = self.sources.get(feed_url)
+        return stats.retry_at if stats and stats.state == BREAKER_OPEN else None
+
+    def record_success(self, feed_url: str, latency: float, now: Optional[float] = None):
+        """latency: время загрузки (сек)"""
+        stats = self.get(feed_url)
+        latency_ms = latency * 1000
+        stats.latency_ms = (
+            latency_ms if not stats.successes
+            else stats.latency_ms + LATENCY_ALPHA * (latency_ms - stats.latency_ms)
+        )
+        stats.successes += 1
+        stats.consecutive_failures = 0
+        stats.last_success = time.time() if now is None else now
+
+        if stats.state != BREAKER_CLOSED:
+            logger.info(f"✅ Лента снова доступна: {feed_url}")
+        stats.state = BREAKER_CLOSED
+        stats.opened = 0
+        stats.retry_at = None
+
+    def record_failure(self, feed_url: str, error: str, retry_after: Optional[float] = None,
+                       now: Optional[float] = None):
+        """retry_after: пауза, которую просит сервер (Retry-After), сек"""
+        now = time.time() if now is None else now
+        stats = self.get(feed_url)
+        stats.failures += 1
+        stats.consecutive_failures += 1
+        stats.last_error = error[:MAX_ERROR_LENGTH]
+        stats.last_failure = now
+
+        if (stats.state == BREAKER_HALF_OPEN or retry_after is not None
+                or stats.consecutive_failures >= self.failure_threshold):
+            self._open(stats, now, retry_after or 0)
+
+    def _open(self, stats: SourceStats, now: float, min_delay: float):
+        stats.opened += 1
+        delay = min(self.max_open_delay, self.open_delay * 2 ** (stats.opened - 1))
+        delay = max(delay, min(min_delay, self.max_open_delay))
+        stats.state = BREAKER_OPEN
+        stats.retry_at = now + delay
+        logger.warning(
+            f"🚫 Лента отключена на {delay / 60:.0f} мин "
+            f"({stats.consecutive_failures} ошибок подряд, последняя: {stats.last_error}): {stats.feed_url}"
+        )
+
+    def reset(self, feed_url: str):
+        """Ручное закрытие (админ): следующий цикл снова запросит ленту"""
+        stats = self.get(feed_url)
+        stats.state = BREAKER_CLOSED
+        stats.consecutive_failures = 0
+        stats.opened = 0
+        stats.retry_at = None
+
+    def open_count(self) -> int:
+        return sum(1 for stats in self.sources.values() if stats.state != BREAKER_CLOSED)
+
+    def worst_first(self) -> List[SourceStats]:
+        """Сначала отключенные, затем по числу ошибок подряд и доле успехов"""
+        return sorted(
+            self.sources.values(),
+            key=lambda s: (
+                s.state == BREAKER_CLOSED,
+                -s.consecutive_failures,
+                s.success_rate if s.success_rate is not None else 1.0,
+            )
+        )
@@ -1,16 +1,25 @@
 # services/telegram_listener.py
 import logging
 import os
+import time
 from pathlib import Path
 from telethon import TelegramClient, events
 from telethon.errors import SessionPasswordNeededError, PhoneNumberInvalidError
 from telethon.sessions import StringSession
 from config import config
 from database import db
+from models import NewsItem
 from services.ai_summary import NewsAnalyzer
+from utils.keyword_matcher import KeywordMatcher
+from utils.text_normalizer import text_normalizer
 
 logger = logging.getLogger(__name__)
 
+# Рекламные посты каналов (синтаксис - utils/keyword_matcher.py)
+STOP_WORDS = KeywordMatcher([
+    "giveaway*", "promo*", "discount*", "join vip", "sign up", "limited offer*",
+])
+
 
 class TelegramListener:
     def __init__(self):
@@ -173,8 +182,7 @@ class TelegramListener:
                         return
 
             # 2. Стоп-слова
-            STOP_WORDS = ["giveaway", "promo", "discount", "join vip", "sign up", "limited offer"]
-            if any(w in raw_text.lower() for w in STOP_WORDS):
+            if STOP_WORDS.matches(raw_text):
                 return
 
             # 3. Минимальная длина
@@ -202,15 +210,15 @@ class TelegramListener:
                 logger.info(f"💎 ВАЖНЫЙ ИНСАЙД: {title}")
 
                 # Сохранение с высоким приоритетом
-                await db.add_news(
+                await db.add_news(NewsItem(
                     url=msg_unique_id,
                     title=title,
-                    summary=processed['ru_summary'],
+                    summary=text_normalizer.normalize(processed['ru_summary']),
                     source=f"⚡ Insider ({source_title})",
-                    published_at="Just now",
+                    published_at=int(time.time()),
                     image_url=None,
                     priority=1  # Молния!
-                )
+                ))
             else:
                 logger.debug("🗑️ ИИ отфильтровал как неважное")
 
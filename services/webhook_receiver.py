@@ -1,9 +1,12 @@
 # services/webhook_receiver.py
+import time
 from datetime import datetime
 
 from aiohttp import web
 
 from database import db
+from models import NewsItem
+from utils.text_normalizer import text_normalizer
 
 
 async def receive_emergency_news(request):
@@ -17,14 +20,15 @@ async def receive_emergency_news(request):
     """
     data = await request.json()
 
-    await db.add_news(
+    await db.add_news(NewsItem(
         url=f"webhook_{datetime.now().timestamp()}",
         title=data['title'],
-        summary=data['summary'],
+        # В БД summary хранится очищенным (publish_news_item не чистит повторно)
+        summary=text_normalizer.normalize(data['summary']),
         source="⚡ WEBHOOK",
-        published_at="Now",
+        published_at=int(time.time()),
         priority=1  # Молния
-    )
+    ))
 
     return web.Response(text="OK")
 
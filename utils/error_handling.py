@@ -60,7 +60,7 @@ class AlertManager:
         return False
 
 
-# Глобальный экземпляр (будет настроен в main.py)
+# Глобальный экземпляр (будет настроен в app.py)
 alert_manager = AlertManager()
 
 
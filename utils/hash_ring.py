@@ -0,0 +1,75 @@
+# utils/hash_ring.py
+"""
+Консистентное хэширование ключей (URL лент) по узлам (воркерам).
+
+Каждый узел ставится на кольцо replicas раз (виртуальные узлы), ключ
+достается первому узлу по часовой стрелке от своего хэша. Когда узел
+уходит, переезжают только его ключи - к соседям по кольцу; когда
+возвращается, забирает назад ровно их же. При делении по модулю
+(hash % N) смена N перетасовала бы почти все ленты, и воркеры заново
+качали бы ленты без ETag и high-water mark.
+"""
+from bisect import bisect, insort
+from hashlib import blake2b
+from typing import Dict, Iterable, List, Optional
+
+DEFAULT_REPLICAS = 64
+
+
+def _hash(value: str) -> int:
+    # Стабилен между процессами и запусками (в отличие от hash())
+    return int.from_bytes(blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """
+    ring = HashRing(["worker-0", "worker-1"])
+    ring.node_for("https://forklog.com/feed/") -> "worker-1"
+    ring.assign(urls)                          -> {"worker-0": [...], "worker-1": [...]}
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), replicas: int = DEFAULT_REPLICAS):
+        self.replicas = replicas
+        self.nodes = set()
+        self._points: List[int] = []
+        self._owners: Dict[int, str] = {}
+        for node in nodes:
+            self.add(node)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def add(self, node: str):
+        if node in self.nodes:
+            return
+        self.nodes.add(node)
+        for replica in range(self.replicas):
+            point = _hash(f"{node}#{replica}")
+            # Коллизия 64-битных хэшей почти невозможна, но порядок должен быть детерминирован
+            if point in self._owners:
+                self._owners[point] = min(self._owners[point], node)
+                continue
+            self._owners[point] = node
+            insort(self._points, point)
+
+    def remove(self, node: str):
+        if node not in self.nodes:
+            return
+        self.nodes.discard(node)
+        self._points = [point for point in self._points if self._owners[point] != node]
+        self._owners = {point: self._owners[point] for point in self._points}
+
+    def node_for(self, key: str) -> Optional[str]:
+        if not self._points:
+            return None
+        index = bisect(self._points, _hash(key)) % len(self._points)
+        return self._owners[self._points[index]]
+
+    def assign(self, keys: Iterable[str]) -> Dict[str, List[str]]:
+        """Ключи по узлам; у каждого узла есть запись, даже пустая"""
+        shards: Dict[str, List[str]] = {node: [] for node in self.nodes}
+        for key in keys:
+            node = self.node_for(key)
+            if node is not None:
+                shards[node].append(key)
+        return shards
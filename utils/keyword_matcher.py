@@ -0,0 +1,119 @@
+# utils/keyword_matcher.py
+"""
+Поиск любого из многих ключевых слов за один проход регулярки.
+
+Список слов собирается в префиксное дерево и компилируется в одно
+регулярное выражение вида (?<!\\w)(?:bit(?:coin(?!\\w)|...)|eth(?:...)).
+Движок re идет по тексту один раз и на каждой позиции спускается по общим
+префиксам, поэтому время почти не зависит от числа слов - в отличие
+от `any(word in text for word in words)`, который сканирует текст
+заново для каждого слова.
+
+Синтаксис ключевых слов:
+    "sec"          - целое слово: "SEC", "sec." да, "second" нет
+    "крипто*"      - основа: "криптовалюта", "крипторынок"
+    "nft collection" - пробел совпадает с любыми пробельными символами
+    "источник:"    - граница проверяется только со стороны буквы/цифры
+
+Регистр не учитывается: текст приводится к нижнему регистру, а регулярка
+собрана без re.IGNORECASE - так она в несколько раз быстрее.
+"""
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+STEM_SUFFIX = "*"
+
+_END = ""  # ключ узла дерева: здесь заканчивается ключевое слово
+_WORD_CHAR_RE = re.compile(r"\w")
+
+
+def _is_word_char(char: str) -> bool:
+    return bool(_WORD_CHAR_RE.match(char))
+
+
+def _escape(char: str) -> str:
+    return r"\s+" if char == " " else re.escape(char)
+
+
+def _render(node: Dict[str, dict]) -> str:
+    """Узел дерева -> регулярка; продолжения раньше конца слова, чтобы брать самое длинное"""
+    branches = [
+        _escape(char) + _render(child)
+        for char, child in sorted(node.items())
+        if char != _END
+    ]
+    if _END in node:
+        # Основа или слово на не-букву: граница справа не нужна
+        branches.append("" if node[_END] else r"(?!\w)")
+
+    if len(branches) == 1:
+        return branches[0]
+    return "(?:" + "|".join(branches) + ")"
+
+
+class KeywordMatcher:
+    """
+    Скомпилированный список ключевых слов.
+
+    matcher = KeywordMatcher(["sec", "etf", "крипто*"])
+    matcher.matches("SEC approves ETF")   -> True
+    matcher.find("Read more: CoinDesk")   -> позиция первого совпадения или -1
+    matcher.find_all("SEC и ETF")         -> ["sec", "etf"]
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: List[str] = []
+        # Отдельные деревья для слов, которые начинаются с буквы/цифры (нужна граница слева) и остальных
+        word_start: Dict[str, dict] = {}
+        other_start: Dict[str, dict] = {}
+
+        for keyword in keywords:
+            keyword = " ".join(keyword.lower().split())
+            stem = keyword.endswith(STEM_SUFFIX)
+            keyword = keyword.rstrip(STEM_SUFFIX).rstrip()
+            if not keyword:
+                continue
+            self.keywords.append(keyword + (STEM_SUFFIX if stem else ""))
+
+            node = word_start if _is_word_char(keyword[0]) else other_start
+            for char in keyword:
+                node = node.setdefault(char, {})
+            # "eth" и "eth*" в одном списке - побеждает основа
+            node[_END] = node.get(_END, False) or stem or not _is_word_char(keyword[-1])
+
+        parts = []
+        if word_start:
+            parts.append(r"(?<!\w)" + _render(word_start))
+        if other_start:
+            parts.append(_render(other_start))
+        # Пустой список не совпадает ни с чем
+        source = "|".join(parts) or r"(?!x)x"
+        self.pattern = re.compile(source)
+        # Для текстов, у которых lower() меняет длину ("İ") - иначе съедут позиции
+        self._pattern_ignorecase = re.compile(source, re.IGNORECASE)
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def _prepare(self, text: str) -> Tuple[re.Pattern, str]:
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            return self._pattern_ignorecase, text
+        return self.pattern, lowered
+
+    def search(self, text: str) -> Optional[re.Match]:
+        pattern, text = self._prepare(text)
+        return pattern.search(text)
+
+    def matches(self, text: str) -> bool:
+        return self.search(text) is not None
+
+    def find(self, text: str) -> int:
+        """Позиция первого совпадения или -1 (как str.find)"""
+        match = self.search(text)
+        return match.start() if match else -1
+
+    def find_all(self, text: str) -> List[str]:
+        """Все совпавшие фрагменты по порядку (в нижнем регистре)"""
+        pattern, text = self._prepare(text)
+        return pattern.findall(text)
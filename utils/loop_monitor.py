@@ -0,0 +1,77 @@
+# utils/loop_monitor.py
+import asyncio
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LoopLagMonitor:
+    """
+    Измеряет, насколько event loop опаздывает будить корутины.
+
+    Фоновая задача спит interval секунд и смотрит, на сколько позже она
+    проснулась. Опоздание - это время, когда loop был занят синхронным
+    кодом (разбор XML, тяжелые регулярки) и не обслуживал aiogram,
+    Telethon и публикатор. Опоздания больше threshold считаются "залипаниями".
+    """
+
+    def __init__(self, interval: float = 0.05, threshold: float = 0.1):
+        self.interval = interval
+        self.threshold = threshold
+        self._task: Optional[asyncio.Task] = None
+        self.reset()
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None
+
+    def reset(self):
+        self.samples = 0
+        self.max_lag = 0.0
+        self.total_lag = 0.0
+        self.stalls = 0
+        self.stall_time = 0.0
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.record(loop.time() - started - self.interval)
+
+    def record(self, lag: float):
+        lag = max(0.0, lag)
+        self.samples += 1
+        self.total_lag += lag
+        self.max_lag = max(self.max_lag, lag)
+        if lag >= self.threshold:
+            self.stalls += 1
+            self.stall_time += lag
+            logger.debug(f"🐢 Event loop залип на {lag * 1000:.0f} мс")
+
+    def snapshot(self) -> dict:
+        """Статистика в миллисекундах"""
+        return {
+            "samples": self.samples,
+            "max_lag_ms": self.max_lag * 1000,
+            "avg_lag_ms": self.total_lag / self.samples * 1000 if self.samples else 0.0,
+            "stalls": self.stalls,
+            "stall_ms": self.stall_time * 1000,
+        }
+
+
+loop_monitor = LoopLagMonitor()
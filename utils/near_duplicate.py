@@ -0,0 +1,81 @@
+# utils/near_duplicate.py
+"""
+MinHash/LSH для поиска почти-дубликатов заголовков.
+
+Заголовок нормализуется (регистр, пунктуация, порядок слов - как у
+fuzz.token_sort_ratio), режется на символьные 3-граммы, по ним считается
+MinHash подпись из 48 значений, которая делится на 16 полос по 3 значения.
+Каждая полоса превращается в 64-битный ключ корзины. Два заголовка
+становятся кандидатами, если совпала хотя бы одна корзина:
+
+    схожесть (Jaccard) 0.5 -> кандидат с вероятностью ~0.88
+    схожесть (Jaccard) 0.7 -> ~0.9988
+    схожесть (Jaccard) 0.2 -> ~0.12
+
+Кандидаты затем проверяются точным fuzz.token_sort_ratio.
+"""
+import random
+import re
+import zlib
+from hashlib import blake2b
+from typing import List
+
+NUM_PERMUTATIONS = 48
+BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+SHINGLE_SIZE = 3
+
+_MASK_64 = (1 << 64) - 1
+
+# Фиксированный seed: ключи корзин хранятся в БД и не должны меняться между запусками.
+# Перестановки - семейство multiply-shift: ((a * x + b) mod 2^64) >> 32
+_rnd = random.Random(0x5EED)
+_PERMUTATIONS = [
+    (_rnd.getrandbits(64) | 1, _rnd.getrandbits(64))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+_NON_WORD_RE = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def normalize_title(title: str) -> str:
+    """Нижний регистр, без пунктуации, слова отсортированы"""
+    tokens = _NON_WORD_RE.sub(" ", title.lower()).split()
+    return " ".join(sorted(tokens))
+
+
+def _shingle_hashes(text: str) -> List[int]:
+    if len(text) <= SHINGLE_SIZE:
+        shingles = {text}
+    else:
+        shingles = {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+    return [zlib.crc32(s.encode("utf-8")) for s in shingles]
+
+
+def minhash_signature(title: str) -> List[int]:
+    """MinHash подпись нормализованного заголовка"""
+    hashes = _shingle_hashes(normalize_title(title))
+    if not hashes:
+        return []
+
+    return [
+        min(((a * h + b) & _MASK_64) >> 32 for h in hashes)
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def lsh_buckets(title: str) -> List[int]:
+    """Ключи LSH корзин (знаковые 64-битные, влезают в INTEGER SQLite)"""
+    signature = minhash_signature(title)
+    if not signature:
+        return []
+
+    buckets = []
+    for band in range(BANDS):
+        chunk = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        data = band.to_bytes(1, "little") + b"".join(v.to_bytes(4, "little") for v in chunk)
+        buckets.append(
+            int.from_bytes(blake2b(data, digest_size=8).digest(), "little", signed=True)
+        )
+    return buckets
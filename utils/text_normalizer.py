@@ -0,0 +1,81 @@
+# utils/text_normalizer.py
+"""
+Нормализация текста новости за один проход регулярки.
+
+Раньше описание проходило rss_parser.clean_html (теги, html.unescape,
+пробелы - три прохода), remove_source_mentions, а при публикации еще раз
+AdvancedMessageFormatter.clean_text (снова теги, "[…]", "...",
+"Читать далее", пробелы). Теперь одна скомпилированная регулярка находит
+за проход все, что нужно заменить:
+
+    блочные теги (<p>, <br>, <li>, ...)  -> " "
+    остальные теги                       -> ""
+    HTML сущности                        -> символ
+    "[…]", "[&#8230;]", "..."            -> ""
+
+Все альтернативы начинаются с "<", "&", "[" или ".", поэтому re пропускает
+обычный текст, не входя в них. Пробелы (включая &nbsp; и переводы строк)
+схлопываются str.split() - это быстрее любой регулярки. Затем текст
+обрезается по первому стоп-слову (KeywordMatcher: "Источник:", "Читать далее", ...).
+
+Нормализованный текст сохраняется в БД, поэтому при публикации
+форматтер его не чистит повторно.
+"""
+import re
+from functools import lru_cache
+from html import unescape
+from typing import Iterable
+
+from utils.keyword_matcher import KeywordMatcher
+
+READ_MORE_KEYWORDS = ("читать далее*", "read more*")
+
+# Теги, которые разделяют слова: "<p>один</p><p>два</p>" -> "один два"
+BLOCK_TAGS = frozenset((
+    "p", "br", "div", "li", "ul", "ol", "tr", "td", "th", "table", "blockquote",
+    "h1", "h2", "h3", "h4", "h5", "h6", "hr", "img", "figure", "figcaption",
+))
+
+# Без re.IGNORECASE и без перечисления тегов в регулярке - так в ~3 раза быстрее
+_NORMALIZE_RE = re.compile(
+    r"</?([A-Za-z0-9]*)[^>]*>"                                 # 1: имя тега
+    r"|(&(?:#\d+|#[xX][0-9a-fA-F]+|[A-Za-z][A-Za-z0-9]*);?)"   # 2: сущность
+    r"|\[(?:…|\.\.\.|&#8230;|&hellip;)\]|\.\.\."
+)
+# В лентах одни и те же десяток сущностей (&nbsp; &#8217; &quot; ...)
+_unescape = lru_cache(maxsize=1024)(unescape)
+
+
+def _replace(match: re.Match) -> str:
+    tag, entity = match.groups()
+    if tag is not None:
+        return " " if tag.lower() in BLOCK_TAGS else ""
+    if entity is not None:
+        return _unescape(entity)
+    return ""
+
+
+class TextNormalizer:
+    """
+    normalizer = TextNormalizer(cut_keywords=["источник:"])
+    normalizer.normalize("<p>Bitcoin&nbsp;растет</p>\\n<p>Источник: RBC</p>") -> "Bitcoin растет"
+    """
+
+    def __init__(self, cut_keywords: Iterable[str] = READ_MORE_KEYWORDS):
+        """cut_keywords: с первого из этих слов (синтаксис KeywordMatcher) текст отбрасывается"""
+        self.cut = KeywordMatcher(cut_keywords)
+
+    def normalize(self, text: str) -> str:
+        if not text:
+            return ""
+
+        text = " ".join(_NORMALIZE_RE.sub(_replace, text).split())
+
+        cut_at = self.cut.find(text)
+        if cut_at != -1:
+            text = text[:cut_at].rstrip(" .,;:")
+        return text
+
+
+# Для текстов без источника в хвосте (ИИ, Telegram) - только "Читать далее"
+text_normalizer = TextNormalizer()